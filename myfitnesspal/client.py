@@ -1,39 +1,194 @@
 from __future__ import annotations
 
+import contextvars
+import copy
 import datetime
+import functools
 import json
 import logging
+import math
 import re
+import threading
+import time
 import uuid
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from http.cookiejar import CookieJar
 from pathlib import Path
-from typing import Any, cast, overload
+from typing import Any, Callable, Generator, Iterable, Iterator, TypeVar, cast, overload
 from urllib import parse
 
 import browser_cookie3
+import lxml.etree
 import lxml.html
 import requests
 from measurement.base import MeasureBase
 from measurement.measures import Energy, Mass, Volume
+from requests.adapters import HTTPAdapter
 
 from . import types
 from .base import MFPBase
 from .day import Day
+from .deadline import (
+    DeadlineSpec,
+    bind_deadline,
+    deadline_scope,
+    get_current_deadline,
+    with_deadline,
+)
 from .entry import Entry
-from .exceptions import MyfitnesspalLoginError, MyfitnesspalRequestFailed
+from .exceptions import (
+    MyfitnesspalDeadlineExceeded,
+    MyfitnesspalLoginError,
+    MyfitnesspalRequestFailed,
+)
 from .exercise import Exercise
+from .foodindex import FoodIndex
 from .fooditem import FoodItem
+from .httpcache import ConditionalCache, get_response_validators
 from .meal import Meal
+from .metrics import ClientStats
+from .nextdata import NextData
 from .note import Note
+from .ratelimit import AdaptiveConcurrencyLimiter, TokenBucket
+from .reportcache import ReportCache
+from .resilience import CircuitBreaker, RetryPolicy
+from .singleflight import SingleFlight
+from .store import MeasurementStore
+from .tracing import Tracer, get_current_span, span_scope
+from .transport import RequestsTransport, Transport
 
 logger = logging.getLogger(__name__)
 
 BRITISH_UNIT_MATCHER = re.compile(r"(?:(?P<st>\d+) st)\W*(?:(?P<lbs>\d+) lb)?")
 
+T = TypeVar("T")
+
+# Selectors for the recipe and saved meal pages, compiled once; those
+# applied to each item of a list are relative to that item.
+RECIPE_LIST_ITEMS = lxml.etree.XPath("//*[@id='main']/ul[1]/li")
+RECIPE_LIST_ITEM_LINK = lxml.etree.XPath("./div[2]/h2/span[1]/a")
+RECIPE_LIST_PAGINATION_LINKS = lxml.etree.XPath("//*[@id='main']/ul[2]/a")
+RECIPE_MAIN = lxml.etree.XPath("//*[@id='main']")
+RECIPE_NAME = lxml.etree.XPath("./div[3]/div[2]/h1")
+RECIPE_CALORIES = lxml.etree.XPath("./div[3]/div[2]/div[2]/div")
+RECIPE_INGREDIENTS = lxml.etree.XPath("./div[4]/div/*/li")
+RECIPE_SERVINGS = lxml.etree.XPath("//*[@id='recipe_servings']")
+RECIPE_NUTRIENT_ROWS = lxml.etree.XPath("//tr[@id]")
+RECIPE_NUTRIENT_VALUE = lxml.etree.XPath("./td[1]/span[2]")
+MEAL_LIST_ITEMS = lxml.etree.XPath("//*[@id='matching']/li")
+MEAL_LIST_ITEM_LINK = lxml.etree.XPath("./a")
+MEAL_INGREDIENT_ROWS = lxml.etree.XPath("//*[@id='meal-table']/tbody/tr")
+MEAL_TOTAL_ROW = lxml.etree.XPath("//*[@id='mealTableTotal']/tbody/tr")
+ROW_CELLS = lxml.etree.XPath("./td")
+FORM_AUTHENTICITY_TOKEN = lxml.etree.XPath(
+    "(//input[@name='authenticity_token']/@value)[1]", smart_strings=False
+)
+FORM_UTF8 = lxml.etree.XPath("(//input[@name='utf8']/@value)[1]", smart_strings=False)
+NEW_FOOD_WARNING = lxml.etree.XPath("//*[@id='main']/p[1]/span")
+NEW_FOOD_ERRORS = lxml.etree.XPath("//*[@id='errorExplanation']/ul/li")
+
+
+def parser(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Records the time taken by the decorated ``Client`` method in
+    ``Client.stats`` under the parser name ``name``."""
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def wrapper(self: Client, *args, **kwargs) -> T:
+            with self._parse_phase(name):
+                return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _get_food_key(brand: str | None, description: str) -> tuple[str, str]:
+    return ((brand or "").strip().lower(), description.strip().lower())
+
+
+def traced(fn: Callable[..., T]) -> Callable[..., T]:
+    """Records each call to the decorated ``Client`` method as a span."""
+
+    @functools.wraps(fn)
+    def wrapper(self: Client, *args, **kwargs) -> T:
+        with self.tracer.span(f"Client.{fn.__name__}"):
+            return fn(self, *args, **kwargs)
+
+    return wrapper
+
 
 class Client(MFPBase):
-    """Provides access to MyFitnessPal APIs"""
+    """Provides access to MyFitnessPal APIs
+
+    A single client instance may be shared between threads.  Connections
+    to the website and to the API are pooled separately; use
+    ``pool_maxsize`` and ``api_pool_maxsize`` to size each pool for the
+    number of threads you expect to be making requests concurrently.
+
+    Requests failing with transient errors are retried according to
+    ``retry_policy``; after ``circuit_breaker_threshold`` consecutive
+    failures against a host, further requests to it fail immediately for
+    ``circuit_breaker_reset_after`` seconds.
+
+    To avoid being throttled by MyFitnessPal, ``rate_limit`` and
+    ``api_rate_limit`` cap the number of requests per second sent to the
+    website and to the API respectively, and ``max_concurrency`` enables
+    an adaptive limit on the number of requests in flight to each of them:
+    the limit grows while requests succeed (within
+    ``concurrency_latency_target`` seconds, if given) and is halved
+    whenever the server responds with ``429`` or ``503``.
+
+    Every request is sent with ``timeout`` (seconds, or a ``(connect,
+    read)`` tuple).  Methods accepting a ``deadline`` argument (a
+    ``Deadline`` or a number of seconds) additionally bound the total time
+    spent on all of the requests they make; once it passes,
+    ``MyfitnesspalDeadlineExceeded`` is raised.
+
+    Identical GET requests made concurrently (e.g. from several threads
+    fetching the same diary) are coalesced into a single request whose
+    response is shared.  Pass the same ``single_flight`` instance to
+    several clients to coalesce requests between them too.
+
+    GET responses carrying an ``ETag`` or ``Last-Modified`` header are kept
+    in ``http_cache`` and revalidated on the next request for the same URL;
+    a ``304 Not Modified`` response is answered from the stored copy.  Pass
+    ``http_cache=False`` to disable this.
+
+    All requests are sent through ``transport``; by default, a
+    ``RequestsTransport`` wrapping this client's ``session``.  See
+    ``myfitnesspal.fakeserver`` for a transport serving canned responses
+    without network access.
+
+    Request counts, latencies, response sizes, status codes, retries and
+    the time spent parsing each kind of response are recorded in
+    ``stats`` (a ``ClientStats``); see ``ClientStats.snapshot`` and
+    ``ClientStats.to_prometheus``.
+
+    When given a ``tracer`` with an exporter, each call to a public
+    method is recorded as a span, with its requests and parsing steps
+    as child spans; see ``myfitnesspal.tracing``.
+
+    Methods fetching many pages (e.g. ``get_measurements``) send up to
+    ``max_workers`` of their requests concurrently.
+
+    ``sync_measurements`` keeps a copy of your measurements in
+    ``measurement_store``, by default held in memory; pass a
+    ``MeasurementStore`` with a path to keep it between runs.
+
+    Report data is kept in ``report_cache`` for a short while (see
+    ``ReportCache``), so that the same report requested again on the same
+    day doesn't cause another request.  Pass the same ``ReportCache`` to
+    several clients to share it between them, or ``report_cache=False``
+    to disable it.
+
+    Nutrient goals fetched by ``get_goals_range``, ``set_new_goal`` and
+    ``set_goal_schedule`` are reused for up to ``goals_ttl`` seconds, so
+    goals changed elsewhere in the meantime (e.g. on the website) go
+    unnoticed until then unless these methods are passed ``refresh``.
+    """
 
     COOKIE_DOMAINS = [
         "myfitnesspal.com",
@@ -46,6 +201,9 @@ class Client(MFPBase):
     LOGIN_JSON_PATH = "api/auth/callback/credentials"
     CSRF_PATH = "api/auth/csrf"
     SEARCH_PATH = "food/search"
+    FOOD_SUBMIT_PATH = "food/submit"
+    FOOD_DUPLICATE_PATH = "food/duplicate"
+    FOOD_NEW_PATH = "food/new"
     ABBREVIATIONS = {
         "carbs": "carbohydrates",
     }
@@ -60,15 +218,51 @@ class Client(MFPBase):
         "potass.": (Mass, "mg"),
         "kilojoules": (Energy, "kJ"),
     }
+    # How many days back the report API can be relied upon to return
+    REPORT_LOOKBACK_DAYS = 80
+    # Diary totals from which reports in the Nutrition category can be
+    # computed for dates beyond the report API's lookback
+    DIARY_REPORT_TOTALS = {
+        "Net Calories": "calories",
+        "Total Calories": "calories",
+        "Carbs": "carbohydrates",
+        "Fat": "fat",
+        "Protein": "protein",
+        "Sodium": "sodium",
+        "Sugar": "sugar",
+        "Fiber": "fiber",
+        "Potassium": "potass.",
+    }
 
     def __init__(
         self,
         cookiejar: CookieJar | None = None,
         unit_aware: bool = False,
         log_requests_to: Path | None = None,
+        food_index: FoodIndex | None = None,
+        pool_maxsize: int = 10,
+        api_pool_maxsize: int = 10,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker_threshold: int | None = 5,
+        circuit_breaker_reset_after: float = 30.0,
+        rate_limit: float | None = None,
+        api_rate_limit: float | None = None,
+        max_concurrency: int | None = None,
+        concurrency_latency_target: float | None = None,
+        timeout: float | tuple[float, float] | None = (10.0, 30.0),
+        single_flight: SingleFlight | None = None,
+        http_cache: ConditionalCache | bool = True,
+        transport: Transport | None = None,
+        stats: ClientStats | None = None,
+        tracer: Tracer | None = None,
+        max_workers: int = 4,
+        measurement_store: MeasurementStore | None = None,
+        report_cache: ReportCache | bool = True,
+        goals_ttl: float = 300.0,
     ):
         self._client_instance_id = uuid.uuid4()
         self._request_counter = 0
+        self._request_counter_lock = threading.Lock()
         self._log_requests_to: Path | None = None
         if log_requests_to:
             self._log_requests_to = log_requests_to / Path(
@@ -77,6 +271,42 @@ class Client(MFPBase):
             self._log_requests_to.mkdir(parents=True, exist_ok=True)
 
         self.unit_aware = unit_aware
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._single_flight = (
+            single_flight if single_flight is not None else SingleFlight()
+        )
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._circuit_breaker_threshold = circuit_breaker_threshold
+        self._circuit_breaker_reset_after = circuit_breaker_reset_after
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._circuit_breakers_lock = threading.Lock()
+        self._rate_limiters: dict[str, TokenBucket] = {}
+        self._concurrency_limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+        for base_url, rate in (
+            (self.BASE_URL_SECURE, rate_limit),
+            (self.BASE_API_URL, api_rate_limit),
+        ):
+            host = parse.urlsplit(base_url).netloc
+            if rate:
+                self._rate_limiters[host] = TokenBucket(rate)
+            if max_concurrency:
+                self._concurrency_limiters[host] = AdaptiveConcurrencyLimiter(
+                    max_concurrency, latency_target=concurrency_latency_target
+                )
+        self.food_index = food_index if food_index is not None else FoodIndex()
+        self.measurement_store = (
+            measurement_store if measurement_store is not None else MeasurementStore()
+        )
+        self._measurement_form: types.MeasurementForm | None = None
+        self._measurement_form_lock = threading.Lock()
+        self._food_forms: dict[str, types.FoodForm] = {}
+        self._food_forms_lock = threading.Lock()
+        self.goals_ttl = goals_ttl
+        self._nutrient_goals: dict[datetime.date, tuple[float, dict[str, Any]]] = {}
+        self._nutrient_goals_lock = threading.Lock()
+        self.stats = stats if stats is not None else ClientStats()
+        self.tracer = tracer if tracer is not None else Tracer()
 
         self.session = requests.Session()
         self.session.headers.update(
@@ -84,6 +314,14 @@ class Client(MFPBase):
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/88.0.4324.104 Safari/537.36"
             }
         )
+        for base_url in (self.BASE_URL, self.BASE_URL_SECURE):
+            self.session.mount(base_url, HTTPAdapter(pool_maxsize=pool_maxsize))
+        self.session.mount(
+            self.BASE_API_URL, HTTPAdapter(pool_maxsize=api_pool_maxsize)
+        )
+        self.transport = (
+            transport if transport is not None else RequestsTransport(self.session)
+        )
         if cookiejar is not None:
             self.session.cookies.update(cookiejar)
         else:
@@ -92,8 +330,22 @@ class Client(MFPBase):
                     browser_cookie3.load(domain_name=domain_name)
                 )
 
-        self._auth_data = self._get_auth_data()
-        self._user_metadata = self._get_user_metadata()
+        self.http_cache: ConditionalCache | None
+        if isinstance(http_cache, ConditionalCache):
+            self.http_cache = http_cache
+        else:
+            self.http_cache = ConditionalCache() if http_cache else None
+
+        self.report_cache: ReportCache | None
+        if isinstance(report_cache, ReportCache):
+            self.report_cache = report_cache
+        else:
+            self.report_cache = ReportCache() if report_cache else None
+
+        self._auth_data: types.AuthData | None = None
+        with self.tracer.span("Client.authenticate"):
+            self._auth_data = self._get_auth_data()
+            self._user_metadata = self._get_user_metadata()
 
     @property
     def user_id(self) -> types.MyfitnesspalUserId | None:
@@ -217,40 +469,288 @@ class Client(MFPBase):
             + parse.urlencode({"page": page, "type": measurement_name})
         )
 
+    def _get_next_request_number(self) -> int:
+        with self._request_counter_lock:
+            self._request_counter += 1
+            return self._request_counter
+
+    def _get_auth_headers(self) -> dict[str, str]:
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "mfp-client-id": "mfp-main-js",
+        }
+        if self.user_id:
+            headers["mfp-user-id"] = self.user_id
+
+        return headers
+
+    def _get_circuit_breaker(self, url: str) -> CircuitBreaker | None:
+        if self._circuit_breaker_threshold is None:
+            return None
+
+        host = parse.urlsplit(url).netloc
+        with self._circuit_breakers_lock:
+            if host not in self._circuit_breakers:
+                self._circuit_breakers[host] = CircuitBreaker(
+                    host,
+                    failure_threshold=self._circuit_breaker_threshold,
+                    reset_after=self._circuit_breaker_reset_after,
+                )
+            return self._circuit_breakers[host]
+
+    def _get_timeout(self) -> float | tuple[float, float] | None:
+        deadline = get_current_deadline()
+        if deadline is None:
+            return self.timeout
+
+        deadline.check()
+        remaining = deadline.remaining()
+        if self.timeout is None:
+            return remaining
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+            return (min(connect, remaining), min(read, remaining))
+        return min(self.timeout, remaining)
+
+    def _send_attempt(self, method: str, url: str, **kwargs) -> requests.Response:
+        host = parse.urlsplit(url).netloc
+        rate_limiter = self._rate_limiters.get(host)
+        concurrency_limiter = self._concurrency_limiters.get(host)
+
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = self._get_timeout()
+
+        deadline = get_current_deadline()
+        remaining = deadline.remaining() if deadline is not None else None
+        if rate_limiter is not None and not rate_limiter.acquire(remaining):
+            raise MyfitnesspalDeadlineExceeded(
+                f"Deadline passed while waiting to send request to {url}."
+            )
+        if concurrency_limiter is not None:
+            if deadline is not None:
+                remaining = deadline.remaining()
+            if not concurrency_limiter.acquire(remaining):
+                raise MyfitnesspalDeadlineExceeded(
+                    f"Deadline passed while waiting to send request to {url}."
+                )
+        started = time.monotonic()
+        try:
+            with self.tracer.span(f"HTTP {method}", url=url) as span:
+                result = self.transport.request(method, url, **kwargs)
+                if span is not None:
+                    span.set_attribute("status_code", result.status_code)
+        except requests.RequestException as e:
+            latency = time.monotonic() - started
+            if concurrency_limiter is not None:
+                concurrency_limiter.release(latency, failed=True)
+            self.stats.record_request(method, url, latency, error=type(e).__name__)
+            raise
+        except BaseException:
+            if concurrency_limiter is not None:
+                concurrency_limiter.release(time.monotonic() - started, abandoned=True)
+            raise
+        latency = time.monotonic() - started
+        if concurrency_limiter is not None:
+            concurrency_limiter.release(latency, status_code=result.status_code)
+        self.stats.record_request(
+            method,
+            url,
+            latency,
+            status_code=result.status_code,
+            response_bytes=len(result.content or b""),
+        )
+
+        return result
+
+    def _send_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        circuit_breaker = self._get_circuit_breaker(url)
+        deadline = get_current_deadline()
+        attempt = 0
+
+        while True:
+            if deadline is not None:
+                deadline.check()
+            if circuit_breaker is not None:
+                circuit_breaker.before_request()
+
+            attempt += 1
+            result: requests.Response | None = None
+            try:
+                result = self._send_attempt(method, url, **kwargs)
+            except requests.RequestException as e:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                if isinstance(e, requests.Timeout) and deadline is not None:
+                    if deadline.expired:
+                        raise MyfitnesspalDeadlineExceeded(
+                            f"Deadline passed while waiting for response from {url}."
+                        ) from e
+                if not self.retry_policy.should_retry(method, attempt, exception=e):
+                    raise
+                reason = str(e)
+            except BaseException:
+                # e.g. the deadline passed while waiting for a rate limiter;
+                # this attempt says nothing about the host's health
+                if circuit_breaker is not None:
+                    circuit_breaker.release_trial()
+                raise
+            else:
+                if circuit_breaker is not None:
+                    if result.status_code >= 500:
+                        circuit_breaker.record_failure()
+                    else:
+                        circuit_breaker.record_success()
+                if not self.retry_policy.should_retry(method, attempt, response=result):
+                    return result
+                reason = f"status {result.status_code}"
+
+            backoff = self.retry_policy.get_backoff(attempt, response=result)
+            if deadline is not None and backoff >= deadline.remaining():
+                if result is not None:
+                    return result
+                raise MyfitnesspalDeadlineExceeded(
+                    f"Deadline would pass before request to {url} could be retried."
+                )
+            logger.info(
+                "%s %s failed (%s); retrying in %.2fs (attempt %s of %s)",
+                method,
+                url,
+                reason,
+                backoff,
+                attempt,
+                self.retry_policy.total,
+            )
+            self.stats.record_retry(method, url)
+            time.sleep(backoff)
+
+    def _post_request_for_url(
+        self,
+        url: str,
+        data: Any = None,
+        send_token: bool = False,
+        headers: dict[str, str] | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        logger.debug(
+            "Sending POST request (#%s for client) to url %s",
+            self._get_next_request_number(),
+            url,
+        )
+        headers = dict(headers) if headers else {}
+
+        if send_token:
+            headers.update(self._get_auth_headers())
+
+        return self._send_request("POST", url, data=data, headers=headers, **kwargs)
+
+    def _get_identity(self) -> str:
+        # Responses are specific to the account they were fetched for; until
+        # we know which account that is, they're specific to this client.
+        if self._auth_data is None:
+            return str(self._client_instance_id)
+        return self._auth_data["user_id"]
+
+    def _coalesce(self, key: tuple, fn: Callable[[], T]) -> T:
+        deadline = get_current_deadline()
+        return self._single_flight.do(
+            (self._get_identity(),) + key,
+            fn,
+            timeout=deadline.remaining() if deadline is not None else None,
+        )
+
+    def _map_concurrently(
+        self,
+        fn: Callable[[Any], T],
+        items: Iterable[Any],
+        max_workers: int | None = None,
+    ) -> Generator[T, None, None]:
+        """Yields ``fn(item)`` for each of ``items``, in order, calling
+        ``fn`` from up to ``max_workers`` (by default, the client's
+        ``max_workers``) threads at once.
+
+        Calls that haven't started by the time the caller stops iterating
+        are cancelled.
+        """
+        items = list(items)
+        if max_workers is None:
+            max_workers = self.max_workers
+        if max_workers <= 1 or len(items) <= 1:
+            for item in items:
+                yield fn(item)
+            return
+
+        # Each call runs in a copy of the caller's context so that its
+        # deadline and tracing span apply to the requests it makes.
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, fn, item)
+                for item in items
+            ]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
     def _get_request_for_url(
         self,
         url: str,
         send_token: bool = False,
         headers: dict[str, str] | None = None,
         **kwargs,
+    ) -> requests.Response:
+        if kwargs:
+            return self._fetch_url(url, send_token, headers, **kwargs)
+
+        return self._coalesce(
+            ("GET", url, send_token, tuple(sorted((headers or {}).items()))),
+            lambda: self._fetch_url(url, send_token, headers),
+        )
+
+    def _fetch_url(
+        self,
+        url: str,
+        send_token: bool = False,
+        headers: dict[str, str] | None = None,
+        **kwargs,
     ) -> requests.Response:
         request_id = uuid.uuid4()
-        self._request_counter += 1
+        request_number = self._get_next_request_number()
         logger.debug(
             "Sending request %s (#%s for client) to url %s",
-            self._request_counter,
+            request_number,
             request_id,
             url,
         )
-        if headers is None:
-            headers = {}
+        headers = dict(headers) if headers else {}
 
         if send_token:
-            headers.update(
-                {
-                    "Authorization": f"Bearer {self.access_token}",
-                    "mfp-client-id": "mfp-main-js",
-                }
-            )
-            if self.user_id:
-                headers["mfp-user-id"] = self.user_id
-
-        result = self.session.get(url, headers=headers, **kwargs)
+            headers.update(self._get_auth_headers())
+
+        cache_key = None
+        cached = None
+        if self.http_cache is not None and not kwargs:
+            cache_key = (self._get_identity(), url, send_token)
+            # The entry may be evicted while the request is in flight, so
+            # the response revalidated is the one read here
+            cached = self.http_cache.get(cache_key)
+            if cached is not None:
+                headers.update(get_response_validators(cached))
+
+        result = self._send_request("GET", url, headers=headers, **kwargs)
+
+        if cache_key is not None and self.http_cache is not None:
+            if result.status_code == 304 and cached is not None:
+                logger.debug("Using cached response for %s", url)
+                result = cached
+            else:
+                self.http_cache.store(cache_key, result)
         if self._log_requests_to:
             with open(
                 self._log_requests_to
                 / Path(
-                    str(self._request_counter).zfill(3) + "__" + str(request_id)
+                    str(request_number).zfill(3) + "__" + str(request_id)
                 ).with_suffix(".json"),
                 "w",
                 encoding="utf-8",
@@ -281,15 +781,36 @@ class Client(MFPBase):
     def _get_content_for_url(self, *args, **kwargs) -> str:
         return self._get_request_for_url(*args, **kwargs).content.decode("utf8")
 
+    @contextmanager
+    def _parse_phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            with self.tracer.span(f"parse {name}"):
+                yield
+        finally:
+            self.stats.record_parse(name, time.perf_counter() - started)
+
     def _get_document_for_url(self, url):
-        content = self._get_content_for_url(url)
+        def get_document():
+            content = self._get_content_for_url(url)
+            with self._parse_phase("html"):
+                return lxml.html.document_fromstring(content)
+
+        return self._coalesce(("document", url), get_document)
+
+    def _get_next_data_for_url(self, url) -> NextData:
+        def get_next_data():
+            content = self._get_request_for_url(url).content
+            with self._parse_phase("next_data"):
+                return NextData(content)
 
-        return lxml.html.document_fromstring(content)
+        return self._coalesce(("next_data", url), get_next_data)
 
     def _get_json_for_url(self, url):
         content = self._get_content_for_url(url)
 
-        return json.loads(content)
+        with self._parse_phase("json"):
+            return json.loads(content)
 
     def _get_measurement(self, name: str, value: float | None) -> MeasureBase:
         if not self.unit_aware:
@@ -318,6 +839,7 @@ class Client(MFPBase):
             fields.append(self._get_full_name(field.text))
         return fields
 
+    @parser("goals")
     def _get_goals(self, document):
         try:
             total_header = document.xpath("//tr[@class='total']")[0]
@@ -342,6 +864,7 @@ class Client(MFPBase):
 
         return nutrition
 
+    @parser("completion")
     def _get_completion(self, document) -> bool:
         try:
             completion_header = document.xpath("//div[@id='complete_day']")[0]
@@ -356,6 +879,7 @@ class Client(MFPBase):
 
         return False  # Who knows, probably not my diary.
 
+    @parser("meals")
     def _get_meals(self, document) -> list[Meal]:
         meals = []
         fields = None
@@ -420,6 +944,7 @@ class Client(MFPBase):
             + f"?date={date_str}"
         )
 
+    @parser("exercise")
     def _get_exercise(self, document):
         exercises = []
         ex_headers = document.xpath("//table[@class='table0']")
@@ -491,6 +1016,7 @@ class Client(MFPBase):
 
         return exercises
 
+    @traced
     def _get_exercises(self, date: datetime.date, friend_username=None):
         if friend_username is not None:
             name = friend_username
@@ -518,8 +1044,14 @@ class Client(MFPBase):
     @overload
     def get_date(self, date: datetime.date) -> Day: ...
 
+    @traced
     def get_date(self, *args, **kwargs) -> Day:
-        """Returns your meal diary for a particular date"""
+        """Returns your meal diary for a particular date
+
+        The optional ``deadline`` keyword argument also applies to the
+        requests made when the returned day's notes, water or exercises
+        are first accessed.
+        """
         if len(args) == 3:
             date = datetime.date(
                 int(args[0]),
@@ -535,13 +1067,14 @@ class Client(MFPBase):
                 "respectively."
             )
         friend_username = kwargs.get("friend_username")
-        document = self._get_document_for_url(
-            self._get_url_for_date(
-                date,
-                kwargs.get("username", self.effective_username),
-                friend_username,
+        with deadline_scope(kwargs.get("deadline")) as deadline:
+            document = self._get_document_for_url(
+                self._get_url_for_date(
+                    date,
+                    kwargs.get("username", self.effective_username),
+                    friend_username,
+                )
             )
-        )
         if "diary is locked with a key" in document.text_content():
             raise Exception("Error: diary is locked with a key")
         if (
@@ -557,10 +1090,11 @@ class Client(MFPBase):
         complete = self._get_completion(document)
 
         # Since this data requires an additional request, let's just
-        # allow the day object to run the request if necessary.
-        notes = lambda: self._get_notes(date)  # noqa: E731
-        water = lambda: self._get_water(date)  # noqa: E731
-        exercises = lambda: self._get_exercises(date, friend_username)  # noqa: E731
+        # allow the day object to run the request if necessary; those
+        # requests remain bound by this call's deadline.
+        notes = bind_deadline(deadline, self._get_notes, date)
+        water = bind_deadline(deadline, self._get_water, date)
+        exercises = bind_deadline(deadline, self._get_exercises, date, friend_username)
 
         if "friend_username" not in kwargs:
             day = Day(
@@ -594,11 +1128,14 @@ class Client(MFPBase):
             lower_bound, upper_bound = upper_bound, lower_bound
         return upper_bound, lower_bound
 
+    @traced
+    @with_deadline
     def get_measurements(
         self,
         measurement="Weight",
         lower_bound: datetime.date | None = None,
         upper_bound: datetime.date | None = None,
+        deadline: DeadlineSpec = None,
     ) -> dict[datetime.date, float]:
         """Returns measurements of a given name between two dates."""
         upper_bound, lower_bound = self._ensure_upper_lower_bound(
@@ -606,40 +1143,139 @@ class Client(MFPBase):
         )
 
         # get the URL for the main check in page
-        document = self._get_document_for_url(self._get_url_for_measurements())
+        document = self._get_next_data_for_url(self._get_url_for_measurements())
 
         # gather the IDs for all measurement types
-        measurement_ids = self._get_measurement_ids(document)
+        measurement_ids = self._update_measurement_form(document)["ids"]
 
         if measurement not in measurement_ids.keys():
             raise ValueError(f"Measurement '{measurement}' does not exist.")
 
-        page = 1
-        measurements = OrderedDict()
+        return self._get_measurements_between(
+            document, measurement, lower_bound, upper_bound
+        )
 
-        # retrieve entries until finished
-        while True:
-            # retrieve the HTML from MyFitnessPal
-            document = self._get_document_for_url(
-                self._get_url_for_measurements(page, measurement)
+    @traced
+    @with_deadline
+    def get_measurements_many(
+        self,
+        measurements: Iterable[str] = ("Weight",),
+        lower_bound: datetime.date | None = None,
+        upper_bound: datetime.date | None = None,
+        deadline: DeadlineSpec = None,
+    ) -> dict[str, dict[datetime.date, float | None]]:
+        """Returns measurements of several names between two dates.
+
+        The measurements are fetched concurrently.  Each returned series
+        has the same dates (newest first): those on which any of the
+        measurements was recorded, with ``None`` where a measurement
+        wasn't.
+        """
+        measurements = list(measurements)
+        upper_bound, lower_bound = self._ensure_upper_lower_bound(
+            lower_bound, upper_bound
+        )
+
+        document = self._get_next_data_for_url(self._get_url_for_measurements())
+        measurement_ids = self._update_measurement_form(document)["ids"]
+
+        for measurement in measurements:
+            if measurement not in measurement_ids.keys():
+                raise ValueError(f"Measurement '{measurement}' does not exist.")
+
+        series = dict(
+            zip(
+                measurements,
+                self._map_concurrently(
+                    lambda measurement: self._get_measurements_between(
+                        document, measurement, lower_bound, upper_bound
+                    ),
+                    measurements,
+                ),
             )
+        )
 
-            # parse the HTML for measurement entries and add to dictionary
-            results = self._get_measurements(document)
-            measurements.update(results)
+        dates = sorted(
+            {date for values in series.values() for date in values}, reverse=True
+        )
+        return {
+            measurement: OrderedDict((date, values.get(date)) for date in dates)
+            for measurement, values in series.items()
+        }
 
-            # stop if there are no more entries
-            if len(results) == 0:
-                break
+    @traced
+    @with_deadline
+    def sync_measurements(
+        self,
+        measurement: str = "Weight",
+        lower_bound: datetime.date | None = None,
+        deadline: DeadlineSpec = None,
+    ) -> dict[datetime.date, float]:
+        """Updates ``measurement_store`` with the measurements of a given
+        name recorded since ``lower_bound``.
 
-            # continue if the lower bound has not been reached
-            elif list(results.keys())[-1] > lower_bound:
-                page += 1
-                continue
+        Only entries dated on or after the last date synced are fetched,
+        unless ``lower_bound`` precedes the dates already synced; by
+        default, those already synced (or the last 30 days' worth if none
+        are) are kept up to date.  Returns the entries fetched.
+        """
+        user_id = str(self.user_id)
+        today = datetime.date.today()
+        synced = self.measurement_store.get_synced_range(user_id, measurement)
 
-            # otherwise stop
-            else:
-                break
+        if lower_bound is None:
+            lower_bound = synced[0] if synced else today - datetime.timedelta(days=30)
+        fetch_from = lower_bound
+        if synced is not None and synced[0] <= lower_bound:
+            fetch_from = min(synced[1], today)
+
+        measurements = self.get_measurements(measurement, fetch_from, today)
+        self.measurement_store.replace(
+            user_id, measurement, measurements, fetch_from, today
+        )
+        return measurements
+
+    @traced
+    @with_deadline
+    def get_stored_measurements(
+        self,
+        measurement: str = "Weight",
+        lower_bound: datetime.date | None = None,
+        upper_bound: datetime.date | None = None,
+        sync: bool = True,
+        deadline: DeadlineSpec = None,
+    ) -> dict[datetime.date, float]:
+        """Returns measurements of a given name between two dates from
+        ``measurement_store``.
+
+        Unless ``sync`` is ``False``, the store is first brought up to date
+        using ``sync_measurements``.
+        """
+        upper_bound, lower_bound = self._ensure_upper_lower_bound(
+            lower_bound, upper_bound
+        )
+        if sync:
+            self.sync_measurements(measurement, lower_bound)
+
+        return self.measurement_store.get(
+            str(self.user_id), measurement, lower_bound, upper_bound
+        )
+
+    def _get_measurements_between(
+        self,
+        document,
+        measurement: str,
+        lower_bound: datetime.date,
+        upper_bound: datetime.date,
+    ) -> dict[datetime.date, float]:
+        # the check in page already shows the first page of one measurement
+        first_page = self._get_measurement_page(document, measurement, 1, exact=True)
+        if first_page is None:
+            first_page = self._fetch_measurement_page(measurement, 1)
+
+        measurements = OrderedDict(first_page["entries"])
+        for page in self._fetch_measurement_pages(measurement, first_page, lower_bound):
+            measurements.update(page["entries"])
 
         # remove entries that are not within the dates specified
         for date in list(measurements.keys()):
@@ -648,11 +1284,14 @@ class Client(MFPBase):
 
         return measurements
 
+    @traced
+    @with_deadline
     def set_measurements(
         self,
         measurement="Weight",
         value: float | None = None,
         date: datetime.date | None = None,
+        deadline: DeadlineSpec = None,
     ) -> None:
         """Sets measurement for today's date."""
         if value is None:
@@ -662,67 +1301,258 @@ class Client(MFPBase):
         if not isinstance(date, datetime.date):
             raise ValueError("Date must be a datetime.date object.")
 
-        # get the URL for the main check in page
-        # this is left in because we need to parse
-        # the 'measurement' name to set the value.
-        document = self._get_document_for_url(self._get_url_for_measurements())
+        form = self._get_measurement_form()
 
-        # get authenticity token for this particular form.
-        authenticity_token = document.xpath(
-            "//form[@action='/measurements/new']/input[@name='authenticity_token']/@value"
-        )[0]
+        # a measurement added since the form was cached won't be in it yet
+        if measurement not in form["ids"].keys():
+            form = self._get_measurement_form(refresh=True)
 
-        # gather the IDs for all measurement types
-        measurement_ids = self._get_measurement_ids(document)
+        # check if the measurement exists before going too far
+        if measurement not in form["ids"].keys():
+            raise ValueError(f"Measurement '{measurement}' does not exist.")
 
-        # get the authenticity token for this edit
-        authenticity_token = document.xpath(
-            "(//form[@action='/measurements/new']/input[@name='authenticity_token']/@value)",
-            smart_strings=False,
-        )[0]
+        result = self._set_measurement(measurement, value, date)
 
-        # check if the measurement exists before going too far
-        if measurement not in measurement_ids.keys():
+        # throw an error if it failed.
+        if not result.ok:
+            raise MyfitnesspalRequestFailed(
+                "Unable to update measurement in MyFitnessPal: "
+                "status code: {status}".format(status=result.status_code)
+            )
+
+    @traced
+    @with_deadline
+    def set_measurements_many(
+        self,
+        measurement: str = "Weight",
+        values: Iterable[tuple[datetime.date, float]] = (),
+        skip_unchanged: bool = True,
+        deadline: DeadlineSpec = None,
+    ) -> list[types.MeasurementWriteResult]:
+        """Sets a measurement's value for each of several dates.
+
+        ``values`` is a sequence of ``(date, value)`` pairs; should a date
+        appear more than once, the last value given for it is used.
+        Values are sent concurrently.  Unless ``skip_unchanged`` is
+        ``False``, values already recorded on MyFitnessPal are not sent
+        again.
+
+        Returns a result for each date, in the order given, whose
+        ``status`` is ``updated``, ``unchanged`` or ``failed`` (with the
+        reason in ``error``).
+        """
+        points: dict[datetime.date, float] = {}
+        for date, value in values:
+            if value is None:
+                raise ValueError("Cannot update blank value.")
+            if not isinstance(date, datetime.date):
+                raise ValueError("Date must be a datetime.date object.")
+            points[date] = value
+        if not points:
+            return []
+
+        existing: dict[datetime.date, float] = {}
+        if skip_unchanged:
+            existing = self.get_measurements(measurement, min(points), max(points))
+
+        form = self._get_measurement_form()
+        if measurement not in form["ids"].keys():
+            form = self._get_measurement_form(refresh=True)
+        if measurement not in form["ids"].keys():
             raise ValueError(f"Measurement '{measurement}' does not exist.")
 
+        def set_value(
+            point: tuple[datetime.date, float],
+        ) -> types.MeasurementWriteResult:
+            date, value = point
+            if date in existing and existing[date] == float(value):
+                return {
+                    "date": date,
+                    "value": value,
+                    "status": "unchanged",
+                    "error": None,
+                }
+
+            error = None
+            try:
+                result = self._set_measurement(measurement, value, date)
+                if not result.ok:
+                    error = f"status code: {result.status_code}"
+            except (MyfitnesspalRequestFailed, requests.RequestException) as e:
+                error = str(e)
+            return {
+                "date": date,
+                "value": value,
+                "status": "failed" if error else "updated",
+                "error": error,
+            }
+
+        return list(self._map_concurrently(set_value, points.items()))
+
+    def _set_measurement(
+        self, measurement: str, value: float, date: datetime.date
+    ) -> requests.Response:
+        return self._post_form(
+            self._get_measurement_form,
+            lambda form: self._post_measurement(form, measurement, value, date),
+        )
+
+    def _post_form(
+        self,
+        get_form: Callable[..., Any],
+        post: Callable[[Any], requests.Response],
+    ) -> requests.Response:
+        """Calls ``post`` with the cached form returned by ``get_form()``.
+
+        The cached token may have expired, so if the post is rejected it is
+        retried once with a fresh form; ``get_form(refresh=True)`` is only
+        called if another request hasn't already fetched one.
+        """
+        form = get_form()
+        result = post(form)
+
+        if result.status_code in (403, 422):
+            current = get_form()
+            if current["authenticity_token"] == form["authenticity_token"]:
+                current = get_form(refresh=True)
+            result = post(current)
+
+        return result
+
+    def _update_measurement_form(self, page: NextData) -> types.MeasurementForm:
+        """Caches the measurement IDs and check in form token shown on
+        ``page`` (the main check in page)."""
+        form: types.MeasurementForm = {
+            "ids": self._get_measurement_ids(page),
+            "authenticity_token": page.get_form_value(
+                "/measurements/new", "authenticity_token"
+            ),
+        }
+        with self._measurement_form_lock:
+            self._measurement_form = form
+        return form
+
+    def _get_measurement_form(self, refresh: bool = False) -> types.MeasurementForm:
+        with self._measurement_form_lock:
+            form = self._measurement_form
+
+        if form is None or form["authenticity_token"] is None or refresh:
+            document = self._get_next_data_for_url(self._get_url_for_measurements())
+            form = self._update_measurement_form(document)
+        if form["authenticity_token"] is None:
+            raise MyfitnesspalRequestFailed(
+                "Unable to find the check in form on MyFitnessPal."
+            )
+        return form
+
+    def _post_measurement(
+        self,
+        form: types.MeasurementForm,
+        measurement: str,
+        value: float,
+        date: datetime.date,
+    ) -> requests.Response:
         # build the update url.
         update_url = parse.urljoin(self.BASE_URL_SECURE, "measurements/new")
 
         # setup a dict for the post
         data = {
-            "authenticity_token": authenticity_token,
+            "authenticity_token": form["authenticity_token"],
             "measurement[display_value]": value,
-            "type": measurement_ids.get(measurement),
+            "type": form["ids"].get(measurement),
             "measurement[entry_date(2i)]": date.month,
             "measurement[entry_date(3i)]": date.day,
             "measurement[entry_date(1i)]": date.year,
         }
 
         # now post it.
-        result = self.session.post(update_url, data=data)
+        return self._post_request_for_url(update_url, data=data)
 
-        # throw an error if it failed.
-        if not result.ok:
-            raise MyfitnesspalRequestFailed(
-                "Unable to update measurement in MyFitnessPal: "
-                "status code: {status}".format(status=result.status_code)
-            )
+    def _fetch_measurement_page(
+        self, measurement: str, page: int
+    ) -> types.MeasurementPage:
+        document = self._get_next_data_for_url(
+            self._get_url_for_measurements(page, measurement)
+        )
+        result = self._get_measurement_page(document, measurement, page)
+        if result is None:
+            return {"entries": OrderedDict(), "has_more": False, "total_entries": None}
+        return result
+
+    def _is_last_measurement_page(
+        self, page: types.MeasurementPage, lower_bound: datetime.date
+    ) -> bool:
+        if not page["entries"] or not page["has_more"]:
+            return True
+        return list(page["entries"].keys())[-1] <= lower_bound
+
+    def _estimate_measurement_pages(
+        self, first_page: types.MeasurementPage, lower_bound: datetime.date
+    ) -> int:
+        """Estimates how many pages hold the entries dated on or after
+        ``lower_bound``, assuming they're spaced as on the first page."""
+        if self._is_last_measurement_page(first_page, lower_bound):
+            return 1
+
+        # n entries span n - 1 gaps; a page covers one more
+        dates = list(first_page["entries"].keys())
+        days_per_page = max(
+            (dates[0] - dates[-1]).days * len(dates) / max(len(dates) - 1, 1), 1
+        )
+        estimate = 1 + math.ceil((dates[-1] - lower_bound).days / days_per_page)
 
-    def _get_measurements(self, document):
-        measurements = []
+        if first_page["total_entries"]:
+            estimate = min(
+                estimate, math.ceil(first_page["total_entries"] / len(dates))
+            )
+        return max(estimate, 2)
 
-        for next_data in document.xpath("//script[@id='__NEXT_DATA__']"):
-            next_data_json = json.loads(next_data.text)
-            for q in next_data_json["props"]["pageProps"]["dehydratedState"]["queries"]:
-                if "measurements" in q["queryKey"]:
-                    if "items" in q["state"]["data"]:
-                        measurements += q["state"]["data"]["items"]
+    def _fetch_measurement_pages(
+        self,
+        measurement: str,
+        first_page: types.MeasurementPage,
+        lower_bound: datetime.date,
+    ) -> Iterator[types.MeasurementPage]:
+        """Yields the pages following ``first_page``, up to the one holding
+        entries dated on or before ``lower_bound``.
+
+        The pages estimated to be needed are fetched concurrently; should
+        the estimate fall short, further batches of ``max_workers`` pages
+        are fetched until the bound is reached.
+        """
+        if self._is_last_measurement_page(first_page, lower_bound):
+            return
 
+        next_page = 2
+        last_page = self._estimate_measurement_pages(first_page, lower_bound)
+        while True:
+            pages = self._map_concurrently(
+                lambda page: self._fetch_measurement_page(measurement, page),
+                range(next_page, last_page + 1),
+            )
+            try:
+                for page in pages:
+                    yield page
+                    if self._is_last_measurement_page(page, lower_bound):
+                        return
+            finally:
+                # Cancels fetching any pages beyond the last one needed
+                pages.close()
+
+            next_page = last_page + 1
+            last_page += max(self.max_workers, 1)
+
+    def _get_measurement_values(self, items: list[dict]) -> dict[datetime.date, float]:
         measurements_dict = OrderedDict()
 
         # converts the date to a datetime object and the value to a float
-        for entry in measurements:
-            date = datetime.datetime.strptime(entry["date"], "%Y-%m-%d").date()
+        for entry in items:
+            date = datetime.date.fromisoformat(entry["date"])
+            if "unit" not in entry and isinstance(entry["value"], (int, float)):
+                # numeric values without a unit need no parsing; those with
+                # one may not be in pounds (e.g. stones)
+                measurements_dict[date] = float(entry["value"])
+                continue
             if "unit" in entry:
                 value = f"{entry['value']} {entry['unit']}"
             else:
@@ -731,20 +1561,50 @@ class Client(MFPBase):
 
         return measurements_dict
 
-    def _get_measurement_ids(self, document) -> dict[str, int]:
+    @parser("measurement_page")
+    def _get_measurement_page(
+        self, document: NextData, measurement: str, page: int, exact: bool = False
+    ) -> types.MeasurementPage | None:
+        """Returns the given page of ``measurement``'s entries if present
+        in ``document``.
+
+        Unless ``exact`` is set, the entries of any measurement shown in
+        the document are returned if it doesn't identify them as the
+        expected page.
+        """
+        fallback = None
+        for q in document.queries:
+            if "measurements" not in q["queryKey"]:
+                continue
+            data = q["state"]["data"]
+            if "items" not in data:
+                continue
+            result: types.MeasurementPage = {
+                "entries": self._get_measurement_values(data["items"]),
+                "has_more": data.get("has_more", True),
+                "total_entries": data.get("total_entries"),
+            }
+            if q["queryKey"][1:3] == [measurement, page]:
+                return result
+            if fallback is None:
+                fallback = result
+
+        return None if exact else fallback
+
+    @parser("measurement_ids")
+    def _get_measurement_ids(self, document: NextData) -> dict[str, str]:
         ids = {}
-        for next_data in document.xpath("//script[@id='__NEXT_DATA__']"):
-            next_data_json = json.loads(next_data.text)
-            for q in next_data_json["props"]["pageProps"]["dehydratedState"]["queries"]:
-                if "measurementTypes" in q["queryKey"]:
-                    for m in q["state"]["data"]:
-                        ids[m["description"]] = m["id"]
-                if "measurements" in q["queryKey"]:
-                    if q["queryKey"][1] not in ids:
-                        ids[q["queryKey"][1]] = ""
+        for q in document.queries:
+            if "measurementTypes" in q["queryKey"]:
+                for m in q["state"]["data"]:
+                    ids[m["description"]] = m["id"]
+            if "measurements" in q["queryKey"]:
+                if q["queryKey"][1] not in ids:
+                    ids[q["queryKey"][1]] = ""
 
         return ids
 
+    @traced
     def _get_notes(self, date: datetime.date) -> Note:
         result = self._get_request_for_url(
             parse.urljoin(
@@ -755,6 +1615,7 @@ class Client(MFPBase):
         )
         return Note(result.json()["item"])
 
+    @traced
     def _get_water(self, date: datetime.date) -> float | Volume:
         result = self._get_request_for_url(
             parse.urljoin(
@@ -769,37 +1630,146 @@ class Client(MFPBase):
 
         return value
 
+    @traced
+    @with_deadline
     def get_report(
         self,
         report_name: str = "Net Calories",
         report_category: str = "Nutrition",
         lower_bound: datetime.date | None = None,
         upper_bound: datetime.date | None = None,
+        diary_fallback: bool = False,
+        deadline: DeadlineSpec = None,
     ) -> dict[datetime.date, float]:
         """
         Returns report data of a given name and category between two dates.
+
+        The report API can't be relied upon for dates more than
+        ``REPORT_LOOKBACK_DAYS`` ago.  With ``diary_fallback``, values for
+        such dates are instead computed from the totals of your food (and,
+        for ``Net Calories``, exercise) diary, fetched concurrently; this
+        is supported for the reports in ``DIARY_REPORT_TOTALS``.
         """
-        if lower_bound and ((datetime.date.today() - lower_bound).days > 80):
-            logger.warning(
-                "Report API may not be able to look back this far. Some results may be incorrect."
+        upper_bound, lower_bound = self._ensure_upper_lower_bound(
+            lower_bound, upper_bound
+        )
+
+        diary_values = None
+        if diary_fallback:
+            diary_values = self._get_diary_report_values(
+                [(report_name, report_category)], lower_bound, upper_bound
             )
+        else:
+            self._check_report_lookback(lower_bound)
+
+        return self._get_report(
+            report_name,
+            report_category,
+            lower_bound,
+            upper_bound,
+            diary_values=diary_values,
+        )
+
+    @traced
+    @with_deadline
+    def get_reports(
+        self,
+        reports: Iterable[tuple[str, str]],
+        lower_bound: datetime.date | None = None,
+        upper_bound: datetime.date | None = None,
+        diary_fallback: bool = False,
+        deadline: DeadlineSpec = None,
+    ) -> dict[datetime.date, dict[str, float | None]]:
+        """
+        Returns data of several reports between two dates.
+
+        ``reports`` is a sequence of ``(report_name, report_category)``
+        pairs; the reports are fetched concurrently.  Returns a row for
+        each date (oldest first) mapping each report's name to its value
+        on that date, or to ``None`` if it has none.
+
+        See ``get_report`` regarding ``diary_fallback``; each diary page
+        needed is fetched once for all of the reports.
+        """
+        reports = list(reports)
+        names = [report_name for report_name, _ in reports]
+        if len(set(names)) != len(names):
+            raise ValueError("Each report requested must have a distinct name.")
 
         upper_bound, lower_bound = self._ensure_upper_lower_bound(
             lower_bound, upper_bound
         )
 
-        assert upper_bound
-        assert lower_bound
+        diary_values = None
+        if diary_fallback:
+            diary_values = self._get_diary_report_values(
+                reports, lower_bound, upper_bound
+            )
+        else:
+            self._check_report_lookback(lower_bound)
+
+        results = dict(
+            zip(
+                names,
+                self._map_concurrently(
+                    lambda report: self._get_report(
+                        report[0],
+                        report[1],
+                        lower_bound,
+                        upper_bound,
+                        diary_values=diary_values,
+                    ),
+                    reports,
+                ),
+            )
+        )
 
-        # Get the URL for the report
-        json_data = self._get_json_for_url(
-            self._get_url_for_report(report_name, report_category, lower_bound)
+        dates = sorted({date for report in results.values() for date in report})
+        return OrderedDict(
+            (date, {name: report.get(date) for name, report in results.items()})
+            for date in dates
         )
 
-        report = OrderedDict(self._get_report_data(json_data))
+    def _get_report_lookback_date(self) -> datetime.date:
+        return datetime.date.today() - datetime.timedelta(
+            days=self.REPORT_LOOKBACK_DAYS
+        )
+
+    def _check_report_lookback(self, lower_bound: datetime.date) -> None:
+        if lower_bound < self._get_report_lookback_date():
+            logger.warning(
+                "Report API may not be able to look back this far. Some results may be incorrect."
+            )
+
+    def _get_report(
+        self,
+        report_name: str,
+        report_category: str,
+        lower_bound: datetime.date,
+        upper_bound: datetime.date,
+        diary_values: dict[datetime.date, dict[str, float]] | None = None,
+    ) -> dict[datetime.date, float]:
+        # Dates beyond the API's lookback are taken from ``diary_values``
+        api_lower_bound = lower_bound
+        if diary_values is not None:
+            api_lower_bound = max(lower_bound, self._get_report_lookback_date())
+
+        report: dict[datetime.date, float] = OrderedDict()
+        if api_lower_bound <= upper_bound:
+            report = self._fetch_report_data(
+                report_name, report_category, api_lower_bound
+            )
+
+            if not report:
+                raise ValueError(
+                    "Could not load any results for the given category & name"
+                )
 
-        if not report:
-            raise ValueError("Could not load any results for the given category & name")
+        if diary_values:
+            for date, values in diary_values.items():
+                if date < api_lower_bound:
+                    report[date] = values[report_name]
+            report = OrderedDict(sorted(report.items()))
 
         # Remove entries that are not within the dates specified
         for date in list(report.keys()):
@@ -808,6 +1778,87 @@ class Client(MFPBase):
 
         return report
 
+    def _fetch_report_data(
+        self, report_name: str, report_category: str, lower_bound: datetime.date
+    ) -> dict[datetime.date, float]:
+        today = datetime.date.today()
+        cache_key = (
+            self._get_identity(),
+            report_category.lower(),
+            report_name,
+            (today - lower_bound).days,
+            today,
+        )
+        if self.report_cache is not None:
+            cached = self.report_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Using cached report for %s", cache_key)
+                return cached
+
+        # Get the URL for the report
+        json_data = self._get_json_for_url(
+            self._get_url_for_report(report_name, report_category, lower_bound)
+        )
+
+        report = OrderedDict(self._get_report_data(json_data))
+        if report and self.report_cache is not None:
+            self.report_cache.store(cache_key, report)
+        return report
+
+    def _get_diary_report_values(
+        self,
+        reports: list[tuple[str, str]],
+        lower_bound: datetime.date,
+        upper_bound: datetime.date,
+    ) -> dict[datetime.date, dict[str, float]]:
+        """Computes the values of ``reports`` from the diary for each date
+        between the bounds that is beyond the report API's lookback."""
+        upper_bound = min(
+            upper_bound, self._get_report_lookback_date() - datetime.timedelta(days=1)
+        )
+        dates = [
+            lower_bound + datetime.timedelta(days=offset)
+            for offset in range((upper_bound - lower_bound).days + 1)
+        ]
+        if not dates:
+            return OrderedDict()
+
+        for report_name, report_category in reports:
+            if (
+                report_category.lower() != "nutrition"
+                or report_name not in self.DIARY_REPORT_TOTALS
+            ):
+                raise ValueError(
+                    f"Report '{report_name}' in category '{report_category}' "
+                    "cannot be computed from the diary."
+                )
+
+        def get_values(date: datetime.date) -> dict[str, float]:
+            day = self.get_date(date)
+            return {
+                report_name: self._get_diary_report_value(report_name, day)
+                for report_name, _ in reports
+            }
+
+        return OrderedDict(zip(dates, self._map_concurrently(get_values, dates)))
+
+    def _get_diary_report_value(self, report_name: str, day: Day) -> float:
+        name = self.DIARY_REPORT_TOTALS[report_name]
+        value = day.totals.get(name, 0.0)
+        if isinstance(value, MeasureBase):
+            value = getattr(value, self.DEFAULT_MEASURE_AND_UNIT[name][1])
+        total = float(value)
+
+        if report_name == "Net Calories":
+            for exercise in day.exercises:
+                for entry in exercise.entries:
+                    burned = entry.nutrition_information.get("calories burned")
+                    if isinstance(burned, MeasureBase):
+                        burned = burned.Calorie
+                    total -= float(burned or 0)
+
+        return total
+
     def _get_url_for_report(
         self, report_name: str, report_category: str, lower_bound: datetime.date
     ) -> str:
@@ -823,6 +1874,7 @@ class Client(MFPBase):
             + f"/{str(delta.days)}.json"
         )
 
+    @parser("report")
     def _get_report_data(self, json_data: dict) -> dict[datetime.date, float]:
         report_data: dict[datetime.date, float] = {}
 
@@ -848,7 +1900,11 @@ class Client(MFPBase):
     def __str__(self) -> str:
         return f"MyFitnessPal Client for {self.effective_username}"
 
-    def get_food_search_results(self, query: str) -> list[FoodItem]:
+    @traced
+    @with_deadline
+    def get_food_search_results(
+        self, query: str, deadline: DeadlineSpec = None
+    ) -> list[FoodItem]:
         """Search for foods matching a specified query."""
         search_url = parse.urljoin(self.BASE_URL_SECURE, self.SEARCH_PATH)
         document = self._get_document_for_url(search_url)
@@ -856,7 +1912,7 @@ class Client(MFPBase):
             "(//input[@name='authenticity_token']/@value)[1]"
         )[0]
 
-        result = self.session.post(
+        result = self._post_request_for_url(
             search_url,
             data={
                 "authenticity_token": authenticity_token,
@@ -875,6 +1931,7 @@ class Client(MFPBase):
 
         return self._get_food_search_results(document)
 
+    @parser("food_search_results")
     def _get_food_search_results(self, document) -> list[FoodItem]:
         item_divs = document.xpath("//li[@class='matched-food']")
 
@@ -901,8 +1958,27 @@ class Client(MFPBase):
                 FoodItem(mfp_id, mfp_name, brand, verif, calories, client=self)
             )
 
+        self.food_index.add_all(items)
+
         return items
 
+    @traced
+    def search_foods_local(self, query: str, limit: int | None = 10) -> list[FoodItem]:
+        """Search for foods matching a query among locally-indexed foods.
+
+        Foods are indexed as they are returned by ``get_food_search_results``
+        and ``get_food_item_details``.  If no indexed food matches the query,
+        falls back to searching MyFitnessPal (which also indexes the results).
+        """
+        results = self.food_index.search(query, limit=limit)
+        if results:
+            return results
+
+        results = self.get_food_search_results(query)
+        if limit is not None:
+            results = results[:limit]
+        return results
+
     def _get_food_item_details(self, mfp_id: int) -> types.FoodItemDetailsResponse:
         # api call for food item's details
         requested_fields = [
@@ -924,7 +2000,10 @@ class Client(MFPBase):
         )
         result = self._get_request_for_url(metadata_url, send_token=True)
         if not result.ok:
-            raise MyfitnesspalRequestFailed()
+            raise MyfitnesspalRequestFailed(
+                "Unable to fetch details for food {mfp_id} from MyFitnessPal: "
+                "status code: {status}".format(mfp_id=mfp_id, status=result.status_code)
+            )
 
         resp = result.json()["item"]
 
@@ -945,12 +2024,15 @@ class Client(MFPBase):
             "serving_sizes": resp["serving_sizes"],
         }
 
-    def get_food_item_details(self, mfp_id: int) -> FoodItem:
+    @traced
+    @with_deadline
+    def get_food_item_details(
+        self, mfp_id: int, deadline: DeadlineSpec = None
+    ) -> FoodItem:
         """Get details about a specific food using its ID."""
         details = self._get_food_item_details(mfp_id)
 
-        # returning food item's details
-        return FoodItem(
+        item = FoodItem(
             mfp_id,
             details["description"],
             details["brand_name"],
@@ -961,7 +2043,13 @@ class Client(MFPBase):
             serving_sizes=details["serving_sizes"],
             client=self,
         )
+        self.food_index.add(item)
+
+        # returning food item's details
+        return item
 
+    @traced
+    @with_deadline
     def set_new_food(
         self,
         brand: str,
@@ -986,83 +2074,174 @@ class Client(MFPBase):
         serving_size: str = "1 Serving",
         servingspercontainer: float = 1.0,
         sharepublic: bool = False,
+        deadline: DeadlineSpec = None,
     ) -> None:
         """Function to submit new foods / groceries to the MyFitnessPal database. Function will return True if successful."""
+        warning = self._submit_new_food(
+            {
+                "brand": brand,
+                "description": description,
+                "calories": calories,
+                "fat": fat,
+                "carbs": carbs,
+                "protein": protein,
+                "sodium": sodium,
+                "potassium": potassium,
+                "saturated_fat": saturated_fat,
+                "polyunsaturated_fat": polyunsaturated_fat,
+                "fiber": fiber,
+                "monounsaturated_fat": monounsaturated_fat,
+                "sugar": sugar,
+                "trans_fat": trans_fat,
+                "cholesterol": cholesterol,
+                "vitamin_a": vitamin_a,
+                "calcium": calcium,
+                "vitamin_c": vitamin_c,
+                "iron": iron,
+                "serving_size": serving_size,
+                "servingspercontainer": servingspercontainer,
+                "sharepublic": sharepublic,
+            }
+        )
+        if warning:
+            logger.warning(f"My Fitness Pal responded: {warning}")
+
+        # Would like to return FoodItem, but seems that it take
+        # to long until the submitted food is available in the DB
+        # return self.get_food_search_results("{} {}".format(brand, description))[0]
+
+    @traced
+    @with_deadline
+    def set_new_foods(
+        self,
+        foods: Iterable[types.NewFood],
+        skip_duplicates: bool = True,
+        deadline: DeadlineSpec = None,
+    ) -> list[types.FoodWriteResult]:
+        """Submits several new foods to the MyFitnessPal database.
+
+        Each of ``foods`` holds the arguments ``set_new_food`` accepts.
+        Foods are submitted concurrently, reusing the submission forms'
+        tokens for as long as MyFitnessPal accepts them.  Unless
+        ``skip_duplicates`` is ``False``, a food having the same brand and
+        description as one given earlier, or as a food in the local index
+        (see ``search_foods_local``), is not submitted.
+
+        Returns a result for each food, in the order given, whose
+        ``status`` is ``created``, ``duplicate`` or ``failed`` (with the
+        reason in ``error``); ``warning`` holds any warning MyFitnessPal
+        showed about similar foods already in its database.
+        """
+        foods = list(foods)
+
+        duplicates: set[int] = set()
+        if skip_duplicates:
+            seen: set[tuple[str, str]] = set()
+            for idx, food in enumerate(foods):
+                key = _get_food_key(food["brand"], food["description"])
+                if key in seen or self._is_indexed_food(food):
+                    duplicates.add(idx)
+                seen.add(key)
+
+        if len(duplicates) < len(foods):
+            # fetch the forms' tokens up front rather than in each thread
+            self._get_food_form(self.FOOD_SUBMIT_PATH)
+            self._get_food_form(self.FOOD_NEW_PATH)
+
+        def submit(item: tuple[int, types.NewFood]) -> types.FoodWriteResult:
+            idx, food = item
+            result: types.FoodWriteResult = {
+                "brand": food["brand"],
+                "description": food["description"],
+                "status": "created",
+                "warning": None,
+                "error": None,
+            }
+            if idx in duplicates:
+                result["status"] = "duplicate"
+                return result
 
-        SUBMIT_PATH = "food/submit"
-        SUBMIT_DUPLICATE_PATH = "food/duplicate"
-        SUBMIT_NEW_PATH = (
-            f"food/new?date={datetime.datetime.today().strftime('%Y-%m-%d')}&meal=0"
+            try:
+                result["warning"] = self._submit_new_food(food)
+            except (MyfitnesspalRequestFailed, requests.RequestException) as e:
+                result["status"] = "failed"
+                result["error"] = str(e)
+            return result
+
+        return list(self._map_concurrently(submit, enumerate(foods)))
+
+    def _is_indexed_food(self, food: types.NewFood) -> bool:
+        key = _get_food_key(food["brand"], food["description"])
+        return any(
+            _get_food_key(item.brand or "", item.name) == key
+            for item in self.food_index.search(
+                f"{food['brand']} {food['description']}", limit=None, fuzzy=False
+            )
         )
-        SUBMIT_POST_PATH = "food/new"
 
+    def _submit_new_food(self, food: types.NewFood) -> str | None:
+        """Submits ``food``, returning any warning shown about similar
+        foods."""
         # save current date in local variable for reusing
         date = datetime.datetime.today().strftime("%Y-%m-%d")
 
-        # get Authenticity Token
-        url = parse.urljoin(self.BASE_URL_SECURE, SUBMIT_PATH)
-        document = self._get_document_for_url(url)
-        authenticity_token = document.xpath(
-            "(//input[@name='authenticity_token']/@value)[1]"
-        )[0]
-        utf8_field = document.xpath("(//input[@name='utf8']/@value)[1]")[0]
-
         # submit brand and description --> Possible returns duplicates warning
-        url = parse.urljoin(self.BASE_URL_SECURE, SUBMIT_DUPLICATE_PATH)
-        result = self.session.post(
-            url,
-            data={
-                "utf8": utf8_field,
-                "authenticity_token": authenticity_token,
+        result = self._post_food_form(
+            self.FOOD_SUBMIT_PATH,
+            self.FOOD_DUPLICATE_PATH,
+            {
                 "date": date,
-                "food[brand]": brand,
-                "food[description]": description,
+                "food[brand]": food["brand"],
+                "food[description]": food["description"],
             },
         )
-        if not result.ok:
+        warning = self._get_new_food_warning(
+            lxml.html.document_fromstring(result.content.decode("utf-8"))
+        )
+
+        # Passed Brand and Desc. Ready to submit the new food form, which
+        # has a token of its own
+        result = self._post_food_form(
+            self.FOOD_NEW_PATH, self.FOOD_NEW_PATH, self._get_new_food_data(food, date)
+        )
+        error = self._get_new_food_error(
+            lxml.html.document_fromstring(result.content.decode("utf-8"))
+        )
+        if error:
             raise MyfitnesspalRequestFailed(
-                f"Request Error - Unable to submit food to MyFitnessPal: status code: {result.status_code}"
+                f"Unable to submit food to MyFitnessPal: {error}"
             )
 
-        # Check if a warning exists and log warning
-        document = lxml.html.document_fromstring(result.content.decode("utf-8"))
-        if document.xpath("//*[@id='main']/p[1]/span"):
-            warning = document.xpath("//*[@id='main']/p[1]/span")[0].text
-            logger.warning(f"My Fitness Pal responded: {warning}")
-        # Passed Brand and Desc. Ready submit Form but needs new Authenticity Token
-        url = parse.urljoin(self.BASE_URL_SECURE, SUBMIT_NEW_PATH)
-        document = self._get_document_for_url(url)
-        authenticity_token = document.xpath(
-            "(//input[@name='authenticity_token']/@value)[1]"
-        )[0]
-        utf8_field = document.xpath("(//input[@name='utf8']/@value)[1]")[0]
+        return warning
 
-        # Step4 - Build Post Data and finally submit new Food with nutritional Details
-        data = {
-            "utf8": utf8_field,
-            "authenticity_token": authenticity_token,
+    def _get_new_food_data(self, food: types.NewFood, date: str) -> dict[str, Any]:
+        def optional(name: str) -> str:
+            value = food.get(name)
+            return f"{value if value is not None else ''}"
+
+        data: dict[str, Any] = {
             "date": date,
-            "food[brand]": brand,
-            "food[description]": description,
-            "weight[serving_size]": serving_size,
-            "servingspercontainer": f"{servingspercontainer}",
-            "nutritional_content[calories]": f"{calories}",
-            "nutritional_content[sodium]": f"{sodium or ''}",
-            "nutritional_content[fat]": f"{fat}",
-            "nutritional_content[potassium]": f"{potassium if potassium is not None else ''}",
-            "nutritional_content[saturated_fat]": f"{saturated_fat if saturated_fat is not None else ''}",
-            "nutritional_content[carbs]": f"{carbs}",
-            "nutritional_content[polyunsaturated_fat]": f"{polyunsaturated_fat if polyunsaturated_fat is not None else ''}",
-            "nutritional_content[fiber]": f"{fiber if fiber is not None else ''}",
-            "nutritional_content[monounsaturated_fat]": f"{monounsaturated_fat if monounsaturated_fat is not None else ''}",
-            "nutritional_content[sugar]": f"{sugar if sugar is not None else ''}",
-            "nutritional_content[trans_fat]": f"{trans_fat if trans_fat is not None else ''}",
-            "nutritional_content[protein]": f"{protein}",
-            "nutritional_content[cholesterol]": f"{cholesterol if cholesterol is not None else ''}",
-            "nutritional_content[vitamin_a]": f"{vitamin_a if vitamin_a is not None else ''}",
-            "nutritional_content[calcium]": f"{calcium if calcium is not None else ''}",
-            "nutritional_content[vitamin_c]": f"{vitamin_c if vitamin_c is not None else ''}",
-            "nutritional_content[iron]": f"{iron if iron is not None else ''}",
+            "food[brand]": food["brand"],
+            "food[description]": food["description"],
+            "weight[serving_size]": food.get("serving_size", "1 Serving"),
+            "servingspercontainer": f"{food.get('servingspercontainer', 1.0)}",
+            "nutritional_content[calories]": f"{food['calories']}",
+            "nutritional_content[sodium]": f"{food.get('sodium') or ''}",
+            "nutritional_content[fat]": f"{food['fat']}",
+            "nutritional_content[potassium]": optional("potassium"),
+            "nutritional_content[saturated_fat]": optional("saturated_fat"),
+            "nutritional_content[carbs]": f"{food['carbs']}",
+            "nutritional_content[polyunsaturated_fat]": optional("polyunsaturated_fat"),
+            "nutritional_content[fiber]": optional("fiber"),
+            "nutritional_content[monounsaturated_fat]": optional("monounsaturated_fat"),
+            "nutritional_content[sugar]": optional("sugar"),
+            "nutritional_content[trans_fat]": optional("trans_fat"),
+            "nutritional_content[protein]": f"{food['protein']}",
+            "nutritional_content[cholesterol]": optional("cholesterol"),
+            "nutritional_content[vitamin_a]": optional("vitamin_a"),
+            "nutritional_content[calcium]": optional("calcium"),
+            "nutritional_content[vitamin_c]": optional("vitamin_c"),
+            "nutritional_content[iron]": optional("iron"),
             "food_entry[quantity]": "1.0",
             "food_entry[meal_id]": "0",
             "addtodiary": "no",
@@ -1071,35 +2250,64 @@ class Client(MFPBase):
         }
         # Make entry public if requested, Hint: submit "sharefood": 0 also generates a public db entry, so only add
         # "sharefood"" if really requested
-        if sharepublic:
+        if food.get("sharepublic"):
             data["sharefood"] = 1
+        return data
 
-        url = parse.urljoin(self.BASE_URL_SECURE, SUBMIT_POST_PATH)
-        result = self.session.post(
-            url,
-            data,
+    def _post_food_form(
+        self, form_path: str, post_path: str, data: dict[str, Any]
+    ) -> requests.Response:
+        url = parse.urljoin(self.BASE_URL_SECURE, post_path)
+        result = self._post_form(
+            functools.partial(self._get_food_form, form_path),
+            lambda form: self._post_request_for_url(url, data={**form, **data}),
         )
+
         if not result.ok:
             raise MyfitnesspalRequestFailed(
                 f"Request Error - Unable to submit food to MyFitnessPal: status code: {result.status_code}"
             )
+        return result
 
-        document = lxml.html.document_fromstring(result.content.decode("utf-8"))
-
-        if document.xpath(
-            # If list is empty there should be no error, could be replaced with assert
-            "//*[@id='errorExplanation']/ul/li"
-        ):
-            error = document.xpath("//*[@id='errorExplanation']/ul/li")[0].text
-            error = error.replace("Description ", "")  # For cosmetic reasons
+    def _get_food_form(self, path: str, refresh: bool = False) -> types.FoodForm:
+        """Returns the tokens of the form shown at ``path``, fetching the
+        form only if they aren't cached yet (or ``refresh`` is set)."""
+        with self._food_forms_lock:
+            form = self._food_forms.get(path)
+
+        if form is None or refresh:
+            date = datetime.datetime.today().strftime("%Y-%m-%d")
+            url = parse.urljoin(self.BASE_URL_SECURE, f"{path}?date={date}&meal=0")
+            form = self._get_food_form_tokens(self._get_document_for_url(url))
+            with self._food_forms_lock:
+                self._food_forms[path] = form
+        return form
+
+    @parser("food_form")
+    def _get_food_form_tokens(self, document) -> types.FoodForm:
+        authenticity_tokens = FORM_AUTHENTICITY_TOKEN(document)
+        utf8_fields = FORM_UTF8(document)
+        if not authenticity_tokens or not utf8_fields:
             raise MyfitnesspalRequestFailed(
-                f"Unable to submit food to MyFitnessPal: {error}"
+                "Unable to find the food submission form on MyFitnessPal."
             )
+        return {"authenticity_token": authenticity_tokens[0], "utf8": utf8_fields[0]}
+
+    @parser("food_warning")
+    def _get_new_food_warning(self, document) -> str | None:
+        # Check if a warning exists
+        warnings = NEW_FOOD_WARNING(document)
+        return warnings[0].text if warnings else None
+
+    @parser("food_error")
+    def _get_new_food_error(self, document) -> str | None:
+        errors = NEW_FOOD_ERRORS(document)
+        if not errors:
+            return None
+        return errors[0].text.replace("Description ", "")  # For cosmetic reasons
 
-        # Would like to return FoodItem, but seems that it take
-        # to long until the submitted food is available in the DB
-        # return self.get_food_search_results("{} {}".format(brand, description))[0]
-
+    @traced
+    @with_deadline
     def set_new_goal(
         self,
         energy: float,
@@ -1110,6 +2318,8 @@ class Client(MFPBase):
         percent_carbohydrates: float | None = None,
         percent_protein: float | None = None,
         percent_fat: float | None = None,
+        refresh: bool = False,
+        deadline: DeadlineSpec = None,
     ) -> None:
         """Updates your nutrition goals.
 
@@ -1123,6 +2333,7 @@ class Client(MFPBase):
 
         Optional arguments:
         energy_unit - Function is able to deal with calories and kilojoules. If not provided user preferences will be used.
+        refresh - Fetch the current goals even if they were fetched recently.
 
         Additional hints:
         Values will be adjusted and rounded by MFP if no premium subscription is applied!
@@ -1130,28 +2341,162 @@ class Client(MFPBase):
         # FROM MFP JS:
         # var calculated_energy = 4 * parseFloat(this.get('carbGrams')) + 4 * parseFloat(this.get('proteinGrams')) + 9 * parseFloat(this.get('fatsGrams'));
 
+        today = datetime.date.today()
+        new_goals = self._get_new_goals(
+            self._get_nutrient_goals(today, refresh=refresh),
+            today,
+            energy,
+            self._get_energy_unit(energy_unit),
+            carbohydrates,
+            protein,
+            fat,
+            percent_carbohydrates,
+            percent_protein,
+            percent_fat,
+        )
+        self._post_nutrient_goals(new_goals)
+
+    @traced
+    @with_deadline
+    def get_goals_range(
+        self,
+        lower_bound: datetime.date,
+        upper_bound: datetime.date | None = None,
+        refresh: bool = False,
+        deadline: DeadlineSpec = None,
+    ) -> dict[datetime.date, dict[str, Any]]:
+        """Returns the nutrient goals in effect on each date between two dates.
+
+        Goals are returned as provided by MyFitnessPal's API, with the
+        goals for each day of the week in ``daily_goals``.  Dates are
+        fetched concurrently, and the goals are kept so that later calls
+        (and ``set_goal_schedule``) needn't fetch them again; pass
+        ``refresh`` to fetch them regardless.
+        """
+        if upper_bound is None:
+            upper_bound = lower_bound
+        upper_bound, lower_bound = self._ensure_upper_lower_bound(
+            lower_bound, upper_bound
+        )
+
+        dates = [
+            lower_bound + datetime.timedelta(days=offset)
+            for offset in range((upper_bound - lower_bound).days + 1)
+        ]
+        return OrderedDict(
+            zip(
+                dates,
+                self._map_concurrently(
+                    lambda date: self._get_nutrient_goals(date, refresh=refresh), dates
+                ),
+            )
+        )
+
+    @traced
+    @with_deadline
+    def set_goal_schedule(
+        self,
+        schedule: Iterable[types.GoalChange],
+        refresh: bool = False,
+        deadline: DeadlineSpec = None,
+    ) -> None:
+        """Applies several changes to your nutrition goals, each from its
+        ``date`` onwards.
+
+        Each change holds the arguments ``set_new_goal`` accepts.  Changes
+        are sent in date order; only the goals in effect before the first
+        of them are fetched (unless already known and ``refresh`` isn't
+        set, see ``get_goals_range``), as each later change builds upon
+        the one before it.
+        """
+        changes = sorted(schedule, key=lambda change: change["date"])
+
+        previous: dict[str, Any] | None = None
+        for change in changes:
+            old_goal = (
+                previous
+                if previous is not None
+                else self._get_nutrient_goals(change["date"], refresh=refresh)
+            )
+            new_goals = self._get_new_goals(
+                old_goal,
+                change["date"],
+                change["energy"],
+                self._get_energy_unit(change.get("energy_unit", "calories")),
+                change.get("carbohydrates"),
+                change.get("protein"),
+                change.get("fat"),
+                change.get("percent_carbohydrates"),
+                change.get("percent_protein"),
+                change.get("percent_fat"),
+            )
+            self._post_nutrient_goals(new_goals)
+            previous = new_goals["item"]
+
+    def _get_energy_unit(self, energy_unit: str) -> str:
         # Get User Default Unit Preference
         if energy_unit != "calories" and energy_unit != "kilojoules":
             assert self.user_metadata
             energy_unit = self.user_metadata["unit_preferences"]["energy"]
+        return energy_unit
+
+    def _get_nutrient_goals(
+        self, date: datetime.date, refresh: bool = False
+    ) -> dict[str, Any]:
+        """Returns a copy of the nutrient goals in effect on ``date``,
+        fetching them unless they were fetched within ``goals_ttl``
+        seconds."""
+        goal = None
+        with self._nutrient_goals_lock:
+            entry = self._nutrient_goals.get(date)
+        if entry is not None and time.monotonic() - entry[0] < self.goals_ttl:
+            goal = entry[1]
+
+        if goal is None or refresh:
+            url = parse.urljoin(
+                self.BASE_API_URL, f"v2/nutrient-goals?date={date.isoformat()}"
+            )
+            goal = json.loads(self._get_request_for_url(url, send_token=True).text)[
+                "items"
+            ][0]
+            with self._nutrient_goals_lock:
+                self._nutrient_goals[date] = (time.monotonic(), goal)
+
+        return copy.deepcopy(goal)
 
-        # Get authenticity token and current values
-        url = parse.urljoin(self.BASE_URL_SECURE, "account/my_goals")
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
+    def _post_nutrient_goals(self, new_goals: dict[str, Any]) -> None:
+        # Build request and post
+        url = parse.urljoin(self.BASE_API_URL, "v2/nutrient-goals")
+        result = self._post_request_for_url(url, json.dumps(new_goals), send_token=True)
 
-        # Build header for API-requests
-        auth_header = self.session.headers
-        auth_header["authorization"] = f"Bearer {self.access_token}"
-        auth_header["mfp-client-id"] = "mfp-main-js"
-        auth_header["mfp-user-id"] = f"{self.user_id}"
+        if not result.ok:
+            raise MyfitnesspalRequestFailed(
+                "Request Error - Unable to submit Goals to MyFitnessPal: "
+                "status code: {status}".format(status=result.status_code)
+            )
 
-        # Get Request for old goal values
-        old_goals_url = parse.urljoin(
-            self.BASE_API_URL, f"v2/nutrient-goals?date={today}"
-        )
-        old_goals_document = self.session.get(old_goals_url, headers=auth_header)
-        old_goals = json.loads(old_goals_document.text)
+        # Cached goals from the new goals' first day on no longer apply
+        valid_from = datetime.date.fromisoformat(new_goals["item"]["valid_from"])
+        with self._nutrient_goals_lock:
+            for date in list(self._nutrient_goals):
+                if date >= valid_from:
+                    del self._nutrient_goals[date]
 
+    def _get_new_goals(
+        self,
+        old_goal: dict[str, Any],
+        valid_from: datetime.date,
+        energy: float,
+        energy_unit: str,
+        carbohydrates: float | None,
+        protein: float | None,
+        fat: float | None,
+        percent_carbohydrates: float | None,
+        percent_protein: float | None,
+        percent_fat: float | None,
+    ) -> dict[str, Any]:
+        """Returns the payload setting new goals from ``valid_from`` on,
+        based on the goals ``old_goal`` in effect before."""
         # Marcro Calculation
         # If no macro goals were provided calculate them with percentage value
         if carbohydrates is None or protein is None or fat is None:
@@ -1161,17 +2506,11 @@ class Client(MFPBase):
                 or percent_protein is None
                 or percent_fat is None
             ):
-                old_energy_value = old_goals["items"][0]["default_goal"]["energy"][
-                    "value"
-                ]
-                old_energy_unit = old_goals["items"][0]["default_goal"]["energy"][
-                    "unit"
-                ]
-                old_carbohydrates = old_goals["items"][0]["default_goal"][
-                    "carbohydrates"
-                ]
-                old_fat = old_goals["items"][0]["default_goal"]["fat"]
-                old_protein = old_goals["items"][0]["default_goal"]["protein"]
+                old_energy_value = old_goal["default_goal"]["energy"]["value"]
+                old_energy_unit = old_goal["default_goal"]["energy"]["unit"]
+                old_carbohydrates = old_goal["default_goal"]["carbohydrates"]
+                old_fat = old_goal["default_goal"]["fat"]
+                old_protein = old_goal["default_goal"]["protein"]
 
                 # If old and new values are in diffrent units then convert old value to new unit
                 if not old_energy_unit == energy_unit:
@@ -1224,14 +2563,14 @@ class Client(MFPBase):
 
         # Build payload based on observed browser behaviour
         new_goals = {}
-        new_goals["item"] = old_goals["items"][0]
+        new_goals["item"] = copy.deepcopy(old_goal)
         new_goals["item"].pop("valid_to", None)
         new_goals["item"].pop("default_group_id", None)
         new_goals["item"].pop("updated_at", None)
         new_goals["item"]["default_goal"]["meal_goals"] = []
 
         # insert new values
-        new_goals["item"]["valid_from"] = today
+        new_goals["item"]["valid_from"] = valid_from.isoformat()
 
         new_goals["item"]["default_goal"]["energy"]["value"] = energy
         new_goals["item"]["default_goal"]["energy"]["unit"] = energy_unit
@@ -1249,69 +2588,107 @@ class Client(MFPBase):
             goal["protein"] = protein
             goal["fat"] = fat
 
-        # Build request and post
-        url = parse.urljoin(self.BASE_API_URL, "v2/nutrient-goals")
-        result = self.session.post(url, json.dumps(new_goals), headers=auth_header)
+        return new_goals
 
-        if not result.ok:
-            raise MyfitnesspalRequestFailed(
-                "Request Error - Unable to submit Goals to MyFitnessPal: "
-                "status code: {status}".format(status=result.status_code)
-            )
-
-    def get_recipes(self) -> dict[int, str]:
+    @traced
+    @with_deadline
+    def get_recipes(self, deadline: DeadlineSpec = None) -> dict[int, str]:
         """Returns a dictionary with all saved recipes.
 
         Recipe ID will be used as dictionary key, recipe title as dictionary value.
         """
-        recipes_dict = {}
+        return self._get_recipe_list()
+
+    @traced
+    @with_deadline
+    def get_recipe(self, recipeid: int, deadline: DeadlineSpec = None) -> types.Recipe:
+        """Returns recipe details in a dictionary.
+
+        See https://schema.org/Recipe for details regarding this schema.
+        """
+        return self._fetch_recipe(recipeid)
+
+    @traced
+    @with_deadline
+    def get_recipes_full(
+        self, max_workers: int | None = None, deadline: DeadlineSpec = None
+    ) -> list[types.Recipe]:
+        """Returns the details of all saved recipes (see ``get_recipe``).
+
+        The pages of the recipe list, and then the recipes themselves, are
+        fetched using up to ``max_workers`` (by default, the client's
+        ``max_workers``) concurrent requests.
+        """
+        recipe_ids = list(self._get_recipe_list(max_workers))
+        return list(self._map_concurrently(self._fetch_recipe, recipe_ids, max_workers))
+
+    def _get_recipe_list(self, max_workers: int | None = None) -> dict[int, str]:
+        recipes_dict, has_next_page = self._fetch_recipe_list_page(1)
 
-        page_count = 1
-        has_next_page = True
+        # The number of pages isn't shown, so further pages are fetched in
+        # batches until one of them turns out to be the last.
+        batch_size = max(max_workers or self.max_workers, 1)
+        page_count = 2
         while has_next_page:
-            RECIPES_PATH = f"recipe_parser?page={page_count}&sort_order=recent"
-            recipes_url = parse.urljoin(self.BASE_URL_SECURE, RECIPES_PATH)
-            document = self._get_document_for_url(recipes_url)
-            recipes = document.xpath(
-                "//*[@id='main']/ul[1]/li"
-            )  # get all items in the recipe list
-            for recipe_info in recipes:
-                recipe_path = recipe_info.xpath("./div[2]/h2/span[1]/a")[0].attrib[
-                    "href"
-                ]
-                recipe_id = recipe_path.split("/")[-1]
-                recipe_title = recipe_info.xpath("./div[2]/h2/span[1]/a")[0].attrib[
-                    "title"
-                ]
-                recipes_dict[recipe_id] = recipe_title
-
-            # Check for Pagination
-            pagination_links = document.xpath('//*[@id="main"]/ul[2]/a')
-            if pagination_links:
-                if page_count == 1:
-                    # If Pagination exists and it is page 1 there have to be a second,
-                    # but only one href to the next (obviously none to the previous)
-                    page_count += 1
-                elif len(pagination_links) > 1:
-                    # If there are two links, ont to the previous and one to the next
-                    page_count += 1
-                else:
-                    # Only one link means it is the last page
-                    has_next_page = False
-            else:
-                # Indicator for no recipes if len(recipes_dict) is 0 here
-                has_next_page = False
+            pages = range(page_count, page_count + batch_size)
+            results = self._map_concurrently(
+                self._fetch_recipe_list_page, pages, max_workers
+            )
+            try:
+                for recipes, has_next_page in results:
+                    recipes_dict.update(recipes)
+                    if not has_next_page:
+                        break
+            finally:
+                results.close()
+            page_count += batch_size
 
         return recipes_dict
 
-    def get_recipe(self, recipeid: int) -> types.Recipe:
-        """Returns recipe details in a dictionary.
+    def _fetch_recipe_list_page(self, page: int) -> tuple[dict[int, str], bool]:
+        RECIPES_PATH = f"recipe_parser?page={page}&sort_order=recent"
+        recipes_url = parse.urljoin(self.BASE_URL_SECURE, RECIPES_PATH)
+        document = self._get_document_for_url(recipes_url)
+        return self._get_recipe_list_page(document, page)
 
-        See https://schema.org/Recipe for details regarding this schema.
-        """
+    @parser("recipe_list")
+    def _get_recipe_list_page(self, document, page: int) -> tuple[dict[int, str], bool]:
+        """Returns the recipes listed on ``page`` and whether there is a
+        page after it."""
+        recipes_dict = {}
+        for recipe_info in RECIPE_LIST_ITEMS(document):
+            link = RECIPE_LIST_ITEM_LINK(recipe_info)[0]
+            recipe_id = link.attrib["href"].split("/")[-1]
+            recipes_dict[recipe_id] = link.attrib["title"]
+
+        # Check for Pagination
+        pagination_links = RECIPE_LIST_PAGINATION_LINKS(document)
+        if not pagination_links:
+            # Indicator for no recipes if len(recipes_dict) is 0 here
+            return recipes_dict, False
+        if page == 1:
+            # If Pagination exists and it is page 1 there have to be a second,
+            # but only one href to the next (obviously none to the previous)
+            return recipes_dict, True
+        # If there are two links, one to the previous and one to the next;
+        # only one link means it is the last page
+        return recipes_dict, len(pagination_links) > 1
+
+    def _fetch_recipe(self, recipeid: int) -> types.Recipe:
         recipe_path = f"/recipe/view/{recipeid}"
         recipe_url = parse.urljoin(self.BASE_URL_SECURE, recipe_path)
         document = self._get_document_for_url(recipe_url)
+        return self._get_recipe(document, recipe_url)
+
+    @parser("recipe")
+    def _get_recipe(self, document, recipe_url: str) -> types.Recipe:
+        main = RECIPE_MAIN(document)[0]
+        nutrient_rows: dict[str, Any] = {}
+        for row in RECIPE_NUTRIENT_ROWS(document):
+            nutrient_rows.setdefault(row.attrib["id"], row)
+
+        def get_nutrient(row_id: str) -> str:
+            return RECIPE_NUTRIENT_VALUE(nutrient_rows[row_id])[0].text.strip(" \n")
 
         recipe_dict: dict[str, Any] = {
             "@context": "https://schema.org",
@@ -1319,96 +2696,115 @@ class Client(MFPBase):
             "author": self.effective_username,
         }
         recipe_dict["org_url"] = recipe_url
-        recipe_dict["name"] = document.xpath('//*[@id="main"]/div[3]/div[2]/h1')[0].text
-        recipe_dict["recipeYield"] = document.xpath('//*[@id="recipe_servings"]')[
-            0
-        ].text
+        recipe_dict["name"] = RECIPE_NAME(main)[0].text
+        recipe_dict["recipeYield"] = RECIPE_SERVINGS(document)[0].text
 
-        recipe_dict["recipeIngredient"] = []
-        ingredients = document.xpath('//*[@id="main"]/div[4]/div/*/li')
-        for ingredient in ingredients:
-            recipe_dict["recipeIngredient"].append(ingredient.text.strip(" \n"))
+        recipe_dict["recipeIngredient"] = [
+            ingredient.text.strip(" \n") for ingredient in RECIPE_INGREDIENTS(main)
+        ]
 
         recipe_dict["nutrition"] = {"@type": "NutritionInformation"}
-        recipe_dict["nutrition"]["calories"] = document.xpath(
-            '//*[@id="main"]/div[3]/div[2]/div[2]/div'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["carbohydrateContent"] = document.xpath(
-            '//*[@id="carbs"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["fiberContent"] = document.xpath(
-            '//*[@id="fiber"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["sugarContent"] = document.xpath(
-            '//*[@id="sugar"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["sodiumContent"] = document.xpath(
-            '//*[@id="sodium"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["proteinContent"] = document.xpath(
-            '//*[@id="protein"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["fatContent"] = document.xpath(
-            '//*[@id="total_fat"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["saturatedFatContent"] = document.xpath(
-            '//*[@id="saturated_fat"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["monounsaturatedFatContent"] = document.xpath(
-            '//*[@id="monounsaturated_fat"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
-        recipe_dict["nutrition"]["polyunsaturatedFatContent"] = document.xpath(
-            '//*[@id="polyunsaturated_fat"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
+        recipe_dict["nutrition"]["calories"] = RECIPE_CALORIES(main)[0].text.strip(
+            " \n"
+        )
+        recipe_dict["nutrition"]["carbohydrateContent"] = get_nutrient("carbs")
+        recipe_dict["nutrition"]["fiberContent"] = get_nutrient("fiber")
+        recipe_dict["nutrition"]["sugarContent"] = get_nutrient("sugar")
+        recipe_dict["nutrition"]["sodiumContent"] = get_nutrient("sodium")
+        recipe_dict["nutrition"]["proteinContent"] = get_nutrient("protein")
+        recipe_dict["nutrition"]["fatContent"] = get_nutrient("total_fat")
+        recipe_dict["nutrition"]["saturatedFatContent"] = get_nutrient("saturated_fat")
+        recipe_dict["nutrition"]["monounsaturatedFatContent"] = get_nutrient(
+            "monounsaturated_fat"
+        )
+        recipe_dict["nutrition"]["polyunsaturatedFatContent"] = get_nutrient(
+            "polyunsaturated_fat"
+        )
         recipe_dict["nutrition"]["unsaturatedFatContent"] = int(
             recipe_dict["nutrition"]["polyunsaturatedFatContent"]
         ) + int(recipe_dict["nutrition"]["monounsaturatedFatContent"])
-        recipe_dict["nutrition"]["transFatContent"] = document.xpath(
-            '//*[@id="trans_fat"]/td[1]/span[2]'
-        )[0].text.strip(" \n")
+        recipe_dict["nutrition"]["transFatContent"] = get_nutrient("trans_fat")
 
         # add some required tags to match schema
         recipe_dict["recipeInstructions"] = ""
         recipe_dict["tags"] = ["MyFitnessPal"]
         return cast(types.Recipe, recipe_dict)
 
-    def get_meals(self) -> dict[int, str]:
+    @traced
+    @with_deadline
+    def get_meals(self, deadline: DeadlineSpec = None) -> dict[int, str]:
         """Returns a dictionary with all saved meals.
 
         Key: Meal ID
         Value: Meal Name
         """
-        meals_dict = {}
         meals_path = "meal/mine"
         meals_url = parse.urljoin(self.BASE_URL_SECURE, meals_path)
         document = self._get_document_for_url(meals_url)
 
-        meals = document.xpath(
-            "//*[@id='matching']/li"
-        )  # get all items in the recipe list
+        return self._get_meal_list(document)
+
+    @parser("meal_list")
+    def _get_meal_list(self, document) -> dict[int, str]:
+        meals_dict = {}
         _idx: int | None = None
         try:
-            for _idx, meal in enumerate(meals):
-                meal_path = meal.xpath("./a")[0].attrib["href"]
-                meal_id = meal_path.split("/")[-1].split("?")[0]
-                meal_title = meal.xpath("./a")[0].text
-                meals_dict[meal_id] = meal_title
+            for _idx, meal in enumerate(MEAL_LIST_ITEMS(document)):
+                link = MEAL_LIST_ITEM_LINK(meal)[0]
+                meal_id = link.attrib["href"].split("/")[-1].split("?")[0]
+                meals_dict[meal_id] = link.text
         except Exception:
             # no meals available?
             logger.warning(f"Could not extract meal at index {_idx}")
 
         return meals_dict
 
-    def get_meal(self, meal_id: int, meal_title: str) -> types.Recipe:
+    @traced
+    @with_deadline
+    def get_meal(
+        self, meal_id: int, meal_title: str, deadline: DeadlineSpec = None
+    ) -> types.Recipe:
         """Returns meal details.
 
         See https://schema.org/Recipe for details regarding this schema.
         """
 
+        return self._fetch_meal(meal_id, meal_title)
+
+    @traced
+    @with_deadline
+    def get_meals_full(
+        self, max_workers: int | None = None, deadline: DeadlineSpec = None
+    ) -> Iterator[types.Recipe]:
+        """Yields the details of all saved meals (see ``get_meal``), in the
+        order returned by ``get_meals``.
+
+        The meals' ingredient pages are fetched using up to ``max_workers``
+        (by default, the client's ``max_workers``) concurrent requests, and
+        each meal is yielded as soon as it and those before it have been
+        parsed.  No pages are fetched until iteration begins; ``deadline``
+        applies to all of them, and they are traced as children of this
+        call's span.
+        """
+        meals = self.get_meals()
+        deadline = get_current_deadline()
+        span = get_current_span()
+
+        def fetch_meal(meal: tuple[int, str]) -> types.Recipe:
+            with span_scope(span):
+                return bind_deadline(deadline, self._fetch_meal, *meal)()
+
+        return self._map_concurrently(fetch_meal, meals.items(), max_workers)
+
+    def _fetch_meal(self, meal_id: int, meal_title: str) -> types.Recipe:
         meal_path = f"/meal/update_meal_ingredients/{meal_id}"
         meal_url = parse.urljoin(self.BASE_URL_SECURE, meal_path)
         document = self._get_document_for_url(meal_url)
 
+        return self._get_meal(document, meal_url, meal_title)
+
+    @parser("meal")
+    def _get_meal(self, document, meal_url: str, meal_title: str) -> types.Recipe:
         recipe_dict: dict[str, Any] = {
             "@context": "https://schema.org",
             "@type": "Recipe",
@@ -1418,26 +2814,22 @@ class Client(MFPBase):
         recipe_dict["name"] = meal_title
         recipe_dict["recipeYield"] = 1
         recipe_dict["recipeIngredient"] = []
-        ingredients = document.xpath('//*[@id="meal-table"]/tbody/tr')
+        ingredients = [ROW_CELLS(row) for row in MEAL_INGREDIENT_ROWS(document)]
         # No ingredients?
-        if len(ingredients) == 1 and ingredients[0].xpath("./td[1]")[0].text == "\xa0":
+        if len(ingredients) == 1 and ingredients[0][0].text == "\xa0":
             raise Exception("No ingredients found when fetching meal.")
         else:
-            for ingredient in ingredients:
-                recipe_dict["recipeIngredient"].append(
-                    ingredient.xpath("./td[1]")[0].text
-                )
+            for cells in ingredients:
+                recipe_dict["recipeIngredient"].append(cells[0].text)
 
-            total = document.xpath('//*[@id="mealTableTotal"]/tbody/tr')[0]
+            total = ROW_CELLS(MEAL_TOTAL_ROW(document)[0])
             recipe_dict["nutrition"] = {"@type": "NutritionInformation"}
-            recipe_dict["nutrition"]["calories"] = total.xpath("./td[2]")[0].text
-            recipe_dict["nutrition"]["carbohydrateContent"] = total.xpath("./td[3]")[
-                0
-            ].text
-            recipe_dict["nutrition"]["proteinContent"] = total.xpath("./td[5]")[0].text
-            recipe_dict["nutrition"]["fatContent"] = total.xpath("./td[4]")[0].text
-            recipe_dict["nutrition"]["sugarContent"] = total.xpath("./td[7]")[0].text
-            recipe_dict["nutrition"]["sodiumContent"] = total.xpath("./td[6]")[0].text
+            recipe_dict["nutrition"]["calories"] = total[1].text
+            recipe_dict["nutrition"]["carbohydrateContent"] = total[2].text
+            recipe_dict["nutrition"]["proteinContent"] = total[4].text
+            recipe_dict["nutrition"]["fatContent"] = total[3].text
+            recipe_dict["nutrition"]["sugarContent"] = total[6].text
+            recipe_dict["nutrition"]["sodiumContent"] = total[5].text
 
         # add some required tags to match schema
         recipe_dict["recipeInstructions"] = ""
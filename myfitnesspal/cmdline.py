@@ -1,15 +1,83 @@
 import argparse
+import cProfile
 import logging
+import pstats
 import sys
+import tracemalloc
 from pathlib import Path
 
 from rich.console import Console
 from rich.logging import RichHandler
+from rich.table import Table
 
 from .commands import COMMANDS, get_command_list
+from .metrics import ClientStats
 
 logger = logging.getLogger(__name__)
 
+PROFILE_LIMIT = 25
+TRACEMALLOC_LIMIT = 10
+
+
+def print_timings(console: Console, stats: ClientStats) -> None:
+    snapshot = stats.snapshot()
+
+    requests_table = Table(title="Requests")
+    requests_table.add_column("Endpoint", overflow="fold")
+    for column in ("Requests", "Statuses", "Retries", "Bytes"):
+        requests_table.add_column(column)
+    for column in ("Total (s)", "Mean (s)"):
+        requests_table.add_column(column, justify="right")
+    for endpoint, info in snapshot["requests"].items():
+        latency = info["latency"]
+        requests_table.add_row(
+            endpoint,
+            str(info["count"]),
+            ", ".join(
+                f"{status}: {count}" for status, count in info["statuses"].items()
+            ),
+            str(info["retries"]),
+            str(info["response_bytes"]),
+            f"{latency['sum']:.3f}",
+            f"{latency['sum'] / latency['count']:.3f}" if latency["count"] else "-",
+        )
+    console.print(requests_table)
+
+    parsers_table = Table(title="Parsing")
+    parsers_table.add_column("Parser")
+    parsers_table.add_column("Calls")
+    for column in ("Total (s)", "Mean (s)"):
+        parsers_table.add_column(column, justify="right")
+    for name, info in snapshot["parsers"].items():
+        parsers_table.add_row(
+            name,
+            str(info["count"]),
+            f"{info['sum']:.3f}",
+            f"{info['sum'] / info['count']:.3f}",
+        )
+    console.print(parsers_table)
+
+
+def print_allocations(console: Console, snapshot: tracemalloc.Snapshot) -> None:
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ]
+    )
+    table = Table(title=f"Top {TRACEMALLOC_LIMIT} allocation sites")
+    table.add_column("Location", overflow="fold")
+    table.add_column("Size (KiB)", justify="right")
+    table.add_column("Blocks", justify="right")
+    for stat in snapshot.statistics("lineno")[:TRACEMALLOC_LIMIT]:
+        frame = stat.traceback[0]
+        table.add_row(
+            f"{frame.filename}:{frame.lineno}",
+            f"{stat.size / 1024:.1f}",
+            str(stat.count),
+        )
+    console.print(table)
+
 
 def main(args=None):
     if args is None:
@@ -23,6 +91,27 @@ def main(args=None):
     parser.add_argument("--traceback-locals", action="store_true")
     parser.add_argument("--log-requests-to", type=Path, default=None)
     parser.add_argument("--debugger", action="store_true")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the command and print the slowest functions.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        default=None,
+        help="Write profiling statistics to this file (implies --profile).",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Trace memory allocations and print the largest allocation sites.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the time spent on each request and parser.",
+    )
     args, extra = parser.parse_known_args()
 
     # Set up a simple console logger
@@ -44,6 +133,13 @@ def main(args=None):
         handlers=[RichHandler()],
     )
 
+    args.stats = ClientStats() if args.timings else None
+    profiler = cProfile.Profile() if args.profile or args.profile_output else None
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
     try:
         if args.command[0] in COMMANDS:
             COMMANDS[args.command[0]]["function"](args, *extra)
@@ -56,3 +152,18 @@ def main(args=None):
             "including the above traceback and a description of what "
             "you were trying to accomplish.[/red][/bold]"
         )
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if args.tracemalloc:
+            allocations = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            print_allocations(console, allocations)
+        if profiler is not None:
+            if args.profile_output:
+                profiler.dump_stats(args.profile_output)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats(
+                pstats.SortKey.CUMULATIVE
+            ).print_stats(PROFILE_LIMIT)
+        if args.stats is not None:
+            print_timings(console, args.stats)
@@ -64,7 +64,7 @@ def day(super_args, *extra, **kwargs):
     )
     args = parser.parse_args(extra)
 
-    client = Client(log_requests_to=super_args.log_requests_to)
+    client = Client(log_requests_to=super_args.log_requests_to, stats=super_args.stats)
     day = client.get_date(args.date)
 
     date_str = args.date.strftime("%Y-%m-%d")
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar, Union
+
+from .exceptions import MyfitnesspalDeadlineExceeded
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """A point in time by which an operation must have completed."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def __repr__(self) -> str:
+        return f"<Deadline in {self.remaining():.3f}s>"
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline; never negative."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """Raises ``MyfitnesspalDeadlineExceeded`` if the deadline has passed."""
+        if self.expired:
+            raise MyfitnesspalDeadlineExceeded(
+                f"Operation did not complete within its {self.seconds}s deadline."
+            )
+
+
+DeadlineSpec = Union[Deadline, float, None]
+
+_current_deadline: contextvars.ContextVar[Deadline | None] = contextvars.ContextVar(
+    "myfitnesspal_deadline", default=None
+)
+
+
+def get_current_deadline() -> Deadline | None:
+    """Returns the deadline of the operation currently being performed."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: DeadlineSpec) -> Iterator[Deadline | None]:
+    """Applies ``deadline`` (a ``Deadline`` or seconds from now) to all
+    requests sent within this block.
+
+    An enclosing deadline that expires sooner remains in effect.
+    """
+    if deadline is not None and not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+
+    current = _current_deadline.get()
+    if deadline is None or (
+        current is not None and current.expires_at <= deadline.expires_at
+    ):
+        yield current
+        return
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def bind_deadline(
+    deadline: Deadline | None, fn: Callable[..., T], *args
+) -> Callable[[], T]:
+    """Returns a callable running ``fn(*args)`` within ``deadline``'s scope.
+
+    Useful for work deferred past the end of the operation that owns the
+    deadline, e.g. lazily-loaded properties.
+    """
+
+    def call() -> T:
+        with deadline_scope(deadline):
+            return fn(*args)
+
+    return call
+
+
+def with_deadline(fn: Callable[..., T]) -> Callable[..., T]:
+    """Runs the decorated method within the scope of its ``deadline`` argument."""
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs) -> T:
+        deadline = signature.bind_partial(*args, **kwargs).arguments.get("deadline")
+        with deadline_scope(deadline):
+            return fn(*args, **kwargs)
+
+    return wrapper
@@ -6,5 +6,13 @@ class MyfitnesspalRequestFailed(MyfitnesspalError):
     pass
 
 
+class MyfitnesspalCircuitOpen(MyfitnesspalRequestFailed):
+    pass
+
+
 class MyfitnesspalLoginError(MyfitnesspalError, ValueError):
     pass
+
+
+class MyfitnesspalDeadlineExceeded(MyfitnesspalError, TimeoutError):
+    pass
@@ -0,0 +1,570 @@
+"""An in-process stand-in for MyFitnessPal, for benchmarking and testing.
+
+``FakeMyfitnesspalServer`` is a ``Transport`` answering a ``Client``'s
+requests from page templates (such as the HTML fixtures found in this
+project's ``tests/html`` directory) and generated JSON, with optional
+simulated latency and error injection:
+
+.. code:: python
+
+   from http.cookiejar import CookieJar
+
+   from myfitnesspal import Client
+   from myfitnesspal.fakeserver import FakeMyfitnesspalServer
+
+   server = FakeMyfitnesspalServer("tests/html", latency=0.05, error_rate=0.01)
+   client = Client(cookiejar=CookieJar(), transport=server)
+   client.get_date(2022, 1, 10)
+"""
+
+from __future__ import annotations
+
+import datetime
+import html
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Union
+from urllib import parse
+
+import requests
+
+from .transport import Transport
+
+NEXT_DATA_MATCHER = re.compile(
+    r'(<script id="__NEXT_DATA__" type="application/json">)(.*?)(</script>)',
+    re.DOTALL,
+)
+
+Handler = Callable[
+    [str, parse.SplitResult, dict[str, list[str]], Any], requests.Response
+]
+Latency = Union[float, Callable[[], float]]
+
+
+class FakeMyfitnesspalServer(Transport):
+    """Serves canned MyFitnessPal responses without network access.
+
+    ``templates_dir`` should contain ``diary.html``, ``exercise.html`` and
+    ``measurements.html``; diary and exercise pages are served as-is,
+    while measurement pages are re-rendered from ``measurements`` (a
+    mapping of measurement name to ``{date: value}``) ``page_size``
+    entries at a time.  Reports are generated from ``report_value``, and
+    food searches and details from ``foods``.
+
+    Each request waits ``latency`` seconds (a number or a callable
+    returning one).  A fraction ``error_rate`` of requests is answered
+    with a random status from ``error_statuses``, and a fraction
+    ``connection_error_rate`` raises ``requests.ConnectionError``.
+
+    Forms are rendered with ``authenticity_token``; measurement updates
+    carrying any other token are rejected with ``422``, as are new food
+    submissions.  Submitted foods are added to ``foods``.
+
+    Nutrient goals are kept in ``nutrient_goals``, by the date from which
+    they apply.
+    """
+
+    DEFAULT_FOODS: list[dict[str, Any]] = [
+        {
+            "id": 1,
+            "description": "Bacon Cheeseburger",
+            "brand_name": "Sodexo Campus",
+            "verified": False,
+            "calories": 420.0,
+        },
+        {
+            "id": 2,
+            "description": "Junior Bacon Cheeseburger",
+            "brand_name": "Wendy's",
+            "verified": True,
+            "calories": 380.0,
+        },
+        {
+            "id": 3,
+            "description": "Banana",
+            "brand_name": None,
+            "verified": True,
+            "calories": 105.0,
+        },
+    ]
+
+    def __init__(
+        self,
+        templates_dir: Path | str,
+        measurements: dict[str, dict[datetime.date, float]] | None = None,
+        foods: list[dict[str, Any]] | None = None,
+        report_value: Callable[[str, str, datetime.date], float] | None = None,
+        username: str = "fake_user",
+        user_id: str = "1",
+        page_size: int = 30,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: tuple[int, ...] = (500, 502, 503),
+        connection_error_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.templates_dir = Path(templates_dir)
+        self.username = username
+        self.user_id = user_id
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.connection_error_rate = connection_error_rate
+        self.foods = {food["id"]: food for food in (foods or self.DEFAULT_FOODS)}
+        self.report_value = report_value or (lambda category, name, date: 0.0)
+        self.authenticity_token = "fake-token"
+        self.nutrient_goals: dict[datetime.date, dict[str, Any]] = {
+            datetime.date(2000, 1, 1): self._get_default_nutrient_goal()
+        }
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._templates: dict[str, str] = {}
+        self.requests: list[tuple[str, str]] = []
+
+        self.measurements = (
+            measurements
+            if measurements is not None
+            else self._get_template_measurements()
+        )
+        self.routes: list[tuple[str, re.Pattern, Handler]] = [
+            ("GET", re.compile(r"^/user/auth_token$"), self._auth_token),
+            ("GET", re.compile(r"^/v2/users/[^/]+$"), self._user_metadata),
+            ("GET", re.compile(r"^/food/diary/[^/]+$"), self._diary),
+            ("GET", re.compile(r"^/exercise/diary/[^/]+$"), self._exercise),
+            ("GET", re.compile(r"^/measurements/edit$"), self._measurements),
+            ("POST", re.compile(r"^/measurements/new$"), self._set_measurement),
+            ("GET", re.compile(r"^/food/note$"), self._note),
+            ("GET", re.compile(r"^/food/water$"), self._water),
+            (
+                "GET",
+                re.compile(r"^/api/services/reports/results/[^/]+/[^/]+/\d+\.json$"),
+                self._report,
+            ),
+            ("GET", re.compile(r"^/food/search$"), self._search_form),
+            ("POST", re.compile(r"^/food/search$"), self._search),
+            ("GET", re.compile(r"^/v2/foods/\d+$"), self._food_details),
+            ("GET", re.compile(r"^/food/submit$"), self._food_form),
+            ("POST", re.compile(r"^/food/duplicate$"), self._food_duplicate),
+            ("GET", re.compile(r"^/food/new$"), self._food_form),
+            ("POST", re.compile(r"^/food/new$"), self._new_food),
+            ("GET", re.compile(r"^/v2/nutrient-goals$"), self._nutrient_goals),
+            ("POST", re.compile(r"^/v2/nutrient-goals$"), self._set_nutrient_goals),
+        ]
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        method = method.upper()
+        with self._lock:
+            self.requests.append((method, url))
+            fail_connection = self._random.random() < self.connection_error_rate
+            fail_status = self._random.random() < self.error_rate
+            error_status = self._random.choice(self.error_statuses)
+
+        self._wait(kwargs.get("timeout"))
+
+        if fail_connection:
+            raise requests.ConnectionError(f"Simulated connection error for {url}")
+        if fail_status:
+            return self._get_response(method, url, error_status, b"")
+
+        split_url = parse.urlsplit(url)
+        query = parse.parse_qs(split_url.query)
+        for route_method, pattern, handler in self.routes:
+            if route_method == method and pattern.match(split_url.path):
+                return handler(url, split_url, query, kwargs.get("data"))
+
+        return self._get_response(method, url, 404, b"Not Found")
+
+    def _wait(self, timeout: Any) -> None:
+        latency = self.latency() if callable(self.latency) else self.latency
+        if not latency:
+            return
+
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and latency > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.ReadTimeout("Simulated read timeout")
+        time.sleep(latency)
+
+    def _get_template(self, name: str) -> str:
+        if name not in self._templates:
+            path = self.templates_dir / name
+            self._templates[name] = path.read_text(encoding="utf-8")
+        return self._templates[name]
+
+    def _get_response(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        content: bytes,
+        content_type: str = "text/html; charset=utf-8",
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        response.url = url
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = content_type
+        response.request = requests.Request(method, url).prepare()
+        return response
+
+    def _get_html_response(self, url: str, body: str, method="GET"):
+        return self._get_response(method, url, 200, body.encode("utf-8"))
+
+    def _get_json_response(self, url: str, data: Any) -> requests.Response:
+        return self._get_response(
+            "GET",
+            url,
+            200,
+            json.dumps(data).encode("utf-8"),
+            content_type="application/json; charset=utf-8",
+        )
+
+    def _get_next_data(self) -> dict:
+        matched = NEXT_DATA_MATCHER.search(self._get_template("measurements.html"))
+        if not matched:
+            raise ValueError("measurements.html does not contain __NEXT_DATA__")
+        return json.loads(matched.group(2))
+
+    def _get_template_measurements(self) -> dict[str, dict[datetime.date, float]]:
+        measurements: dict[str, dict[datetime.date, float]] = {}
+        if not (self.templates_dir / "measurements.html").exists():
+            return measurements
+
+        queries = self._get_next_data()["props"]["pageProps"]["dehydratedState"][
+            "queries"
+        ]
+        for q in queries:
+            if q["queryKey"][0] == "measurementTypes":
+                for measurement_type in q["state"]["data"]:
+                    measurements.setdefault(measurement_type["description"], {})
+            elif q["queryKey"][0] == "measurements":
+                values = measurements.setdefault(q["queryKey"][1], {})
+                for item in q["state"]["data"].get("items", []):
+                    date = datetime.datetime.strptime(item["date"], "%Y-%m-%d").date()
+                    values[date] = item["value"]
+        return measurements
+
+    def _auth_token(self, url, split_url, query, data):
+        return self._get_json_response(
+            url,
+            {
+                "token_type": "Bearer",
+                "access_token": "fake-access-token",
+                "expires_in": 3600,
+                "refresh_token": "fake-refresh-token",
+                "user_id": self.user_id,
+            },
+        )
+
+    def _user_metadata(self, url, split_url, query, data):
+        return self._get_json_response(
+            url,
+            {
+                "item": {
+                    "id": self.user_id,
+                    "username": self.username,
+                    "unit_preferences": {
+                        "energy": "calories",
+                        "weight": "pounds",
+                        "distance": "miles",
+                        "height": "inches",
+                        "water": "cups",
+                    },
+                }
+            },
+        )
+
+    def _diary(self, url, split_url, query, data):
+        return self._get_html_response(url, self._get_template("diary.html"))
+
+    def _exercise(self, url, split_url, query, data):
+        return self._get_html_response(url, self._get_template("exercise.html"))
+
+    def _measurements(self, url, split_url, query, data):
+        names = list(self.measurements.keys())
+        name = query.get("type", [""])[0] or (names[0] if names else "Weight")
+        page = int(query.get("page", ["1"])[0])
+
+        values = sorted(self.measurements.get(name, {}).items(), reverse=True)
+        items = values[(page - 1) * self.page_size : page * self.page_size]
+
+        next_data = self._get_next_data()
+        queries = []
+        for q in next_data["props"]["pageProps"]["dehydratedState"]["queries"]:
+            if q["queryKey"][0] == "measurementTypes":
+                q["state"]["data"] = [
+                    {"id": str(idx + 1), "description": measurement_name}
+                    for idx, measurement_name in enumerate(names)
+                    if measurement_name != "Weight"
+                ]
+            elif q["queryKey"][0] == "startingMeasurement":
+                continue
+            elif q["queryKey"][0] == "measurements":
+                q["queryKey"] = ["measurements", name, page]
+                q["state"]["data"] = {
+                    "items": [
+                        {
+                            "id": f"{name}-{date.isoformat()}",
+                            "date": date.isoformat(),
+                            "type": name,
+                            "value": value,
+                        }
+                        for date, value in items
+                    ],
+                    "has_more": len(values) > page * self.page_size,
+                    "total_entries": len(values),
+                }
+            queries.append(q)
+        next_data["props"]["pageProps"]["dehydratedState"]["queries"] = queries
+
+        # The check-in form used when setting measurements isn't part of
+        # the captured page; include it so that writes can be exercised.
+        body = self._get_template("measurements.html")
+        if "authenticity_token" not in body:
+            body = body.replace(
+                "</body>",
+                '<form action="/measurements/new">'
+                f'<input name="authenticity_token" value="{self.authenticity_token}" />'
+                "</form></body>",
+                1,
+            )
+        body = NEXT_DATA_MATCHER.sub(
+            lambda matched: matched.group(1)
+            + json.dumps(next_data).replace("</", "<\\/")
+            + matched.group(3),
+            body,
+            count=1,
+        )
+        return self._get_html_response(url, body)
+
+    def _set_measurement(self, url, split_url, query, data):
+        data = data or {}
+        if data.get("authenticity_token") != self.authenticity_token:
+            return self._get_response("POST", url, 422, b"", "text/html")
+        ids = {str(idx + 1): name for idx, name in enumerate(self.measurements.keys())}
+        name = ids.get(str(data.get("type")), "Weight")
+        date = datetime.date(
+            int(data["measurement[entry_date(1i)]"]),
+            int(data["measurement[entry_date(2i)]"]),
+            int(data["measurement[entry_date(3i)]"]),
+        )
+        with self._lock:
+            self.measurements.setdefault(name, {})[date] = float(
+                data["measurement[display_value]"]
+            )
+        return self._get_html_response(url, "<html></html>", method="POST")
+
+    def _note(self, url, split_url, query, data):
+        return self._get_json_response(
+            url,
+            {"item": {"body": "", "type": "food", "date": query["date"][0]}},
+        )
+
+    def _water(self, url, split_url, query, data):
+        return self._get_json_response(url, {"item": {"milliliters": 0}})
+
+    def _report(self, url, split_url, query, data):
+        _, category, name, days = split_url.path.rsplit("/", 3)
+        days_count = int(days.replace(".json", ""))
+        today = datetime.date.today()
+
+        results = []
+        for offset in range(days_count, -1, -1):
+            date = today - datetime.timedelta(days=offset)
+            results.append(
+                {
+                    "date": f"{date.month}/{date.day}",
+                    "total": self.report_value(category, parse.unquote(name), date),
+                }
+            )
+        return self._get_json_response(url, {"outcome": {"results": results}})
+
+    def _search_form(self, url, split_url, query, data):
+        return self._get_html_response(
+            url,
+            '<html><body><form action="/food/search">'
+            f'<input name="authenticity_token" value="{self.authenticity_token}" />'
+            "</form></body></html>",
+        )
+
+    def _search(self, url, split_url, query, data):
+        words = (data or {}).get("search", "").lower().split()
+        items = []
+        for food in self.foods.values():
+            text = f"{food['description']} {food.get('brand_name') or ''}".lower()
+            if not all(word in text for word in words):
+                continue
+            verified = (
+                '<div class="verified verified-list-icon"></div>'
+                if food.get("verified")
+                else ""
+            )
+            brand = (
+                f"{html.escape(food['brand_name'])}, " if food.get("brand_name") else ""
+            )
+            items.append(
+                '<li class="matched-food">'
+                '<div class="search-title-container">'
+                f'<a data-external-id="{food["id"]}">'
+                f"{html.escape(food['description'])}</a></div>"
+                f"{verified}"
+                '<p class="search-nutritional-info">'
+                f"{brand}1 serving, {food['calories']} calories</p>"
+                "</li>"
+            )
+        return self._get_html_response(
+            url,
+            "<html><body><p>Matching Foods:</p><ul>"
+            + "".join(items)
+            + "</ul></body></html>",
+            method="POST",
+        )
+
+    def _food_details(self, url, split_url, query, data):
+        food = self.foods.get(int(split_url.path.rsplit("/", 1)[-1]))
+        if food is None:
+            return self._get_response("GET", url, 404, b"{}", "application/json")
+
+        nutrition = dict(food.get("nutrition", {}))
+        nutrition["energy"] = {"unit": "calories", "value": food["calories"]}
+        return self._get_json_response(
+            url,
+            {
+                "item": {
+                    "description": food["description"],
+                    "brand_name": food.get("brand_name"),
+                    "verified": food.get("verified", False),
+                    "nutritional_contents": nutrition,
+                    "confirmations": food.get("confirmations", 0),
+                    "serving_sizes": food.get(
+                        "serving_sizes",
+                        [
+                            {
+                                "id": "0",
+                                "nutrition_multiplier": 1.0,
+                                "value": 1.0,
+                                "unit": "serving",
+                                "index": 0,
+                            }
+                        ],
+                    ),
+                }
+            },
+        )
+
+    def _food_form(self, url, split_url, query, data):
+        return self._get_html_response(
+            url,
+            f'<html><body><form action="{split_url.path}">'
+            '<input name="utf8" value="&#x2713;" />'
+            f'<input name="authenticity_token" value="{self.authenticity_token}" />'
+            "</form></body></html>",
+        )
+
+    def _find_food(self, brand: str, description: str) -> dict[str, Any] | None:
+        for food in self.foods.values():
+            if (food.get("brand_name") or "").lower() == brand.lower() and food[
+                "description"
+            ].lower() == description.lower():
+                return food
+        return None
+
+    def _food_duplicate(self, url, split_url, query, data):
+        data = data or {}
+        if data.get("authenticity_token") != self.authenticity_token:
+            return self._get_response("POST", url, 422, b"", "text/html")
+
+        warning = ""
+        if self._find_food(data["food[brand]"], data["food[description]"]):
+            warning = "<p><span>This food may already exist.</span></p>"
+        return self._get_html_response(
+            url,
+            f'<html><body><div id="main">{warning}</div></body></html>',
+            method="POST",
+        )
+
+    def _new_food(self, url, split_url, query, data):
+        data = data or {}
+        if data.get("authenticity_token") != self.authenticity_token:
+            return self._get_response("POST", url, 422, b"", "text/html")
+
+        if not data.get("food[description]"):
+            return self._get_html_response(
+                url,
+                '<html><body><div id="errorExplanation"><ul>'
+                "<li>Description can't be blank</li>"
+                "</ul></div></body></html>",
+                method="POST",
+            )
+
+        with self._lock:
+            mfp_id = max(self.foods, default=0) + 1
+            self.foods[mfp_id] = {
+                "id": mfp_id,
+                "description": data["food[description]"],
+                "brand_name": data["food[brand]"] or None,
+                "verified": False,
+                "calories": float(data["nutritional_content[calories]"]),
+            }
+        return self._get_html_response(url, "<html></html>", method="POST")
+
+    def _get_default_nutrient_goal(self) -> dict[str, Any]:
+        def get_goal(day_of_week: str | None = None) -> dict[str, Any]:
+            goal: dict[str, Any] = {
+                "energy": {"value": 2000.0, "unit": "calories"},
+                "carbohydrates": 250.0,
+                "fat": 67.0,
+                "protein": 100.0,
+                "meal_goals": [],
+            }
+            if day_of_week is not None:
+                goal["day_of_week"] = day_of_week
+            return goal
+
+        return {
+            "valid_from": "2000-01-01",
+            "default_goal": get_goal(),
+            "daily_goals": [
+                get_goal(day_of_week)
+                for day_of_week in (
+                    "monday",
+                    "tuesday",
+                    "wednesday",
+                    "thursday",
+                    "friday",
+                    "saturday",
+                    "sunday",
+                )
+            ],
+        }
+
+    def _nutrient_goals(self, url, split_url, query, data):
+        date = datetime.date.fromisoformat(query["date"][0])
+        with self._lock:
+            valid_from = max(
+                valid_from for valid_from in self.nutrient_goals if valid_from <= date
+            )
+            goal = json.loads(json.dumps(self.nutrient_goals[valid_from]))
+            later = [
+                valid_from for valid_from in self.nutrient_goals if valid_from > date
+            ]
+        if later:
+            goal["valid_to"] = (min(later) - datetime.timedelta(days=1)).isoformat()
+        return self._get_json_response(url, {"items": [goal]})
+
+    def _set_nutrient_goals(self, url, split_url, query, data):
+        goal = json.loads(data)["item"]
+        with self._lock:
+            self.nutrient_goals[datetime.date.fromisoformat(goal["valid_from"])] = goal
+        return self._get_json_response(url, {"item": goal})
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+from typing import Iterable
+
+from .fooditem import FoodItem
+
+TOKEN_MATCHER = re.compile(r"[^\W_]+")
+
+
+def _get_tokens(value: str | None) -> list[str]:
+    if not value:
+        return []
+    return TOKEN_MATCHER.findall(value.lower())
+
+
+def _get_trigrams(tokens: Iterable[str]) -> set[str]:
+    trigrams: set[str] = set()
+    for token in tokens:
+        padded = f"  {token} "
+        for idx in range(len(padded) - 2):
+            trigrams.add(padded[idx : idx + 3])
+    return trigrams
+
+
+class FoodIndex:
+    """Local, in-memory index of food items for offline searching.
+
+    Items are indexed by the words in their name and brand.  Queries are
+    answered first by matching each query word as a prefix of an indexed
+    word (so "bac chee" finds "Bacon Cheeseburger"); if that finds nothing,
+    a trigram similarity search is used to tolerate typos.
+    """
+
+    def __init__(self, min_similarity: float = 0.3):
+        self.min_similarity = min_similarity
+
+        self._lock = threading.RLock()
+        self._items: dict[int, FoodItem] = {}
+        self._tokens: dict[int, set[str]] = {}
+        self._item_trigrams: dict[int, set[str]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._sorted_tokens: list[str] = []
+        self._trigram_postings: dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, mfp_id: object) -> bool:
+        return mfp_id in self._items
+
+    def get(self, mfp_id: int) -> FoodItem | None:
+        """Returns the indexed item having the specified ID, if any."""
+        return self._items.get(mfp_id)
+
+    def add(self, item: FoodItem) -> None:
+        """Adds (or replaces) a food item in the index."""
+        with self._lock:
+            if item.mfp_id in self._items:
+                self.remove(item.mfp_id)
+
+            tokens = set(_get_tokens(item.name)) | set(_get_tokens(item.brand))
+            trigrams = _get_trigrams(tokens)
+
+            self._items[item.mfp_id] = item
+            self._tokens[item.mfp_id] = tokens
+            self._item_trigrams[item.mfp_id] = trigrams
+
+            for token in tokens:
+                if token not in self._postings:
+                    self._postings[token] = set()
+                    bisect.insort(self._sorted_tokens, token)
+                self._postings[token].add(item.mfp_id)
+            for trigram in trigrams:
+                self._trigram_postings.setdefault(trigram, set()).add(item.mfp_id)
+
+    def add_all(self, items: Iterable[FoodItem]) -> None:
+        """Adds each of the provided food items to the index."""
+        for item in items:
+            self.add(item)
+
+    def remove(self, mfp_id: int) -> None:
+        """Removes the item having the specified ID from the index."""
+        with self._lock:
+            if mfp_id not in self._items:
+                return
+
+            del self._items[mfp_id]
+            for token in self._tokens.pop(mfp_id):
+                postings = self._postings[token]
+                postings.discard(mfp_id)
+                if not postings:
+                    del self._postings[token]
+                    del self._sorted_tokens[
+                        bisect.bisect_left(self._sorted_tokens, token)
+                    ]
+            for trigram in self._item_trigrams.pop(mfp_id):
+                postings = self._trigram_postings[trigram]
+                postings.discard(mfp_id)
+                if not postings:
+                    del self._trigram_postings[trigram]
+
+    def clear(self) -> None:
+        """Removes all items from the index."""
+        with self._lock:
+            self._items.clear()
+            self._tokens.clear()
+            self._item_trigrams.clear()
+            self._postings.clear()
+            self._sorted_tokens.clear()
+            self._trigram_postings.clear()
+
+    def _get_ids_for_prefix(self, prefix: str) -> set[int]:
+        ids: set[int] = set()
+        idx = bisect.bisect_left(self._sorted_tokens, prefix)
+        while idx < len(self._sorted_tokens):
+            token = self._sorted_tokens[idx]
+            if not token.startswith(prefix):
+                break
+            ids |= self._postings[token]
+            idx += 1
+        return ids
+
+    def _get_prefix_matches(self, query_tokens: list[str]) -> list[FoodItem]:
+        candidates: set[int] | None = None
+        for token in query_tokens:
+            ids = self._get_ids_for_prefix(token)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        assert candidates is not None
+
+        def rank(mfp_id: int):
+            item = self._items[mfp_id]
+            exact_matches = len(self._tokens[mfp_id].intersection(query_tokens))
+            return (-exact_matches, not item.verified, len(item.name), mfp_id)
+
+        return [self._items[mfp_id] for mfp_id in sorted(candidates, key=rank)]
+
+    def _get_fuzzy_matches(self, query_tokens: list[str]) -> list[FoodItem]:
+        query_trigrams = _get_trigrams(query_tokens)
+        if not query_trigrams:
+            return []
+
+        shared: dict[int, int] = {}
+        for trigram in query_trigrams:
+            for mfp_id in self._trigram_postings.get(trigram, ()):
+                shared[mfp_id] = shared.get(mfp_id, 0) + 1
+
+        scored = []
+        for mfp_id, count in shared.items():
+            union = len(query_trigrams) + len(self._item_trigrams[mfp_id]) - count
+            similarity = count / union
+            if similarity >= self.min_similarity:
+                scored.append((-similarity, not self._items[mfp_id].verified, mfp_id))
+
+        return [self._items[mfp_id] for _, _, mfp_id in sorted(scored)]
+
+    def search(
+        self, query: str, limit: int | None = 10, fuzzy: bool = True
+    ) -> list[FoodItem]:
+        """Returns indexed food items matching the provided query.
+
+        Every word of the query must be a prefix of a word in the item's
+        name or brand; when no item matches that way and ``fuzzy`` is set,
+        items with similar spelling are returned instead.
+        """
+        query_tokens = _get_tokens(query)
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            results = self._get_prefix_matches(query_tokens)
+            if not results and fuzzy:
+                results = self._get_fuzzy_matches(query_tokens)
+
+        if limit is not None:
+            results = results[:limit]
+        return results
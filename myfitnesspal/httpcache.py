@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Hashable
+
+import requests
+
+from .cache import LRUCache
+
+
+def get_response_validators(response: requests.Response) -> dict[str, str]:
+    """Returns the conditional headers revalidating ``response``."""
+    headers = {}
+    if "ETag" in response.headers:
+        headers["If-None-Match"] = response.headers["ETag"]
+    if "Last-Modified" in response.headers:
+        headers["If-Modified-Since"] = response.headers["Last-Modified"]
+    return headers
+
+
+class ConditionalCache(LRUCache[requests.Response]):
+    """Keeps the most recent response for GET requests carrying validators.
+
+    Responses including an ``ETag`` or ``Last-Modified`` header are stored
+    so that the next request for the same resource can be made conditional
+    (``If-None-Match`` / ``If-Modified-Since``); when the server answers
+    ``304 Not Modified`` the stored response is used instead.  At most
+    ``max_entries`` responses are kept.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        super().__init__(max_entries)
+
+    def get_validators(self, key: Hashable) -> dict[str, str]:
+        """Returns the conditional headers to send when requesting ``key``."""
+        response = self.get(key)
+        if response is None:
+            return {}
+        return get_response_validators(response)
+
+    def store(self, key: Hashable, response: requests.Response) -> None:
+        """Stores ``response`` if it can be revalidated later."""
+        if response.status_code != 200:
+            return
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        if "ETag" not in response.headers and "Last-Modified" not in response.headers:
+            return
+
+        self.set(key, response)
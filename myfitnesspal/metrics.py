@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+from typing import Any, Callable
+from urllib import parse
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/(food|exercise)/diary/[^/]+$"), r"/\1/diary/{username}"),
+    (re.compile(r"^/v2/users/[^/]+$"), "/v2/users/{user_id}"),
+    (
+        re.compile(r"^/api/services/reports/results/[^/]+/[^/]+/\d+\.json$"),
+        "/api/services/reports/results/{category}/{name}/{days}.json",
+    ),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+]
+
+Hook = Callable[[str, dict], None]
+
+
+def get_endpoint(url: str) -> str:
+    """Returns the host and path of ``url`` with identifiers replaced by
+    placeholders, so that requests can be grouped by endpoint."""
+    split_url = parse.urlsplit(url)
+    path = split_url.path or "/"
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return split_url.netloc + path
+
+
+class Histogram:
+    """Counts observations falling at or under each of ``buckets``."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_cumulative_counts(self) -> list[tuple[str, int]]:
+        cumulative = []
+        total = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative.append((repr(float(bucket)), total))
+        cumulative.append(("+Inf", self.count))
+        return cumulative
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(self.get_cumulative_counts()),
+        }
+
+
+class _EndpointStats:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.latency = Histogram(buckets)
+        self.statuses: dict[int, int] = {}
+        self.errors: dict[str, int] = {}
+        self.response_bytes = 0
+        self.retries = 0
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "statuses": dict(self.statuses),
+            "errors": dict(self.errors),
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class ClientStats:
+    """Collects request and parsing statistics for a ``Client``.
+
+    Requests are grouped by method and endpoint (see ``get_endpoint``);
+    for each, the number of requests, their latency distribution,
+    response sizes, status codes, errors and retries are recorded.  The
+    time spent in each parser is recorded too.
+
+    Callables registered with ``add_hook`` are called with each event as
+    it is recorded: ``("request", {...})``, ``("retry", {...})`` or
+    ``("parse", {...})``.
+    """
+
+    def __init__(self, latency_buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.latency_buckets = latency_buckets
+
+        self._lock = threading.Lock()
+        self._endpoints: dict[tuple[str, str], _EndpointStats] = {}
+        self._parsers: dict[str, Histogram] = {}
+        self._hooks: list[Hook] = []
+
+    def add_hook(self, hook: Hook) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        self._hooks.remove(hook)
+
+    def _emit(self, event: str, data: dict) -> None:
+        for hook in list(self._hooks):
+            hook(event, data)
+
+    def _get_endpoint_stats(self, method: str, url: str) -> _EndpointStats:
+        key = (method.upper(), get_endpoint(url))
+        if key not in self._endpoints:
+            self._endpoints[key] = _EndpointStats(self.latency_buckets)
+        return self._endpoints[key]
+
+    def record_request(
+        self,
+        method: str,
+        url: str,
+        latency: float,
+        status_code: int | None = None,
+        response_bytes: int = 0,
+        error: str | None = None,
+    ) -> None:
+        """Records one attempt at sending a request."""
+        with self._lock:
+            stats = self._get_endpoint_stats(method, url)
+            stats.latency.observe(latency)
+            stats.response_bytes += response_bytes
+            if status_code is not None:
+                stats.statuses[status_code] = stats.statuses.get(status_code, 0) + 1
+            if error is not None:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+
+        self._emit(
+            "request",
+            {
+                "method": method,
+                "url": url,
+                "endpoint": get_endpoint(url),
+                "latency": latency,
+                "status_code": status_code,
+                "response_bytes": response_bytes,
+                "error": error,
+            },
+        )
+
+    def record_retry(self, method: str, url: str) -> None:
+        with self._lock:
+            self._get_endpoint_stats(method, url).retries += 1
+
+        self._emit(
+            "retry", {"method": method, "url": url, "endpoint": get_endpoint(url)}
+        )
+
+    def record_parse(self, parser: str, duration: float) -> None:
+        with self._lock:
+            if parser not in self._parsers:
+                self._parsers[parser] = Histogram(self.latency_buckets)
+            self._parsers[parser].observe(duration)
+
+        self._emit("parse", {"parser": parser, "duration": duration})
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+            self._parsers.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the statistics collected so far as a dictionary."""
+        with self._lock:
+            return {
+                "requests": {
+                    f"{method} {endpoint}": stats.as_dict()
+                    for (method, endpoint), stats in sorted(self._endpoints.items())
+                },
+                "parsers": {
+                    name: histogram.as_dict()
+                    for name, histogram in sorted(self._parsers.items())
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "myfitnesspal") -> str:
+        """Returns the statistics in Prometheus' text exposition format."""
+        lines: list[str] = []
+
+        def add_metric(name: str, kind: str, description: str) -> str:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {kind}")
+            return metric
+
+        def add_histogram(metric: str, labels: str, histogram: Histogram):
+            for le, count in histogram.get_cumulative_counts():
+                lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            parsers = sorted(self._parsers.items())
+
+            metric = add_metric(
+                "requests_total", "counter", "Responses received, by status code."
+            )
+            for (method, endpoint), stats in endpoints:
+                for status_code, count in sorted(stats.statuses.items()):
+                    lines.append(
+                        f'{metric}{{{_labels(method, endpoint)},status="{status_code}"}}'
+                        f" {count}"
+                    )
+
+            metric = add_metric(
+                "request_errors_total", "counter", "Requests that raised an error."
+            )
+            for (method, endpoint), stats in endpoints:
+                for error, count in sorted(stats.errors.items()):
+                    lines.append(
+                        f'{metric}{{{_labels(method, endpoint)},error="{error}"}}'
+                        f" {count}"
+                    )
+
+            metric = add_metric(
+                "request_retries_total", "counter", "Requests that were retried."
+            )
+            for (method, endpoint), stats in endpoints:
+                lines.append(f"{metric}{{{_labels(method, endpoint)}}} {stats.retries}")
+
+            metric = add_metric(
+                "response_bytes_total", "counter", "Bytes of response bodies received."
+            )
+            for (method, endpoint), stats in endpoints:
+                lines.append(
+                    f"{metric}{{{_labels(method, endpoint)}}} {stats.response_bytes}"
+                )
+
+            metric = add_metric(
+                "request_duration_seconds", "histogram", "Time taken by requests."
+            )
+            for (method, endpoint), stats in endpoints:
+                add_histogram(metric, _labels(method, endpoint), stats.latency)
+
+            metric = add_metric(
+                "parse_duration_seconds", "histogram", "Time taken by parsers."
+            )
+            for name, histogram in parsers:
+                add_histogram(metric, f'parser="{name}"', histogram)
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, endpoint: str) -> str:
+    return f'method="{method}",endpoint="{_escape(endpoint)}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
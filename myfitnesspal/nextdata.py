@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+import lxml.html
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+NEXT_DATA_MATCHER = re.compile(
+    rb"<script[^>]*\bid=[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script>", re.DOTALL
+)
+
+
+def loads(data: bytes) -> Any:
+    """Decodes JSON using ``orjson`` if it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def get_next_data_payload(content: bytes) -> bytes | None:
+    """Returns the contents of the page's ``__NEXT_DATA__`` script."""
+    # Searching for the script's ID is far quicker than matching the
+    # pattern below at every tag of a large page.
+    start = content.find(b'id="__NEXT_DATA__"')
+    if start != -1:
+        start = content.find(b">", start) + 1
+        end = content.find(b"</script>", start)
+        if start and end != -1:
+            return content[start:end]
+
+    matched = NEXT_DATA_MATCHER.search(content)
+    if matched:
+        return matched.group(1)
+    return None
+
+
+class NextData:
+    """The ``__NEXT_DATA__`` payload of a page rendered by Next.js.
+
+    The payload is found in, and decoded from, the page's bytes directly
+    rather than from a parsed document, and only once however many times
+    its queries are read.
+    """
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+        self.data: dict[str, Any] = {}
+        payload = get_next_data_payload(content)
+        if payload is not None:
+            self.data = loads(payload)
+
+    @property
+    def queries(self) -> list[dict[str, Any]]:
+        """The queries in the page's dehydrated ``react-query`` state."""
+        return (
+            self.data.get("props", {})
+            .get("pageProps", {})
+            .get("dehydratedState", {})
+            .get("queries", [])
+        )
+
+    def get_form_value(self, action: str, name: str) -> str | None:
+        """Returns the value of input ``name`` in the form posting to
+        ``action``, if the page has one."""
+        matched = re.search(
+            rb"<form[^>]*\baction=[\"']"
+            + re.escape(action.encode("utf-8"))
+            + rb"[\"'].*?</form>",
+            self.content,
+            re.DOTALL,
+        )
+        if not matched:
+            return None
+
+        values = lxml.html.fragment_fromstring(matched.group(0)).xpath(
+            f".//input[@name='{name}']/@value", smart_strings=False
+        )
+        return values[0] if values else None
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Limits requests to ``rate`` per second, allowing bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero.")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def try_acquire(self) -> float:
+        """Takes a token if one is available.
+
+        Returns zero on success or, if no token is available, the number of
+        seconds until one will be.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Blocks until a token is available, then takes it.
+
+        Returns ``False`` if no token became available within ``timeout``
+        seconds.
+        """
+        give_up_at = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return True
+            if give_up_at is not None and time.monotonic() + wait > give_up_at:
+                return False
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits the number of requests in flight, adapting the limit (AIMD).
+
+    While requests succeed, and (if ``latency_target`` is set) complete
+    within that many seconds, the limit grows by one for each full window
+    of ``limit`` successful requests.  When the server signals overload
+    (``429``/``503``, or a connection error), the limit is multiplied by
+    ``backoff_ratio``; the outcomes of the requests already in flight at
+    that point belong to the same congestion event, so they neither cut
+    the limit again nor grow it.
+    """
+
+    OVERLOAD_STATUSES = frozenset({429, 503})
+
+    def __init__(
+        self,
+        max_limit: int,
+        initial_limit: int | None = None,
+        min_limit: int = 1,
+        backoff_ratio: float = 0.5,
+        latency_target: float | None = None,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_target = latency_target
+
+        self._limit = float(
+            initial_limit if initial_limit is not None else min(4, max_limit)
+        )
+        self._in_flight = 0
+        # releases still to come from requests in flight at the last cut
+        self._pending_after_cut = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The number of requests currently allowed in flight."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Blocks until another request may be sent.
+
+        Returns ``False`` if no slot became free within ``timeout`` seconds.
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._in_flight < self.limit, timeout=timeout
+            ):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(
+        self,
+        latency: float,
+        status_code: int | None = None,
+        failed: bool = False,
+        abandoned: bool = False,
+    ) -> None:
+        """Records a finished request's outcome and frees its slot.
+
+        An ``abandoned`` request (e.g. interrupted before its response
+        arrived) tells nothing about the server, so the limit is left as is.
+        """
+        overloaded = failed or status_code in self.OVERLOAD_STATUSES
+        slow = self.latency_target is not None and latency > self.latency_target
+
+        with self._condition:
+            self._in_flight -= 1
+            if self._pending_after_cut:
+                self._pending_after_cut -= 1
+            elif abandoned:
+                pass
+            elif overloaded:
+                self._limit = max(
+                    float(self.min_limit), self._limit * self.backoff_ratio
+                )
+                self._pending_after_cut = self._in_flight
+            elif not slow and (status_code is None or status_code < 500):
+                self._limit = min(float(self.max_limit), self._limit + 1 / self.limit)
+            self._condition.notify_all()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import datetime
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from .cache import LRUCache
+
+
+class ReportCache:
+    """Keeps recently fetched report data for ``ttl`` seconds.
+
+    Reports are keyed by the account, report category, name and lookback
+    they were fetched for and by the date on which they were fetched, so
+    that entries are never reused once the day has changed.  At most
+    ``max_entries`` reports are kept.
+
+    A single cache may be shared between several clients.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 128,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.clock = clock
+
+        self._reports: LRUCache[tuple[float, dict[datetime.date, float]]] = LRUCache(
+            max_entries
+        )
+
+    @property
+    def max_entries(self) -> int:
+        return self._reports.max_entries
+
+    def __len__(self) -> int:
+        return len(self._reports)
+
+    def get(self, key: Hashable) -> dict[datetime.date, float] | None:
+        """Returns a copy of the report stored for ``key`` unless it has
+        expired."""
+        entry = self._reports.get(key)
+        if entry is None:
+            return None
+
+        expires, report = entry
+        if expires <= self.clock():
+            self._reports.invalidate(key)
+            return None
+        return OrderedDict(report)
+
+    def store(self, key: Hashable, report: dict[datetime.date, float]) -> None:
+        self._reports.set(key, (self.clock() + self.ttl, OrderedDict(report)))
+
+    def invalidate(self, key: Hashable) -> None:
+        self._reports.invalidate(key)
+
+    def clear(self) -> None:
+        self._reports.clear()
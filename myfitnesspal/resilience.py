@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import datetime
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from .exceptions import MyfitnesspalCircuitOpen
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """Decides whether, and after how long, a failed request is retried.
+
+    Idempotent requests (e.g. ``GET``) are retried after connection errors,
+    timeouts and any of ``retry_statuses``.  Form ``POST`` requests are only
+    retried when the server cannot have acted on them: when a connection
+    could not be established, or when it answered ``429`` or ``503``.  Set
+    ``retry_non_idempotent`` to retry them in every case.
+
+    Delays grow exponentially from ``backoff_factor`` up to ``max_backoff``
+    with "full jitter" applied; a ``Retry-After`` header sent by the server
+    takes precedence.
+    """
+
+    SAFE_POST_STATUSES = frozenset({429, 503})
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504}),
+        retry_non_idempotent: bool = False,
+        jitter: bool = True,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self.retry_non_idempotent = retry_non_idempotent
+        self.jitter = jitter
+
+    def is_retryable(
+        self,
+        method: str,
+        response: requests.Response | None = None,
+        exception: Exception | None = None,
+    ) -> bool:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if self.retry_non_idempotent:
+            idempotent = True
+
+        if exception is not None:
+            if isinstance(exception, requests.ConnectTimeout):
+                return True
+            if isinstance(exception, (requests.Timeout, requests.ConnectionError)):
+                # A read timeout or reset may have happened after the server
+                # received (and acted upon) our request.
+                return idempotent or _is_connect_error(exception)
+            return False
+
+        if response is None or response.status_code not in self.retry_statuses:
+            return False
+
+        return idempotent or response.status_code in self.SAFE_POST_STATUSES
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        response: requests.Response | None = None,
+        exception: Exception | None = None,
+    ) -> bool:
+        """Returns whether the ``attempt``-th (1-indexed) failure is retried."""
+        if attempt > self.total:
+            return False
+
+        return self.is_retryable(method, response=response, exception=exception)
+
+    def get_backoff(
+        self, attempt: int, response: requests.Response | None = None
+    ) -> float:
+        """Returns the number of seconds to wait before the next attempt."""
+        retry_after = _get_retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        backoff = min(self.backoff_factor * (2 ** (attempt - 1)), self.max_backoff)
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        return backoff
+
+
+class CircuitBreaker:
+    """Stops sending requests to a host that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail immediately with ``MyfitnesspalCircuitOpen``.  Once
+    ``reset_after`` seconds have passed, a single trial request is let
+    through; its success closes the circuit, its failure re-opens it.
+    A trial that ends without an outcome (e.g. because its deadline
+    passed before it was sent) must be given up with ``release_trial``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_after: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._get_state()
+
+    def _get_state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_after:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_request(self) -> None:
+        """Raises ``MyfitnesspalCircuitOpen`` if no request may be sent now."""
+        with self._lock:
+            state = self._get_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+        raise MyfitnesspalCircuitOpen(
+            f"Requests to {self.name} are suspended after "
+            f"{self.failure_threshold} consecutive failures."
+        )
+
+    def release_trial(self) -> None:
+        """Lets another request through as the trial in place of one that
+        was never completed."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+def _is_connect_error(exception: Exception) -> bool:
+    # requests wraps urllib3's NewConnectionError in a ConnectionError; when
+    # that is the cause, no byte of the request was ever sent.
+    reason = exception.args[0] if exception.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, NewConnectionError)
+
+
+def _get_retry_after(response: requests.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+    delta = retry_at - datetime.datetime.now(datetime.timezone.utc)
+    return max(delta.total_seconds(), 0.0)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Hashable, TypeVar
+
+from .exceptions import MyfitnesspalDeadlineExceeded
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.exception: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls sharing the same key into a single call.
+
+    While a call for a key is in progress, other threads asking for the
+    same key wait for it to finish and receive its result (or exception)
+    rather than repeating the work.  Should the call fail only because
+    its own caller's deadline passed, the waiting threads aren't bound by
+    that deadline; one of them makes the call again instead.  An instance
+    may be shared between clients; include anything that affects the
+    result (e.g. the authenticated user) in the key.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], T], timeout: float | None = None) -> T:
+        """Returns ``fn()``, or the result of an identical call in progress.
+
+        Waiting for another thread's call gives up after ``timeout`` seconds
+        with ``MyfitnesspalDeadlineExceeded``.
+        """
+        give_up_at = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if call is None:
+                    call = _Call()
+                    self._calls[key] = call
+                else:
+                    call.waiters += 1
+
+            if leader:
+                try:
+                    call.result = fn()
+                except BaseException as e:
+                    call.exception = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._calls[key]
+                    call.done.set()
+                return call.result
+
+            remaining = (
+                max(give_up_at - time.monotonic(), 0.0)
+                if give_up_at is not None
+                else None
+            )
+            if not call.done.wait(remaining):
+                raise MyfitnesspalDeadlineExceeded(
+                    "Deadline passed while waiting for an identical request."
+                )
+            if isinstance(call.exception, MyfitnesspalDeadlineExceeded):
+                # the leader's deadline needn't be ours; try again
+                continue
+            if call.exception is not None:
+                raise call.exception
+            return call.result
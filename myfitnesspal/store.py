@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import datetime
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    user_id TEXT NOT NULL,
+    measurement TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (user_id, measurement, date)
+);
+CREATE TABLE IF NOT EXISTS synced_ranges (
+    user_id TEXT NOT NULL,
+    measurement TEXT NOT NULL,
+    lower_bound TEXT NOT NULL,
+    upper_bound TEXT NOT NULL,
+    PRIMARY KEY (user_id, measurement)
+);
+"""
+
+
+class MeasurementStore:
+    """Keeps measurements in a SQLite database at ``path``.
+
+    Along with each user's measurements, the store records the range of
+    dates that has been synced from MyFitnessPal, so that later syncs
+    need only fetch entries newer than it.  By default, the database is
+    kept in memory.
+    """
+
+    def __init__(self, path: Path | str = ":memory:"):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def get_synced_range(
+        self, user_id: str, measurement: str
+    ) -> tuple[datetime.date, datetime.date] | None:
+        """Returns the first and last dates that have been synced."""
+        with self._lock:
+            return self._get_synced_range(user_id, measurement)
+
+    def _get_synced_range(
+        self, user_id: str, measurement: str
+    ) -> tuple[datetime.date, datetime.date] | None:
+        row = self._connection.execute(
+            "SELECT lower_bound, upper_bound FROM synced_ranges "
+            "WHERE user_id = ? AND measurement = ?",
+            (user_id, measurement),
+        ).fetchone()
+        if row is None:
+            return None
+        return (
+            datetime.date.fromisoformat(row[0]),
+            datetime.date.fromisoformat(row[1]),
+        )
+
+    def replace(
+        self,
+        user_id: str,
+        measurement: str,
+        values: dict[datetime.date, float],
+        lower_bound: datetime.date,
+        upper_bound: datetime.date,
+    ) -> None:
+        """Replaces the values stored between two dates with ``values``
+        and extends the synced range to include those dates.
+
+        The dates must overlap or adjoin the synced range, if there is one.
+        """
+        with self._lock, self._connection:
+            synced_lower, synced_upper = lower_bound, upper_bound
+            synced = self._get_synced_range(user_id, measurement)
+            if synced is not None:
+                day = datetime.timedelta(days=1)
+                if lower_bound > synced[1] + day or upper_bound < synced[0] - day:
+                    raise ValueError(
+                        f"Cannot store {measurement} values from {lower_bound} "
+                        f"to {upper_bound}; they don't adjoin the synced range "
+                        f"from {synced[0]} to {synced[1]}."
+                    )
+                synced_lower = min(lower_bound, synced[0])
+                synced_upper = max(upper_bound, synced[1])
+
+            self._connection.execute(
+                "DELETE FROM measurements WHERE user_id = ? AND measurement = ? "
+                "AND date BETWEEN ? AND ?",
+                (
+                    user_id,
+                    measurement,
+                    lower_bound.isoformat(),
+                    upper_bound.isoformat(),
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO measurements (user_id, measurement, date, value) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (user_id, measurement, date.isoformat(), value)
+                    for date, value in values.items()
+                    if upper_bound >= date >= lower_bound
+                ],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO synced_ranges "
+                "(user_id, measurement, lower_bound, upper_bound) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    user_id,
+                    measurement,
+                    synced_lower.isoformat(),
+                    synced_upper.isoformat(),
+                ),
+            )
+
+    def get(
+        self,
+        user_id: str,
+        measurement: str,
+        lower_bound: datetime.date | None = None,
+        upper_bound: datetime.date | None = None,
+    ) -> dict[datetime.date, float]:
+        """Returns the stored values between two dates, newest first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT date, value FROM measurements "
+                "WHERE user_id = ? AND measurement = ? AND date BETWEEN ? AND ? "
+                "ORDER BY date DESC",
+                (
+                    user_id,
+                    measurement,
+                    (lower_bound or datetime.date.min).isoformat(),
+                    (upper_bound or datetime.date.max).isoformat(),
+                ),
+            ).fetchall()
+        return OrderedDict(
+            (datetime.date.fromisoformat(date), value) for date, value in rows
+        )
+
+    def clear(self, user_id: str | None = None) -> None:
+        """Removes the stored measurements of ``user_id``, or of all users."""
+        with self._lock, self._connection:
+            for table in ("measurements", "synced_ranges"):
+                if user_id is None:
+                    self._connection.execute(f"DELETE FROM {table}")
+                else:
+                    self._connection.execute(
+                        f"DELETE FROM {table} WHERE user_id = ?", (user_id,)
+                    )
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+
+class Span:
+    """A timed operation, possibly nested within another span."""
+
+    def __init__(
+        self,
+        name: str,
+        parent: Span | None = None,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.name = name
+        self.trace_id: str = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.start_time = time.time()
+        self.end_time: float | None = None
+        self.error: str | None = None
+
+        self._started = time.perf_counter()
+        self._duration: float | None = None
+
+    def __repr__(self) -> str:
+        return f"<Span {self.name} ({self.span_id})>"
+
+    @property
+    def duration(self) -> float | None:
+        """Seconds between the start and end of the span; ``None`` until
+        the span has ended."""
+        return self._duration
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: BaseException | None = None) -> None:
+        self._duration = time.perf_counter() - self._started
+        self.end_time = self.start_time + self._duration
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SpanExporter:
+    """Receives each span once it has ended."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError()
+
+
+class NoopSpanExporter(SpanExporter):
+    """Discards spans; a ``Tracer`` using it doesn't create any."""
+
+    def export(self, span: Span) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps ended spans in ``spans``."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends ended spans to ``path`` as JSON lines."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.as_dict(), default=str, sort_keys=True)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as outf:
+                outf.write(line + "\n")
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "myfitnesspal_span", default=None
+)
+
+
+def get_current_span() -> Span | None:
+    """Returns the innermost span that is in progress in this context."""
+    return _current_span.get()
+
+
+@contextmanager
+def span_scope(span: Span | None) -> Iterator[Span | None]:
+    """Makes ``span`` the parent of spans opened within this block.
+
+    Useful for work deferred past the end of ``span``, e.g. items of a
+    lazily-evaluated iterator, that should still be attributed to it.
+    """
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+
+
+class Tracer:
+    """Creates spans and hands them to ``exporter`` once they end.
+
+    Spans opened while another is in progress (in the same thread, or in
+    a context copied from it) become its children.  Without an exporter,
+    no spans are created.
+    """
+
+    def __init__(self, exporter: SpanExporter | None = None):
+        self.exporter = exporter if exporter is not None else NoopSpanExporter()
+
+    @property
+    def enabled(self) -> bool:
+        return not isinstance(self.exporter, NoopSpanExporter)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Records the enclosed block as a span named ``name``.
+
+        Yields the span (or ``None`` if tracing is disabled) so that
+        attributes can be added to it.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        span = Span(name, parent=_current_span.get(), attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(error=e)
+            raise
+        else:
+            span.end()
+        finally:
+            _current_span.reset(token)
+            self.exporter.export(span)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import requests
+
+
+class Transport:
+    """Sends the HTTP requests made by a ``Client``.
+
+    Implementations receive the same arguments as ``requests.request``
+    and must return a ``requests.Response`` (or raise one of the
+    ``requests`` exceptions).
+    """
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        raise NotImplementedError()
+
+
+class RequestsTransport(Transport):
+    """Sends requests over the network using a ``requests.Session``."""
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
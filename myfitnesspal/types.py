@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime
 from typing import Any, Callable, Dict, List, Optional
 
 from typing_extensions import Literal, TypedDict
@@ -134,6 +135,80 @@ class AuthData(TypedDict):
 NutritionDict = Dict[str, float]
 
 
+class MeasurementPage(TypedDict):
+    entries: Dict[datetime.date, float]
+    has_more: bool
+    total_entries: Optional[int]
+
+
+class MeasurementForm(TypedDict):
+    ids: Dict[str, str]
+    authenticity_token: Optional[str]
+
+
+class MeasurementWriteResult(TypedDict):
+    date: datetime.date
+    value: float
+    status: Literal["updated", "unchanged", "failed"]
+    error: Optional[str]
+
+
+class _NewFoodRequired(TypedDict):
+    brand: str
+    description: str
+    calories: int
+    fat: float
+    carbs: float
+    protein: float
+
+
+class NewFood(_NewFoodRequired, total=False):
+    sodium: Optional[float]
+    potassium: Optional[float]
+    saturated_fat: Optional[float]
+    polyunsaturated_fat: Optional[float]
+    fiber: Optional[float]
+    monounsaturated_fat: Optional[float]
+    sugar: Optional[float]
+    trans_fat: Optional[float]
+    cholesterol: Optional[float]
+    vitamin_a: Optional[float]
+    calcium: Optional[float]
+    vitamin_c: Optional[float]
+    iron: Optional[float]
+    serving_size: str
+    servingspercontainer: float
+    sharepublic: bool
+
+
+class FoodForm(TypedDict):
+    authenticity_token: str
+    utf8: str
+
+
+class FoodWriteResult(TypedDict):
+    brand: str
+    description: str
+    status: Literal["created", "duplicate", "failed"]
+    warning: Optional[str]
+    error: Optional[str]
+
+
+class _GoalChangeRequired(TypedDict):
+    date: datetime.date
+    energy: float
+
+
+class GoalChange(_GoalChangeRequired, total=False):
+    energy_unit: str
+    carbohydrates: Optional[float]
+    protein: Optional[float]
+    fat: Optional[float]
+    percent_carbohydrates: Optional[float]
+    percent_protein: Optional[float]
+    percent_fat: Optional[float]
+
+
 class MealEntry(TypedDict):
     name: str
     nutrition_information: NutritionDict
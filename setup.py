@@ -22,6 +22,7 @@ setup(
     ],
     packages=["myfitnesspal"],
     install_requires=requirements,
+    extras_require={"orjson": ["orjson>=3"]},
     test_suite="nose.collector",
     tests_require=[
         "nose",
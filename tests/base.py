@@ -3,6 +3,7 @@ import unittest
 import json
 
 import lxml.html
+import requests
 
 
 class MFPTestCase(unittest.TestCase):
@@ -13,6 +14,18 @@ class MFPTestCase(unittest.TestCase):
             content = in_.read()
         return lxml.html.document_fromstring(content)
 
+    def get_html_content(self, file_name):
+        file_path = os.path.join(os.path.dirname(__file__), "html", file_name)
+        with open(file_path, "rb") as in_:
+            return in_.read()
+
+    def get_response(self, status_code, content=b"", headers=None):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        response.headers.update(headers or {})
+        return response
+
     def get_json_data(self, file_name):
         file_path = os.path.join(os.path.dirname(__file__), "json", file_name)
         with open(file_path, "r", encoding="utf-8") as in_:
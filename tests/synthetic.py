@@ -0,0 +1,320 @@
+"""Generators for large, synthetic versions of MyFitnessPal pages.
+
+These mirror the structure of the captured pages in ``html/`` closely
+enough for the client's parsers, but let the number of meals, entries,
+measurements, etc. be chosen freely so that parser scaling can be measured.
+"""
+
+import datetime
+import json
+import random
+
+NUTRIENTS = ["Calories", "Carbs", "Fat", "Protein", "Sodium", "Sugar"]
+
+FOODS = [
+    "Dave's Killer Bread - Blues Bread, 2 slice",
+    "Earth Balance - Natural Buttery Spread - Original, 1 tbsp (14g)",
+    "Banana, 1 medium",
+    "Greek Yogurt - Plain, 1 cup",
+    "Chicken Breast - Grilled, 6 oz",
+    "Brown Rice - Cooked, 1 cup",
+]
+
+EXERCISES = [
+    "Yoga",
+    "Swimming, breaststroke, general",
+    "Running (jogging), 8 mph (7.5 min mile)",
+    "Rowing, stationary, very vigorous effort",
+]
+
+
+def _get_random(seed):
+    return random.Random(seed)
+
+
+def _get_nutrient_cells(rng):
+    cells = []
+    for idx, _ in enumerate(NUTRIENTS):
+        value = rng.randint(0, 2500)
+        if idx in (1, 2, 3):
+            cells.append(
+                f'<td><span class="macro-value">{value}</span>'
+                f'<span class="macro-percentage">{rng.randint(0, 100)}</span></td>'
+            )
+        else:
+            cells.append(f"<td>{value:,}</td>")
+    return "".join(cells)
+
+
+def make_diary_html(meals=4, entries_per_meal=25, seed=0):
+    """Returns a food diary page having the specified number of entries."""
+    rng = _get_random(seed)
+    header_cells = "".join(f'<td class="alt">{name}</td>' for name in NUTRIENTS)
+
+    rows = []
+    for meal_idx in range(meals):
+        rows.append(
+            '<tr class="meal_header">'
+            f'<td class="first alt">Meal {meal_idx + 1}</td>{header_cells}</tr>'
+        )
+        for entry_idx in range(entries_per_meal):
+            entry_id = meal_idx * entries_per_meal + entry_idx
+            rows.append(
+                "<tr>"
+                '<td class="first alt">'
+                f'<a onclick="showEditFood({entry_id},\'\');" href="#">'
+                f"{rng.choice(FOODS)}</a></td>"
+                f"{_get_nutrient_cells(rng)}"
+                f'<td class="delete"><a href="/food/remove/{entry_id}">x</a></td>'
+                "</tr>"
+            )
+        rows.append('<tr class="bottom"><td class="first alt">Add Food</td></tr>')
+
+    rows.append(
+        f'<tr class="total"><td class="first">Totals</td>'
+        f'{_get_nutrient_cells(rng)}<td class="empty"></td></tr>'
+    )
+    rows.append(
+        f'<tr class="total alt"><td class="first">Your Daily Goal </td>'
+        f'{_get_nutrient_cells(rng)}<td class="empty"></td></tr>'
+    )
+
+    return (
+        "<html><body><table><tbody>"
+        + "".join(rows)
+        + '</tbody></table><div id="complete_day">'
+        '<span class="day_complete_message">Complete</span></div>'
+        "</body></html>"
+    )
+
+
+def make_exercise_html(tables=2, entries_per_table=25, seed=0):
+    """Returns an exercise diary page having the specified number of entries."""
+    rng = _get_random(seed)
+
+    parts = []
+    for table_idx in range(tables):
+        rows = []
+        for entry_idx in range(entries_per_table):
+            rows.append(
+                "<tr>"
+                '<td class="first alt"><div class="exercise-description">'
+                f'<a href="#">{rng.choice(EXERCISES)}</a></div></td>'
+                f"<td>{rng.randint(5, 90)}</td>"
+                f"<td>{rng.randint(20, 900)}</td>"
+                f'<td class="delete"><a href="/exercise/remove/{entry_idx}">x</a></td>'
+                "</tr>"
+            )
+        parts.append(
+            f'<table class="table0" id="diary-{table_idx}"><thead><tr>'
+            f'<td class="first alt">Exercise Type {table_idx}</td>'
+            '<td class="alt">Minutes</td><td class="alt">Calories Burned</td>'
+            "</tr></thead><tbody>"
+            + "".join(rows)
+            + '<tr class="bottom"><td class="first">Add Exercise</td></tr>'
+            "</tbody></table>"
+        )
+
+    return "<html><body>" + "".join(parts) + "</body></html>"
+
+
+def make_measurements_next_data(
+    entries=100,
+    measurement="Weight",
+    types=("Neck", "Waist", "Hips"),
+    end=datetime.date(2022, 1, 10),
+    seed=0,
+):
+    """Returns the ``__NEXT_DATA__`` payload of a measurements page."""
+    rng = _get_random(seed)
+    items = []
+    for offset in range(entries):
+        date = end - datetime.timedelta(days=offset)
+        items.append(
+            {
+                "id": str(offset),
+                "date": date.strftime("%Y-%m-%d"),
+                "unit": "pounds",
+                "type": measurement,
+                "updated_at": f"{date.isoformat()}T00:00:00Z",
+                "value": round(rng.uniform(140, 180), 1),
+            }
+        )
+
+    return {
+        "props": {
+            "pageProps": {
+                "dehydratedState": {
+                    "queries": [
+                        {
+                            "queryKey": ["measurementTypes"],
+                            "state": {
+                                "data": [
+                                    {"id": str(1000 + idx), "description": name}
+                                    for idx, name in enumerate(types)
+                                ]
+                            },
+                        },
+                        {
+                            "queryKey": ["notifications"],
+                            "state": {"data": {"unread_message_count": 0}},
+                        },
+                        {
+                            "queryKey": ["measurements", measurement, 1],
+                            "state": {
+                                "data": {
+                                    "items": items,
+                                    "has_more": False,
+                                    "total_entries": entries,
+                                }
+                            },
+                        },
+                    ]
+                }
+            }
+        }
+    }
+
+
+def make_measurements_html(entries=100, padding=500, **kwargs):
+    """Returns a measurements page; ``padding`` adds unrelated markup."""
+    filler = "".join(
+        f'<div class="row"><span>Filler {idx}</span></div>' for idx in range(padding)
+    )
+    next_data = json.dumps(make_measurements_next_data(entries, **kwargs))
+    return (
+        "<html><head><title>Measurements</title></head><body>"
+        f'<div id="__next">{filler}</div>'
+        f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+        "</body></html>"
+    )
+
+
+def make_search_html(results=50, seed=0):
+    """Returns a food search results page having ``results`` matches."""
+    rng = _get_random(seed)
+    items = []
+    for idx in range(results):
+        verified = (
+            '<div class="verified verified-list-icon"></div>' if idx % 3 == 0 else ""
+        )
+        items.append(
+            '<li class="matched-food">'
+            '<div class="search-title-container">'
+            f'<a data-external-id="{100000 + idx}" href="#">{rng.choice(FOODS)}</a>'
+            f"</div>{verified}"
+            '<p class="search-nutritional-info">'
+            f"Brand {idx}, 1 serving, {rng.randint(10, 900)} calories</p>"
+            "</li>"
+        )
+    return (
+        "<html><body><p>Matching Foods:</p><ul>"
+        + "".join(items)
+        + "</ul></body></html>"
+    )
+
+
+def make_report_json(days=90, seed=0):
+    """Returns a report API response covering ``days`` days."""
+    rng = _get_random(seed)
+    today = datetime.date.today()
+    return {
+        "chartType": "column",
+        "category": "nutrition",
+        "outcome": {
+            "results": [
+                {
+                    "date": "{d.month}/{d.day}".format(
+                        d=today - datetime.timedelta(days=offset)
+                    ),
+                    "total": float(rng.randint(0, 3000)),
+                }
+                for offset in range(days, -1, -1)
+            ]
+        },
+    }
+
+
+def make_recipe_html(ingredients=20, seed=0, nutrients_in_main=True):
+    """Returns a recipe page having the specified number of ingredients.
+
+    When ``nutrients_in_main`` is false the nutrient table follows the
+    ``main`` element rather than being inside it.
+    """
+    rng = _get_random(seed)
+    nutrients = "".join(
+        f'<tr id="{name}"><td><span>{name}</span><span>{rng.randint(0, 50)}</span>'
+        "</td></tr>"
+        for name in (
+            "carbs",
+            "fiber",
+            "sugar",
+            "sodium",
+            "protein",
+            "total_fat",
+            "saturated_fat",
+            "monounsaturated_fat",
+            "polyunsaturated_fat",
+            "trans_fat",
+        )
+    )
+    ingredient_items = "".join(
+        f"<li>\n{rng.choice(FOODS)}\n</li>" for _ in range(ingredients)
+    )
+    table = f"<table>{nutrients}</table>"
+    return (
+        '<html><body><div id="main">'
+        "<div></div><div></div>"
+        "<div><div></div><div><h1>Synthetic Recipe</h1><div></div>"
+        f"<div><div>\n{rng.randint(100, 900)}\n</div></div></div></div>"
+        f"<div><div><ul>{ingredient_items}</ul></div></div>"
+        f"{table if nutrients_in_main else ''}"
+        '<span id="recipe_servings">4</span>'
+        f"</div>{'' if nutrients_in_main else table}</body></html>"
+    )
+
+
+def make_recipe_list_html(recipes=20, page=1, pages=1):
+    """Returns one page of the recipe list."""
+    items = "".join(
+        "<li><div></div><div><h2><span>"
+        f'<a href="/recipe/view/{page * 1000 + idx}" '
+        f'title="Recipe {page}-{idx}">Recipe {page}-{idx}</a>'
+        "</span></h2></div></li>"
+        for idx in range(recipes)
+    )
+    links = []
+    if page > 1:
+        links.append(f'<a href="/recipe_parser?page={page - 1}">Previous</a>')
+    if page < pages:
+        links.append(f'<a href="/recipe_parser?page={page + 1}">Next</a>')
+    return (
+        '<html><body><div id="main">'
+        f"<ul>{items}</ul><ul>{''.join(links)}</ul>"
+        "</div></body></html>"
+    )
+
+
+def make_meal_html(ingredients=20, seed=0):
+    """Returns a saved meal's ingredient page."""
+    rng = _get_random(seed)
+    rows = "".join(
+        f"<tr><td>{rng.choice(FOODS)}</td><td>{rng.randint(0, 900)}</td></tr>"
+        for _ in range(ingredients)
+    )
+    totals = "".join(f"<td>{rng.randint(0, 900)}</td>" for _ in range(6))
+    return (
+        "<html><body>"
+        f'<table id="meal-table"><tbody>{rows}</tbody></table>'
+        f'<table id="mealTableTotal"><tbody><tr><td>Total</td>{totals}</tr>'
+        "</tbody></table></body></html>"
+    )
+
+
+def make_meal_list_html(meals=50):
+    """Returns the list of a user's saved meals."""
+    items = "".join(
+        f'<li><a href="/meal/update_meal_ingredients/{idx}?x=1">Meal {idx}</a></li>'
+        for idx in range(meals)
+    )
+    return f'<html><body><ul id="matching">{items}</ul></body></html>'
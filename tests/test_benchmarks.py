@@ -0,0 +1,159 @@
+"""Parser benchmarks; run with ``pytest --benchmark-only``.
+
+Requires ``pytest-benchmark``; these are skipped when it isn't installed,
+and by other test runs so that they don't slow the test suite down.
+"""
+
+import lxml.html
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from http.cookiejar import CookieJar  # noqa: E402
+from unittest.mock import DEFAULT, patch  # noqa: E402
+from urllib import parse  # noqa: E402
+
+import myfitnesspal  # noqa: E402
+from myfitnesspal.nextdata import NextData  # noqa: E402
+
+from . import synthetic  # noqa: E402
+
+SIZES = [10, 100, 500]
+
+
+@pytest.fixture(autouse=True)
+def skip_unless_benchmarking(request):
+    if not request.config.getoption("benchmark_only"):
+        pytest.skip("run with --benchmark-only")
+
+
+@pytest.fixture
+def client():
+    with patch.multiple(
+        "myfitnesspal.Client", _get_auth_data=DEFAULT, _get_user_metadata=DEFAULT
+    ) as patches:
+        patches["_get_user_metadata"].return_value = {"username": "benchmark"}
+
+        yield myfitnesspal.Client(cookiejar=CookieJar())
+
+
+def get_document(content):
+    return lxml.html.document_fromstring(content)
+
+
+@pytest.mark.parametrize("entries", SIZES)
+def test_get_meals(benchmark, client, entries):
+    document = get_document(
+        synthetic.make_diary_html(meals=4, entries_per_meal=entries // 4 or 1)
+    )
+
+    meals = benchmark(client._get_meals, document)
+
+    assert sum(len(meal) for meal in meals) == 4 * (entries // 4 or 1)
+
+
+@pytest.mark.parametrize("meals", [4, 12])
+def test_get_goals(benchmark, client, meals):
+    document = get_document(synthetic.make_diary_html(meals=meals, entries_per_meal=25))
+
+    goals = benchmark(client._get_goals, document)
+
+    assert len(goals) == len(synthetic.NUTRIENTS)
+
+
+@pytest.mark.parametrize("entries", SIZES)
+def test_get_exercise(benchmark, client, entries):
+    document = get_document(
+        synthetic.make_exercise_html(tables=2, entries_per_table=entries // 2)
+    )
+
+    exercises = benchmark(client._get_exercise, document)
+
+    assert sum(len(exercise.entries) for exercise in exercises) == entries
+
+
+@pytest.mark.parametrize("entries", SIZES)
+def test_get_measurement_page(benchmark, client, entries):
+    content = synthetic.make_measurements_html(entries=entries).encode("utf-8")
+
+    def parse():
+        page = NextData(content)
+        return (
+            client._get_measurement_ids(page),
+            client._get_measurement_page(page, "Weight", 1),
+        )
+
+    ids, page = benchmark(parse)
+
+    assert set(ids) == {"Weight", "Neck", "Waist", "Hips"}
+    assert len(page["entries"]) == entries
+
+
+@pytest.mark.parametrize("results", SIZES)
+def test_get_food_search_results(benchmark, client, results):
+    document = get_document(synthetic.make_search_html(results=results))
+
+    items = benchmark(client._get_food_search_results, document)
+
+    assert len(items) == results
+
+
+@pytest.mark.parametrize("days", [30, 90, 365])
+def test_get_report_data(benchmark, client, days):
+    json_data = synthetic.make_report_json(days=days)
+
+    report = benchmark(client._get_report_data, json_data)
+
+    assert len(report) == days + 1
+
+
+@pytest.mark.parametrize("ingredients", SIZES)
+def test_get_recipe(benchmark, client, ingredients):
+    document = get_document(synthetic.make_recipe_html(ingredients=ingredients))
+
+    with patch.object(client, "_get_document_for_url", return_value=document):
+        recipe = benchmark(client.get_recipe, 1)
+
+    assert len(recipe["recipeIngredient"]) == ingredients
+
+
+@pytest.mark.parametrize("pages", [1, 10])
+def test_get_recipes(benchmark, client, pages):
+    # Pages are fetched concurrently, and possibly beyond the last one
+    documents = {
+        page: get_document(synthetic.make_recipe_list_html(page=page, pages=pages))
+        for page in range(1, pages + client.max_workers + 1)
+    }
+
+    def get_document_for_url(url):
+        return documents[int(parse.parse_qs(parse.urlsplit(url).query)["page"][0])]
+
+    def get_recipes():
+        with patch.object(
+            client, "_get_document_for_url", side_effect=get_document_for_url
+        ):
+            return client.get_recipes()
+
+    recipes = benchmark(get_recipes)
+
+    assert len(recipes) == 20 * pages
+
+
+@pytest.mark.parametrize("ingredients", SIZES)
+def test_get_meal(benchmark, client, ingredients):
+    document = get_document(synthetic.make_meal_html(ingredients=ingredients))
+
+    with patch.object(client, "_get_document_for_url", return_value=document):
+        meal = benchmark(client.get_meal, 1, "Meal")
+
+    assert len(meal["recipeIngredient"]) == ingredients
+
+
+@pytest.mark.parametrize("meals", SIZES)
+def test_get_meals_list(benchmark, client, meals):
+    document = get_document(synthetic.make_meal_list_html(meals=meals))
+
+    with patch.object(client, "_get_document_for_url", return_value=document):
+        saved_meals = benchmark(client.get_meals)
+
+    assert len(saved_meals) == meals
@@ -0,0 +1,26 @@
+from myfitnesspal.cache import LRUCache
+
+from .base import MFPTestCase
+
+
+class TestLRUCache(MFPTestCase):
+    def test_evicts_least_recently_used(self):
+        cache: LRUCache[int] = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(1, cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual(2, len(cache))
+
+    def test_invalidate(self):
+        cache: LRUCache[int] = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, len(cache))
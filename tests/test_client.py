@@ -1,13 +1,22 @@
 import copy
 import datetime
+import json
+import threading
+import time
 from collections import OrderedDict
 from http.cookiejar import CookieJar
 from unittest.mock import DEFAULT, patch
+from urllib import parse
 
+import lxml.html
+import requests
 from measurement.measures import Energy, Weight
 
 import myfitnesspal
+from myfitnesspal.deadline import deadline_scope
+from myfitnesspal.nextdata import NextData
 
+from . import synthetic
 from .base import MFPTestCase
 
 
@@ -27,8 +36,21 @@ class TestClient(MFPTestCase):
 
         super().setUp()
 
+    def test_get_measurement_values_honours_units(self):
+        values = self.client._get_measurement_values(
+            [
+                {"date": "2022-01-02", "value": 12, "unit": "stones"},
+                {"date": "2022-01-01", "value": 150.5},
+            ]
+        )
+
+        self.assertEqual(
+            {datetime.date(2022, 1, 2): 168.0, datetime.date(2022, 1, 1): 150.5},
+            dict(values),
+        )
+
     def test_get_measurement_ids(self):
-        document = self.get_html_document("measurements.html")
+        document = NextData(self.get_html_content("measurements.html"))
         actual_ids = self.client._get_measurement_ids(document)
 
         expected_ids = {
@@ -53,9 +75,10 @@ class TestClient(MFPTestCase):
         )
 
     def test_get_measurements(self):
-        with patch.object(self.client, "_get_document_for_url") as get_doc:
-            get_doc.return_value = self.get_html_document("measurements.html")
-            get_doc.called
+        with patch.object(self.client, "_get_request_for_url") as get_request:
+            get_request.return_value = self.get_response(
+                200, self.get_html_content("measurements.html")
+            )
             actual_measurements = self.client.get_measurements(
                 "Weight",
                 self.arbitrary_date1,
@@ -455,3 +478,526 @@ class TestClient(MFPTestCase):
         )
 
         self.assertEqual(expected_measurements, actual_measurements)
+
+    def test_search_foods_local(self):
+        remote_items = [
+            myfitnesspal.fooditem.FoodItem(
+                1, "Bacon Cheeseburger", "Sodexo Campus", False, 420.0
+            ),
+        ]
+
+        def get_search_results(query):
+            self.client.food_index.add_all(remote_items)
+            return remote_items
+
+        with patch.object(
+            self.client, "get_food_search_results", side_effect=get_search_results
+        ) as search:
+            first_results = self.client.search_foods_local("bacon")
+            second_results = self.client.search_foods_local("bac chee")
+
+        self.assertEqual(1, search.call_count)
+        self.assertEqual(remote_items, first_results)
+        self.assertEqual(remote_items, second_results)
+
+    def test_request_counter_is_thread_safe(self):
+        with patch.object(self.client.session, "request") as request:
+            request.return_value.status_code = 200
+            threads = [
+                threading.Thread(
+                    target=lambda thread_idx: [
+                        self.client._get_request_for_url(
+                            f"https://example.com/{thread_idx}/{idx}"
+                        )
+                        for idx in range(100)
+                    ],
+                    args=(thread_idx,),
+                )
+                for thread_idx in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(800, self.client._request_counter)
+
+    def test_connection_pools_are_sized_per_host(self):
+        with patch.multiple(
+            "myfitnesspal.Client", _get_auth_data=DEFAULT, _get_user_metadata=DEFAULT
+        ):
+            client = myfitnesspal.Client(
+                cookiejar=CookieJar(), pool_maxsize=32, api_pool_maxsize=16
+            )
+
+        www_adapter = client.session.get_adapter(client.BASE_URL_SECURE + "food")
+        api_adapter = client.session.get_adapter(client.BASE_API_URL + "v2/foods")
+
+        self.assertEqual(32, www_adapter._pool_maxsize)
+        self.assertEqual(16, api_adapter._pool_maxsize)
+
+    def test_set_new_goal_does_not_mutate_session_headers(self):
+        original_headers = dict(self.client.session.headers)
+        old_goals = {
+            "items": [
+                {
+                    "default_goal": {
+                        "energy": {"value": 2000, "unit": "calories"},
+                        "carbohydrates": 250,
+                        "fat": 67,
+                        "protein": 100,
+                    },
+                    "daily_goals": [],
+                }
+            ]
+        }
+
+        with patch.object(self.client, "_get_request_for_url") as get_request:
+            get_request.return_value.text = json.dumps(old_goals)
+            with patch.object(self.client.session, "request") as post:
+                post.return_value.status_code = 200
+                self.client.set_new_goal(energy=1800)
+
+        self.assertEqual(original_headers, dict(self.client.session.headers))
+        self.assertEqual(
+            f"Bearer {self.client.access_token}",
+            post.call_args.kwargs["headers"]["Authorization"],
+        )
+
+    def test_get_request_is_retried(self):
+        responses = [
+            self.get_response(503, headers={"Retry-After": "2"}),
+            self.get_response(200),
+        ]
+
+        with patch.object(self.client.session, "request", side_effect=responses):
+            with patch("myfitnesspal.client.time.sleep") as sleep:
+                result = self.client._get_request_for_url("https://example.com/")
+
+        self.assertEqual(200, result.status_code)
+        sleep.assert_called_once_with(2.0)
+
+    def test_requests_and_parsing_are_recorded_in_stats(self):
+        responses = [
+            self.get_response(503),
+            self.get_response(200, b"<html><body></body></html>"),
+        ]
+        url = "https://www.myfitnesspal.com/food/diary/alpha"
+
+        with patch.object(self.client.session, "request", side_effect=responses):
+            with patch("myfitnesspal.client.time.sleep"):
+                self.client._get_document_for_url(url)
+
+        snapshot = self.client.stats.snapshot()
+        endpoint = snapshot["requests"][
+            "GET www.myfitnesspal.com/food/diary/{username}"
+        ]
+        self.assertEqual({503: 1, 200: 1}, endpoint["statuses"])
+        self.assertEqual(1, endpoint["retries"])
+        self.assertEqual(26, endpoint["response_bytes"])
+        self.assertEqual(1, snapshot["parsers"]["html"]["count"])
+
+    def test_post_request_is_not_retried_after_server_error(self):
+        with patch.object(
+            self.client.session, "request", return_value=self.get_response(500)
+        ) as request:
+            with patch("myfitnesspal.client.time.sleep"):
+                result = self.client._post_request_for_url("https://example.com/")
+
+        self.assertEqual(500, result.status_code)
+        self.assertEqual(1, request.call_count)
+
+    def test_circuit_breaker_opens_for_failing_host(self):
+        self.client._circuit_breaker_threshold = 2
+
+        with patch.object(
+            self.client.session, "request", return_value=self.get_response(500)
+        ) as request:
+            with patch("myfitnesspal.client.time.sleep"):
+                with self.assertRaises(myfitnesspal.exceptions.MyfitnesspalCircuitOpen):
+                    self.client._get_request_for_url("https://example.com/")
+
+        self.assertEqual(2, request.call_count)
+
+    def test_circuit_breaker_trial_is_released_when_deadline_passes(self):
+        self.client._circuit_breaker_threshold = 1
+        breaker = self.client._get_circuit_breaker("https://example.com/")
+        breaker.record_failure()
+        later = time.monotonic() + breaker.reset_after + 1
+
+        with patch("myfitnesspal.resilience.time.monotonic", return_value=later):
+            # The trial request's deadline passes while it waits for a limiter
+            with patch.object(
+                self.client,
+                "_send_attempt",
+                side_effect=myfitnesspal.exceptions.MyfitnesspalDeadlineExceeded(),
+            ):
+                with self.assertRaises(
+                    myfitnesspal.exceptions.MyfitnesspalDeadlineExceeded
+                ):
+                    self.client._get_request_for_url("https://example.com/")
+
+            with patch.object(
+                self.client.session, "request", return_value=self.get_response(200)
+            ):
+                result = self.client._get_request_for_url("https://example.com/")
+
+        self.assertEqual(200, result.status_code)
+        self.assertEqual(breaker.CLOSED, breaker.state)
+
+    def test_concurrency_limit_backs_off_when_throttled(self):
+        with patch.multiple(
+            "myfitnesspal.Client", _get_auth_data=DEFAULT, _get_user_metadata=DEFAULT
+        ):
+            client = myfitnesspal.Client(
+                cookiejar=CookieJar(),
+                retry_policy=myfitnesspal.resilience.RetryPolicy(total=0),
+                max_concurrency=8,
+            )
+        limiter = client._concurrency_limiters["www.myfitnesspal.com"]
+        initial_limit = limiter.limit
+
+        with patch.object(
+            client.session, "request", return_value=self.get_response(429)
+        ):
+            client._get_request_for_url(client.BASE_URL_SECURE + "food/search")
+
+        self.assertEqual(initial_limit // 2, limiter.limit)
+        self.assertNotIn("example.com", client._concurrency_limiters)
+
+    def test_concurrency_limit_grows_only_within_latency_target(self):
+        with patch.multiple(
+            "myfitnesspal.Client", _get_auth_data=DEFAULT, _get_user_metadata=DEFAULT
+        ):
+            client = myfitnesspal.Client(
+                cookiejar=CookieJar(),
+                max_concurrency=8,
+                concurrency_latency_target=0.5,
+            )
+        limiter = client._concurrency_limiters["www.myfitnesspal.com"]
+        initial_limit = limiter.limit
+
+        with patch("myfitnesspal.client.time.monotonic", side_effect=[0.0, 2.0] * 8):
+            with patch.object(
+                client.session, "request", return_value=self.get_response(200)
+            ):
+                for _ in range(8):
+                    client._get_request_for_url(client.BASE_URL_SECURE + "food/search")
+
+        self.assertEqual(0.5, limiter.latency_target)
+        self.assertEqual(initial_limit, limiter.limit)
+
+    def test_interrupted_requests_do_not_grow_concurrency_limit(self):
+        with patch.multiple(
+            "myfitnesspal.Client", _get_auth_data=DEFAULT, _get_user_metadata=DEFAULT
+        ):
+            client = myfitnesspal.Client(cookiejar=CookieJar(), max_concurrency=8)
+        limiter = client._concurrency_limiters["www.myfitnesspal.com"]
+        initial_limit = limiter.limit
+
+        with patch.object(client.session, "request", side_effect=KeyboardInterrupt):
+            for _ in range(8):
+                with self.assertRaises(KeyboardInterrupt):
+                    client._get_request_for_url(client.BASE_URL_SECURE + "food/search")
+
+        self.assertEqual(initial_limit, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
+
+    def _get_form_getter(self, tokens):
+        calls = []
+
+        def get_form(refresh=False):
+            calls.append(refresh)
+            if refresh:
+                tokens.pop(0)
+            return {"authenticity_token": tokens[0]}
+
+        return get_form, calls
+
+    def test_post_form_retries_with_fresh_token(self):
+        get_form, calls = self._get_form_getter(["stale", "fresh"])
+        posted = []
+
+        def post(form):
+            posted.append(form["authenticity_token"])
+            response = requests.Response()
+            response.status_code = 200 if form["authenticity_token"] == "fresh" else 422
+            return response
+
+        result = self.client._post_form(get_form, post)
+
+        self.assertEqual(200, result.status_code)
+        self.assertEqual(["stale", "fresh"], posted)
+        self.assertEqual([False, False, True], calls)
+
+    def test_post_form_reuses_token_refreshed_meanwhile(self):
+        tokens = ["stale", "fresh"]
+        get_form, calls = self._get_form_getter(tokens)
+        posted = []
+
+        def post(form):
+            posted.append(form["authenticity_token"])
+            # another request refreshes the form while this one is rejected
+            tokens[:] = ["fresh"]
+            response = requests.Response()
+            response.status_code = 200 if form["authenticity_token"] == "fresh" else 403
+            return response
+
+        result = self.client._post_form(get_form, post)
+
+        self.assertEqual(200, result.status_code)
+        self.assertEqual(["stale", "fresh"], posted)
+        self.assertEqual([False, False], calls)
+
+    def test_requests_are_sent_with_timeout(self):
+        with patch.object(
+            self.client.session, "request", return_value=self.get_response(200)
+        ) as request:
+            self.client._get_request_for_url("https://example.com/")
+            with deadline_scope(5):
+                self.client._get_request_for_url("https://example.com/")
+
+        self.assertEqual((10.0, 30.0), request.call_args_list[0].kwargs["timeout"])
+        connect_timeout, read_timeout = request.call_args_list[1].kwargs["timeout"]
+        self.assertTrue(4 < connect_timeout <= 5)
+        self.assertTrue(4 < read_timeout <= 5)
+
+    def test_expired_deadline_fails_before_sending(self):
+        with patch.object(self.client.session, "request") as request:
+            with self.assertRaises(
+                myfitnesspal.exceptions.MyfitnesspalDeadlineExceeded
+            ):
+                self.client.get_measurements("Weight", deadline=0)
+
+        request.assert_not_called()
+
+    def test_get_date_lazy_loaders_respect_deadline(self):
+        with patch.object(self.client, "_get_document_for_url") as get_doc:
+            get_doc.return_value = self.get_html_document("diary.html")
+            day = self.client.get_date(self.arbitrary_date1, deadline=60)
+
+        with patch(
+            "myfitnesspal.deadline.time.monotonic", return_value=time.monotonic() + 61
+        ):
+            with patch.object(self.client.session, "request") as request:
+                with self.assertRaises(
+                    myfitnesspal.exceptions.MyfitnesspalDeadlineExceeded
+                ):
+                    day.notes
+
+        request.assert_not_called()
+
+    def test_concurrent_identical_requests_are_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_request(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return self.get_response(200, b"{}")
+
+        results = []
+        with patch.object(
+            self.client.session, "request", side_effect=slow_request
+        ) as request:
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(
+                        self.client._get_request_for_url("https://example.com/")
+                    )
+                )
+                for _ in range(4)
+            ]
+            threads[0].start()
+            started.wait(5)
+            for thread in threads[1:]:
+                thread.start()
+            (call,) = self.client._single_flight._calls.values()
+            while call.waiters < 3:
+                time.sleep(0.01)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(1, request.call_count)
+        self.assertEqual(4, len(results))
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_leader_deadline_does_not_fail_coalesced_callers(self):
+        single_flight = self.client._single_flight
+        joined = threading.Event()
+
+        def impatient():
+            joined.wait(5)
+            raise myfitnesspal.exceptions.MyfitnesspalDeadlineExceeded()
+
+        errors = []
+
+        def lead():
+            try:
+                single_flight.do("key", impatient)
+            except myfitnesspal.exceptions.MyfitnesspalDeadlineExceeded as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=lead)
+        leader.start()
+        while not len(single_flight):
+            time.sleep(0.01)
+
+        results = []
+        follower = threading.Thread(
+            target=lambda: results.append(single_flight.do("key", lambda: "fetched"))
+        )
+        follower.start()
+        (call,) = single_flight._calls.values()
+        while call.waiters < 1:
+            time.sleep(0.01)
+        joined.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(1, len(errors))
+        self.assertEqual(["fetched"], results)
+
+    def test_conditional_requests_use_cached_response(self):
+        responses = [
+            self.get_response(200, b'{"item": 1}', headers={"ETag": '"abc"'}),
+            self.get_response(304),
+        ]
+
+        with patch.object(
+            self.client.session, "request", side_effect=responses
+        ) as request:
+            first = self.client._get_request_for_url("https://example.com/")
+            second = self.client._get_request_for_url("https://example.com/")
+
+        self.assertNotIn("If-None-Match", request.call_args_list[0].kwargs["headers"])
+        self.assertEqual(
+            '"abc"', request.call_args_list[1].kwargs["headers"]["If-None-Match"]
+        )
+        self.assertEqual(200, second.status_code)
+        self.assertEqual(first.content, second.content)
+
+    def test_conditional_request_survives_eviction_in_flight(self):
+        responses = [
+            self.get_response(200, b'{"item": 1}', headers={"ETag": '"abc"'}),
+            self.get_response(304),
+        ]
+
+        def request(*args, **kwargs):
+            if len(responses) == 1:
+                # e.g. another client sharing the cache fills it meanwhile
+                self.client.http_cache.clear()
+            return responses.pop(0)
+
+        with patch.object(self.client.session, "request", side_effect=request):
+            first = self.client._get_request_for_url("https://example.com/")
+            second = self.client._get_request_for_url("https://example.com/")
+
+        self.assertEqual(200, second.status_code)
+        self.assertEqual(first.content, second.content)
+
+    def test_conditional_cache_is_bounded(self):
+        cache = myfitnesspal.httpcache.ConditionalCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.store(
+                key,
+                self.get_response(
+                    200, headers={"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+                ),
+            )
+        cache.store("d", self.get_response(200))
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("d"))
+        self.assertEqual(
+            {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+            cache.get_validators("c"),
+        )
+
+    def test_get_recipes_full(self):
+        pages = 6
+        requested = []
+
+        def get_document_for_url(url):
+            requested.append(url)
+            split_url = parse.urlsplit(url)
+            if split_url.path.startswith("/recipe/view/"):
+                content = synthetic.make_recipe_html(ingredients=3)
+            else:
+                page = int(parse.parse_qs(split_url.query)["page"][0])
+                content = synthetic.make_recipe_list_html(
+                    recipes=2, page=page, pages=pages
+                )
+            return lxml.html.document_fromstring(content)
+
+        with patch.object(
+            self.client, "_get_document_for_url", side_effect=get_document_for_url
+        ):
+            recipe_ids = self.client.get_recipes()
+            recipes = self.client.get_recipes_full(max_workers=3)
+
+        self.assertEqual(2 * pages, len(recipe_ids))
+        self.assertEqual(
+            [
+                f"https://www.myfitnesspal.com/recipe/view/{recipe_id}"
+                for recipe_id in recipe_ids
+            ],
+            [recipe["org_url"] for recipe in recipes],
+        )
+        self.assertEqual(3, len(recipes[0]["recipeIngredient"]))
+        self.assertEqual("Synthetic Recipe", recipes[0]["name"])
+
+    def test_get_recipe_reads_nutrients_outside_main(self):
+        in_main = self.client._get_recipe(
+            lxml.html.document_fromstring(synthetic.make_recipe_html()), "url"
+        )
+        outside_main = self.client._get_recipe(
+            lxml.html.document_fromstring(
+                synthetic.make_recipe_html(nutrients_in_main=False)
+            ),
+            "url",
+        )
+
+        self.assertEqual(in_main["nutrition"], outside_main["nutrition"])
+
+    def test_get_meals_full(self):
+        requested = []
+
+        def get_document_for_url(url):
+            requested.append(url)
+            if url.endswith("/meal/mine"):
+                content = synthetic.make_meal_list_html(meals=5)
+            else:
+                content = synthetic.make_meal_html(ingredients=4)
+            return lxml.html.document_fromstring(content)
+
+        with patch.object(
+            self.client, "_get_document_for_url", side_effect=get_document_for_url
+        ):
+            meals = self.client.get_meals_full(max_workers=3)
+            # Ingredient pages are fetched only once iteration begins
+            self.assertEqual(1, len(requested))
+
+            meals = list(meals)
+
+        self.assertEqual(
+            [f"Meal {idx}" for idx in range(5)], [m["name"] for m in meals]
+        )
+        self.assertEqual(4, len(meals[0]["recipeIngredient"]))
+        self.assertEqual(6, len(requested))
+
+    def test_get_meals_full_applies_deadline(self):
+        with patch.object(
+            self.client,
+            "_get_document_for_url",
+            return_value=lxml.html.document_fromstring(
+                synthetic.make_meal_list_html(meals=2)
+            ),
+        ):
+            meals = self.client.get_meals_full(deadline=0.01)
+
+        time.sleep(0.02)
+        with self.assertRaises(myfitnesspal.exceptions.MyfitnesspalDeadlineExceeded):
+            list(meals)
@@ -0,0 +1,46 @@
+import time
+from unittest.mock import patch
+
+from myfitnesspal.deadline import (
+    Deadline,
+    bind_deadline,
+    deadline_scope,
+    get_current_deadline,
+)
+from myfitnesspal.exceptions import MyfitnesspalDeadlineExceeded
+
+from .base import MFPTestCase
+
+
+class TestDeadline(MFPTestCase):
+    def test_check(self):
+        deadline = Deadline(60)
+        deadline.check()
+
+        with patch(
+            "myfitnesspal.deadline.time.monotonic", return_value=time.monotonic() + 61
+        ):
+            self.assertEqual(0, deadline.remaining())
+            with self.assertRaises(MyfitnesspalDeadlineExceeded):
+                deadline.check()
+
+    def test_nested_scope_keeps_earliest_deadline(self):
+        self.assertIsNone(get_current_deadline())
+
+        with deadline_scope(10) as outer:
+            with deadline_scope(60) as inner:
+                self.assertIs(outer, inner)
+            with deadline_scope(5) as inner:
+                self.assertIsNot(outer, inner)
+                self.assertIs(inner, get_current_deadline())
+            with deadline_scope(None) as inner:
+                self.assertIs(outer, inner)
+
+        self.assertIsNone(get_current_deadline())
+
+    def test_bind_deadline(self):
+        deadline = Deadline(10)
+        bound = bind_deadline(deadline, get_current_deadline)
+
+        self.assertIs(deadline, bound())
+        self.assertIsNone(get_current_deadline())
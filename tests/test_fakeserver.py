@@ -0,0 +1,590 @@
+import datetime
+import os
+from http.cookiejar import CookieJar
+from unittest.mock import patch
+from urllib import parse
+
+from myfitnesspal import Client
+from myfitnesspal.fakeserver import FakeMyfitnesspalServer
+from myfitnesspal.resilience import RetryPolicy
+
+from .base import MFPTestCase
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "html")
+
+
+class TestFakeServer(MFPTestCase):
+    def setUp(self):
+        self.server = FakeMyfitnesspalServer(
+            TEMPLATES_DIR,
+            measurements={
+                "Weight": {
+                    datetime.date(2022, 1, 1)
+                    + datetime.timedelta(days=offset): 150.0
+                    + offset
+                    for offset in range(45)
+                },
+                "Waist": {},
+            },
+            page_size=10,
+            seed=1,
+        )
+        self.client = Client(cookiejar=CookieJar(), transport=self.server)
+
+        super().setUp()
+
+    def test_login(self):
+        self.assertEqual("1", self.client.user_id)
+        self.assertEqual("fake_user", self.client.effective_username)
+
+    def test_get_date(self):
+        day = self.client.get_date(datetime.date(2022, 1, 10))
+
+        self.assertEqual(4, len(day.meals))
+        self.assertEqual(0, day.water)
+        self.assertTrue(day.exercises)
+
+    def test_get_measurements(self):
+        measurements = self.client.get_measurements(
+            "Weight", datetime.date(2022, 1, 5), datetime.date(2022, 2, 14)
+        )
+
+        self.assertEqual(41, len(measurements))
+        self.assertEqual(154.0, measurements[datetime.date(2022, 1, 5)])
+        self.assertEqual(194.0, measurements[datetime.date(2022, 2, 14)])
+
+    def get_measurement_pages_requested(self):
+        return [
+            parse.parse_qs(parse.urlsplit(url).query)["page"][0]
+            for method, url in self.server.requests
+            if "/measurements/edit" in url
+        ]
+
+    def test_get_measurements_stops_at_lower_bound(self):
+        measurements = self.client.get_measurements(
+            "Weight", datetime.date(2022, 1, 25), datetime.date(2022, 2, 14)
+        )
+
+        self.assertEqual(21, len(measurements))
+        # The check in page is reused as the first page of weights
+        self.assertEqual(
+            ["1", "2", "3"], sorted(self.get_measurement_pages_requested())
+        )
+
+    def test_get_measurements_fetches_only_needed_pages(self):
+        latest = datetime.date(2022, 6, 30)
+        self.server.measurements["Weight"] = {
+            latest - datetime.timedelta(days=offset): float(offset)
+            for offset in range(200)
+        }
+
+        # 96 daily entries fill ten pages of ten entries
+        measurements = self.client.get_measurements(
+            "Weight", latest, latest - datetime.timedelta(days=95)
+        )
+
+        self.assertEqual(96, len(measurements))
+        self.assertEqual(
+            [str(page) for page in range(1, 11)],
+            sorted(self.get_measurement_pages_requested(), key=int),
+        )
+
+    def test_get_measurements_beyond_estimate(self):
+        # Daily entries on the first page, then one every ten days
+        self.server.measurements["Weight"] = {
+            datetime.date(2022, 1, 1) - datetime.timedelta(days=offset): float(offset)
+            for offset in list(range(10)) + list(range(10, 500, 10))
+        }
+
+        for max_workers in (1, 4):
+            self.client.max_workers = max_workers
+
+            measurements = self.client.get_measurements(
+                "Weight", datetime.date(2020, 12, 1), datetime.date(2022, 1, 1)
+            )
+
+            self.assertEqual(
+                {
+                    date: value
+                    for date, value in self.server.measurements["Weight"].items()
+                    if date >= datetime.date(2020, 12, 1)
+                },
+                dict(measurements),
+            )
+
+    def test_get_measurements_many(self):
+        self.server.measurements["Waist"] = {
+            datetime.date(2022, 2, 14): 32.0,
+            datetime.date(2022, 2, 1): 33.0,
+            datetime.date(2021, 12, 1): 34.0,
+        }
+
+        measurements = self.client.get_measurements_many(
+            ["Weight", "Waist"], datetime.date(2022, 2, 1), datetime.date(2022, 2, 14)
+        )
+
+        self.assertEqual(["Weight", "Waist"], list(measurements.keys()))
+        self.assertEqual(
+            list(measurements["Weight"].keys()), list(measurements["Waist"].keys())
+        )
+        self.assertEqual(14, len(measurements["Waist"]))
+        self.assertEqual(194.0, measurements["Weight"][datetime.date(2022, 2, 14)])
+        self.assertEqual(32.0, measurements["Waist"][datetime.date(2022, 2, 14)])
+        self.assertIsNone(measurements["Waist"][datetime.date(2022, 2, 2)])
+        self.assertEqual(33.0, measurements["Waist"][datetime.date(2022, 2, 1)])
+        # The check in page and its measurement IDs are fetched only once
+        self.assertEqual(3, len(self.get_measurement_pages_requested()))
+
+    def test_get_measurements_many_unknown_measurement(self):
+        with self.assertRaises(ValueError):
+            self.client.get_measurements_many(["Weight", "Biceps"])
+
+    def test_sync_measurements(self):
+        today = datetime.date.today()
+        self.server.measurements["Weight"] = {
+            today - datetime.timedelta(days=offset): 150.0 + offset
+            for offset in range(1, 100)
+        }
+
+        stored = self.client.get_stored_measurements(
+            "Weight", today - datetime.timedelta(days=60), today
+        )
+
+        self.assertEqual(60, len(stored))
+
+        self.server.measurements["Weight"][today] = 149.0
+        self.server.requests.clear()
+        self.client.sync_measurements("Weight")
+
+        # Only the newest page is fetched again
+        self.assertEqual(["1"], self.get_measurement_pages_requested())
+        self.server.requests.clear()
+
+        stored = self.client.get_stored_measurements(
+            "Weight", today - datetime.timedelta(days=60), today, sync=False
+        )
+
+        self.assertEqual(0, self.server.request_count)
+        self.assertEqual(61, len(stored))
+        self.assertEqual(149.0, stored[today])
+
+    def test_set_measurements(self):
+        self.client.set_measurements("Waist", 32.0, datetime.date(2022, 1, 3))
+
+        self.assertEqual(
+            {datetime.date(2022, 1, 3): 32.0}, self.server.measurements["Waist"]
+        )
+
+    def test_set_measurements_reuses_form(self):
+        self.client.set_measurements("Waist", 32.0, datetime.date(2022, 1, 3))
+        request_count = self.server.request_count
+
+        self.client.set_measurements("Waist", 31.0, datetime.date(2022, 1, 4))
+
+        self.assertEqual(request_count + 1, self.server.request_count)
+        self.assertEqual("POST", self.server.requests[-1][0])
+
+    def test_set_measurements_refreshes_rejected_token(self):
+        self.client.set_measurements("Waist", 32.0, datetime.date(2022, 1, 3))
+        self.server.authenticity_token = "rotated-token"
+
+        self.client.set_measurements("Waist", 31.0, datetime.date(2022, 1, 4))
+
+        self.assertEqual(
+            31.0, self.server.measurements["Waist"][datetime.date(2022, 1, 4)]
+        )
+        self.assertEqual(
+            ["POST", "GET", "POST"],
+            [method for method, url in self.server.requests[-3:]],
+        )
+
+    def test_set_measurements_many(self):
+        self.server.authenticity_token = "rotated-token"
+        values = [
+            (datetime.date(2022, 1, 1), 150.0),
+            (datetime.date(2022, 1, 2), 140.0),
+            (datetime.date(2022, 3, 1), 145.0),
+        ]
+
+        results = self.client.set_measurements_many("Weight", values)
+
+        self.assertEqual(
+            ["unchanged", "updated", "updated"],
+            [result["status"] for result in results],
+        )
+        self.assertEqual(140.0, self.server.measurements["Weight"][values[1][0]])
+        self.assertEqual(145.0, self.server.measurements["Weight"][values[2][0]])
+        posts = [url for method, url in self.server.requests if method == "POST"]
+        self.assertEqual(2, len(posts))
+
+    def test_set_measurements_many_reports_failures(self):
+        self.client.get_measurements("Waist")
+        self.server.error_rate = 1.0
+        self.server.error_statuses = (500,)
+        self.client.retry_policy = RetryPolicy(total=1)
+        self.client._circuit_breaker_threshold = None
+
+        results = self.client.set_measurements_many(
+            "Waist", [(datetime.date(2022, 1, 3), 32.0)], skip_unchanged=False
+        )
+
+        self.assertEqual("failed", results[0]["status"])
+        self.assertEqual("status code: 500", results[0]["error"])
+
+    def test_get_report(self):
+        self.server.report_value = lambda category, name, date: float(date.day)
+
+        report = self.client.get_report(
+            lower_bound=datetime.date.today() - datetime.timedelta(days=3)
+        )
+
+        self.assertEqual(
+            {date: float(date.day) for date in report.keys()},
+            dict(report),
+        )
+        self.assertEqual(4, len(report))
+
+    def test_get_reports(self):
+        self.server.report_value = lambda category, name, date: (
+            float(date.day) if name == "Protein" else float(len(name))
+        )
+        today = datetime.date.today()
+
+        table = self.client.get_reports(
+            [("Net Calories", "Nutrition"), ("Protein", "Nutrition")],
+            today - datetime.timedelta(days=3),
+        )
+
+        self.assertEqual(
+            [today - datetime.timedelta(days=offset) for offset in range(3, -1, -1)],
+            list(table.keys()),
+        )
+        self.assertEqual(
+            {"Net Calories": 12.0, "Protein": float(today.day)}, table[today]
+        )
+
+    def test_get_reports_requires_distinct_names(self):
+        with self.assertRaises(ValueError):
+            self.client.get_reports(
+                [("Net Calories", "Nutrition"), ("Net Calories", "Fitness")]
+            )
+
+    def get_report_requests(self):
+        return [
+            url for method, url in self.server.requests if "/reports/results/" in url
+        ]
+
+    def test_get_report_is_cached(self):
+        lower_bound = datetime.date.today() - datetime.timedelta(days=3)
+
+        first = self.client.get_report(lower_bound=lower_bound)
+        second = self.client.get_report(lower_bound=lower_bound)
+        self.client.get_report("Protein", lower_bound=lower_bound)
+
+        self.assertEqual(first, second)
+        self.assertEqual(2, len(self.get_report_requests()))
+
+    def test_report_cache_can_be_shared_or_disabled(self):
+        lower_bound = datetime.date.today() - datetime.timedelta(days=3)
+        other = Client(
+            cookiejar=CookieJar(),
+            transport=self.server,
+            report_cache=self.client.report_cache,
+        )
+
+        self.client.get_report(lower_bound=lower_bound)
+        other.get_report(lower_bound=lower_bound)
+        self.assertEqual(1, len(self.get_report_requests()))
+
+        uncached = Client(
+            cookiejar=CookieJar(), transport=self.server, report_cache=False
+        )
+        uncached.get_report(lower_bound=lower_bound)
+        uncached.get_report(lower_bound=lower_bound)
+        self.assertEqual(3, len(self.get_report_requests()))
+
+    def test_get_report_with_diary_fallback(self):
+        self.server.report_value = lambda category, name, date: float(date.day)
+        today = datetime.date.today()
+        lookback = today - datetime.timedelta(days=Client.REPORT_LOOKBACK_DAYS)
+
+        report = self.client.get_report(
+            "Net Calories",
+            "Nutrition",
+            lookback - datetime.timedelta(days=2),
+            diary_fallback=True,
+        )
+
+        self.assertEqual(Client.REPORT_LOOKBACK_DAYS + 3, len(report))
+        self.assertEqual(sorted(report.keys()), list(report.keys()))
+        # Calories eaten less calories burned, from the diary pages
+        self.assertEqual(1758.0, report[lookback - datetime.timedelta(days=2)])
+        self.assertEqual(1758.0, report[lookback - datetime.timedelta(days=1)])
+        self.assertEqual(float(lookback.day), report[lookback])
+        self.assertEqual(float(today.day), report[today])
+        self.assertEqual(
+            2,
+            sum(1 for method, url in self.server.requests if "/food/diary/" in url),
+        )
+
+    def test_get_reports_with_diary_fallback(self):
+        today = datetime.date.today()
+        lower_bound = today - datetime.timedelta(days=Client.REPORT_LOOKBACK_DAYS + 1)
+
+        table = self.client.get_reports(
+            [("Total Calories", "Nutrition"), ("Protein", "Nutrition")],
+            lower_bound,
+            diary_fallback=True,
+        )
+
+        self.assertEqual(
+            {"Total Calories": 2279.0, "Protein": 78.0}, table[lower_bound]
+        )
+        # Each diary page is fetched once for both reports
+        self.assertEqual(
+            1,
+            sum(1 for method, url in self.server.requests if "/food/diary/" in url),
+        )
+
+    def test_diary_fallback_is_unused_within_lookback(self):
+        self.server.report_value = lambda category, name, date: 80.0
+        today = datetime.date.today()
+
+        report = self.client.get_report(
+            "Weight",
+            "Progress",
+            today - datetime.timedelta(days=7),
+            today,
+            diary_fallback=True,
+        )
+
+        self.assertEqual(8, len(report))
+
+    def test_diary_fallback_requires_diary_totals(self):
+        with self.assertRaises(ValueError):
+            self.client.get_report(
+                "Weight",
+                "Progress",
+                datetime.date.today() - datetime.timedelta(days=100),
+                diary_fallback=True,
+            )
+
+    def test_food_search_and_details(self):
+        results = self.client.get_food_search_results("bacon")
+
+        self.assertEqual([1, 2], [item.mfp_id for item in results])
+        self.assertEqual("Sodexo Campus", results[0].brand)
+        self.assertTrue(results[1].verified)
+
+        item = self.client.get_food_item_details(3)
+
+        self.assertEqual("Banana", item.name)
+        self.assertEqual(105.0, item.calories)
+
+    def get_food_requests(self):
+        return [
+            (method, parse.urlsplit(url).path)
+            for method, url in self.server.requests
+            if "/food/" in url and "/food/diary/" not in url
+        ]
+
+    def test_set_new_food(self):
+        self.client.set_new_food("Acme", "Granola", 450, 20.0, 60.0, 10.0)
+
+        self.assertEqual("Granola", self.server.foods[4]["description"])
+        self.assertEqual(
+            [
+                ("GET", "/food/submit"),
+                ("POST", "/food/duplicate"),
+                ("GET", "/food/new"),
+                ("POST", "/food/new"),
+            ],
+            self.get_food_requests(),
+        )
+
+    def test_set_new_foods(self):
+        # Indexes "Bacon Cheeseburger" by "Sodexo Campus"
+        self.client.get_food_search_results("bacon")
+        self.server.requests.clear()
+
+        results = self.client.set_new_foods(
+            [
+                {
+                    "brand": "Acme",
+                    "description": "Granola",
+                    "calories": 450,
+                    "fat": 20.0,
+                    "carbs": 60.0,
+                    "protein": 10.0,
+                },
+                {
+                    "brand": "acme",
+                    "description": "granola ",
+                    "calories": 450,
+                    "fat": 20.0,
+                    "carbs": 60.0,
+                    "protein": 10.0,
+                },
+                {
+                    "brand": "Sodexo Campus",
+                    "description": "Bacon Cheeseburger",
+                    "calories": 420,
+                    "fat": 20.0,
+                    "carbs": 30.0,
+                    "protein": 25.0,
+                },
+                {
+                    "brand": "",
+                    "description": "Banana",
+                    "calories": 105,
+                    "fat": 0.4,
+                    "carbs": 27.0,
+                    "protein": 1.3,
+                },
+                {
+                    "brand": "Acme",
+                    "description": "",
+                    "calories": 1,
+                    "fat": 0.0,
+                    "carbs": 0.0,
+                    "protein": 0.0,
+                },
+            ]
+        )
+
+        self.assertEqual(
+            ["created", "duplicate", "duplicate", "created", "failed"],
+            [result["status"] for result in results],
+        )
+        # Only foods that are indexed locally are known to be duplicates
+        self.assertEqual("This food may already exist.", results[3]["warning"])
+        self.assertEqual(
+            "Unable to submit food to MyFitnessPal: can't be blank",
+            results[4]["error"],
+        )
+        # The forms are fetched once for all of the foods
+        self.assertEqual(
+            [("GET", "/food/submit"), ("GET", "/food/new")],
+            [request for request in self.get_food_requests() if request[0] == "GET"],
+        )
+
+    def test_set_new_foods_refreshes_expired_token(self):
+        self.client.set_new_food("Acme", "Granola", 450, 20.0, 60.0, 10.0)
+        self.server.authenticity_token = "new-token"
+
+        results = self.client.set_new_foods(
+            [
+                {
+                    "brand": "Acme",
+                    "description": "Muesli",
+                    "calories": 400,
+                    "fat": 10.0,
+                    "carbs": 70.0,
+                    "protein": 12.0,
+                }
+            ]
+        )
+
+        self.assertEqual("created", results[0]["status"])
+        self.assertEqual("Muesli", self.server.foods[5]["description"])
+
+    def get_nutrient_goal_requests(self):
+        return [
+            method for method, url in self.server.requests if "/nutrient-goals" in url
+        ]
+
+    def test_get_goals_range(self):
+        goal = self.server._get_default_nutrient_goal()
+        goal["default_goal"]["energy"]["value"] = 1800.0
+        self.server.nutrient_goals[datetime.date(2022, 1, 5)] = goal
+
+        goals = self.client.get_goals_range(
+            datetime.date(2022, 1, 6), datetime.date(2022, 1, 3)
+        )
+
+        self.assertEqual(
+            [datetime.date(2022, 1, day) for day in range(3, 7)], list(goals.keys())
+        )
+        self.assertEqual(
+            [2000.0, 2000.0, 1800.0, 1800.0],
+            [goal["default_goal"]["energy"]["value"] for goal in goals.values()],
+        )
+        self.assertEqual(4, len(self.get_nutrient_goal_requests()))
+
+        # Goals already fetched are reused unless refreshed
+        self.client.get_goals_range(datetime.date(2022, 1, 3))
+        self.assertEqual(4, len(self.get_nutrient_goal_requests()))
+        self.client.get_goals_range(datetime.date(2022, 1, 3), refresh=True)
+        self.assertEqual(5, len(self.get_nutrient_goal_requests()))
+
+    def test_cached_goals_expire(self):
+        date = datetime.date(2022, 1, 3)
+
+        for now, expected_requests in ((0.0, 1), (299.0, 1), (300.0, 2)):
+            with patch("myfitnesspal.client.time.monotonic", return_value=now):
+                self.client.get_goals_range(date)
+            self.assertEqual(expected_requests, len(self.get_nutrient_goal_requests()))
+
+    def test_set_goal_schedule(self):
+        self.client.set_goal_schedule(
+            [
+                {
+                    "date": datetime.date(2022, 1, 17),
+                    "energy": 1600.0,
+                    "percent_carbohydrates": 40,
+                    "percent_protein": 30,
+                    "percent_fat": 30,
+                },
+                {"date": datetime.date(2022, 1, 10), "energy": 1800.0},
+            ]
+        )
+
+        # Only the goals before the first change are fetched
+        self.assertEqual(["GET", "POST", "POST"], self.get_nutrient_goal_requests())
+        first = self.server.nutrient_goals[datetime.date(2022, 1, 10)]
+        self.assertEqual(1800.0, first["default_goal"]["energy"]["value"])
+        self.assertEqual(225.0, first["default_goal"]["carbohydrates"])
+        second = self.server.nutrient_goals[datetime.date(2022, 1, 17)]
+        self.assertEqual(160.0, second["default_goal"]["carbohydrates"])
+        self.assertEqual(1600.0, second["daily_goals"][0]["energy"]["value"])
+
+        goals = self.client.get_goals_range(
+            datetime.date(2022, 1, 9), datetime.date(2022, 1, 17)
+        )
+        self.assertEqual(
+            [2000.0] + [1800.0] * 7 + [1600.0],
+            [goal["default_goal"]["energy"]["value"] for goal in goals.values()],
+        )
+
+    def test_set_new_goal_invalidates_cached_goals(self):
+        today = datetime.date.today()
+        self.client.get_goals_range(today)
+
+        self.client.set_new_goal(energy=1500)
+
+        self.assertEqual(
+            1500.0,
+            self.client.get_goals_range(today)[today]["default_goal"]["energy"][
+                "value"
+            ],
+        )
+
+    def test_set_new_goal_refresh(self):
+        today = datetime.date.today()
+        self.client.get_goals_range(today)
+
+        self.client.set_new_goal(energy=1500, refresh=True)
+
+        self.assertEqual(["GET", "GET", "POST"], self.get_nutrient_goal_requests())
+
+    def test_error_injection_is_retried(self):
+        self.server.error_rate = 0.5
+        self.client.retry_policy = RetryPolicy(total=20)
+
+        with patch("myfitnesspal.client.time.sleep"):
+            for offset in range(10):
+                self.client._get_notes(
+                    datetime.date(2022, 1, 1) + datetime.timedelta(days=offset)
+                )
+
+        self.assertGreater(self.server.request_count, 12)
@@ -0,0 +1,54 @@
+from myfitnesspal.foodindex import FoodIndex
+from myfitnesspal.fooditem import FoodItem
+
+from .base import MFPTestCase
+
+
+class TestFoodIndex(MFPTestCase):
+    def setUp(self):
+        self.index = FoodIndex()
+        self.index.add_all(
+            [
+                FoodItem(1, "Bacon Cheeseburger", "Sodexo Campus", False, 420.0),
+                FoodItem(2, "Junior Bacon Cheeseburger", "Wendy's", True, 380.0),
+                FoodItem(3, "Cheddar Cheese", "Tillamook", True, 110.0),
+                FoodItem(4, "Banana", None, True, 105.0),
+            ]
+        )
+
+        super().setUp()
+
+    def test_prefix_search(self):
+        results = self.index.search("bac chee")
+
+        self.assertEqual([2, 1], [item.mfp_id for item in results])
+
+    def test_brand_search(self):
+        results = self.index.search("tilla")
+
+        self.assertEqual([3], [item.mfp_id for item in results])
+
+    def test_fuzzy_search(self):
+        results = self.index.search("banan")
+
+        self.assertEqual([4], [item.mfp_id for item in results])
+
+        results = self.index.search("bananna")
+
+        self.assertEqual([4], [item.mfp_id for item in results])
+
+    def test_no_match(self):
+        self.assertEqual([], self.index.search("quinoa"))
+        self.assertEqual([], self.index.search("bananna", fuzzy=False))
+
+    def test_replace_and_remove(self):
+        self.index.add(FoodItem(4, "Plantain", None, True, 218.0))
+
+        self.assertEqual([], self.index.search("banana", fuzzy=False))
+        self.assertEqual([4], [item.mfp_id for item in self.index.search("plan")])
+
+        self.index.remove(4)
+
+        self.assertNotIn(4, self.index)
+        self.assertEqual(3, len(self.index))
+        self.assertEqual([], self.index.search("plan"))
@@ -0,0 +1,98 @@
+from myfitnesspal.metrics import ClientStats, Histogram, get_endpoint
+
+from .base import MFPTestCase
+
+
+class TestGetEndpoint(MFPTestCase):
+    def test_replaces_identifiers(self):
+        self.assertEqual(
+            "www.myfitnesspal.com/food/diary/{username}",
+            get_endpoint(
+                "https://www.myfitnesspal.com/food/diary/alpha?date=2022-01-10"
+            ),
+        )
+        self.assertEqual(
+            "api.myfitnesspal.com/v2/foods/{id}",
+            get_endpoint("https://api.myfitnesspal.com/v2/foods/123456?fields[]=x"),
+        )
+        self.assertEqual(
+            "www.myfitnesspal.com/api/services/reports/results/"
+            "{category}/{name}/{days}.json",
+            get_endpoint(
+                "https://www.myfitnesspal.com/api/services/reports/results/"
+                "nutrition/Net Calories/30.json"
+            ),
+        )
+
+
+class TestHistogram(MFPTestCase):
+    def test_counts_are_cumulative(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+
+        self.assertEqual(
+            {"count": 4, "sum": 5.65, "buckets": {"0.1": 2, "1.0": 3, "+Inf": 4}},
+            histogram.as_dict(),
+        )
+
+
+class TestClientStats(MFPTestCase):
+    def setUp(self):
+        self.stats = ClientStats(latency_buckets=(0.1, 1.0))
+        self.url = "https://www.myfitnesspal.com/food/diary/alpha"
+
+        super().setUp()
+
+    def test_snapshot(self):
+        self.stats.record_request("GET", self.url, 0.05, 503, 10)
+        self.stats.record_retry("GET", self.url)
+        self.stats.record_request("GET", self.url + "?date=x", 0.5, 200, 100)
+        self.stats.record_request("GET", self.url, 2.0, error="ReadTimeout")
+        self.stats.record_parse("meals", 0.2)
+
+        snapshot = self.stats.snapshot()
+
+        endpoint = snapshot["requests"][
+            "GET www.myfitnesspal.com/food/diary/{username}"
+        ]
+        self.assertEqual(3, endpoint["count"])
+        self.assertEqual({503: 1, 200: 1}, endpoint["statuses"])
+        self.assertEqual({"ReadTimeout": 1}, endpoint["errors"])
+        self.assertEqual(110, endpoint["response_bytes"])
+        self.assertEqual(1, endpoint["retries"])
+        self.assertEqual(
+            {"0.1": 1, "1.0": 2, "+Inf": 3}, endpoint["latency"]["buckets"]
+        )
+        self.assertEqual(1, snapshot["parsers"]["meals"]["count"])
+
+    def test_to_prometheus(self):
+        self.stats.record_request("GET", self.url, 0.05, 200, 10)
+        self.stats.record_parse("meals", 0.2)
+
+        text = self.stats.to_prometheus()
+
+        labels = 'method="GET",endpoint="www.myfitnesspal.com/food/diary/{username}"'
+        self.assertIn(f'myfitnesspal_requests_total{{{labels},status="200"}} 1', text)
+        self.assertIn(f"myfitnesspal_response_bytes_total{{{labels}}} 10", text)
+        self.assertIn(
+            f'myfitnesspal_request_duration_seconds_bucket{{{labels},le="0.1"}} 1',
+            text,
+        )
+        self.assertIn(
+            'myfitnesspal_parse_duration_seconds_count{parser="meals"} 1', text
+        )
+        self.assertIn("# TYPE myfitnesspal_request_duration_seconds histogram", text)
+
+    def test_hooks_receive_events(self):
+        events = []
+        self.stats.add_hook(lambda event, data: events.append((event, data)))
+
+        self.stats.record_request("GET", self.url, 0.05, 200, 10)
+        self.stats.record_parse("meals", 0.2)
+
+        self.assertEqual(["request", "parse"], [event for event, _ in events])
+        self.assertEqual(
+            "www.myfitnesspal.com/food/diary/{username}", events[0][1]["endpoint"]
+        )
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from myfitnesspal import nextdata
+from myfitnesspal.nextdata import NextData
+
+from .base import MFPTestCase
+
+
+class TestNextData(MFPTestCase):
+    def test_queries(self):
+        page = NextData(self.get_html_content("measurements.html"))
+
+        self.assertEqual(
+            [
+                ["measurementTypes"],
+                ["notifications"],
+                ["measurements", "Weight", 1],
+                ["startingMeasurement", "Weight"],
+            ],
+            [q["queryKey"] for q in page.queries],
+        )
+
+    def test_without_orjson(self):
+        content = self.get_html_content("measurements.html")
+
+        with patch.object(nextdata, "orjson", None):
+            page = NextData(content)
+
+        self.assertEqual(NextData(content).data, page.data)
+
+    def test_single_quoted_script_id(self):
+        page = NextData(
+            b"<html><body><script type='application/json' id='__NEXT_DATA__'>"
+            b'{"props": {"pageProps": {"dehydratedState": {"queries": []}}}}'
+            b"</script></body></html>"
+        )
+
+        self.assertEqual(
+            {"dehydratedState": {"queries": []}}, page.data["props"]["pageProps"]
+        )
+
+    def test_page_without_next_data(self):
+        page = NextData(b"<html><body></body></html>")
+
+        self.assertEqual([], page.queries)
+
+    def test_get_form_value(self):
+        page = NextData(
+            b"<html><body>"
+            b'<form action="/other"><input name="token" value="a" /></form>'
+            b'<form method="post" action="/measurements/new">'
+            b'<input value="b" type="hidden" name="token" /></form>'
+            b"</body></html>"
+        )
+
+        self.assertEqual("b", page.get_form_value("/measurements/new", "token"))
+        self.assertIsNone(page.get_form_value("/measurements/new", "missing"))
+        self.assertIsNone(page.get_form_value("/missing", "token"))
@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+from myfitnesspal.ratelimit import AdaptiveConcurrencyLimiter, TokenBucket
+
+from .base import MFPTestCase
+
+
+class TestTokenBucket(MFPTestCase):
+    def test_allows_burst_then_limits(self):
+        with patch("myfitnesspal.ratelimit.time.monotonic", return_value=100.0):
+            bucket = TokenBucket(rate=2, capacity=2)
+
+            self.assertEqual(0, bucket.try_acquire())
+            self.assertEqual(0, bucket.try_acquire())
+            self.assertEqual(0.5, bucket.try_acquire())
+
+        with patch("myfitnesspal.ratelimit.time.monotonic", return_value=100.5):
+            self.assertEqual(0, bucket.try_acquire())
+
+
+class TestAdaptiveConcurrencyLimiter(MFPTestCase):
+    def test_increases_additively_and_decreases_multiplicatively(self):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=8, initial_limit=4)
+
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(0.1, status_code=200)
+
+        self.assertEqual(5, limiter.limit)
+
+        limiter.acquire()
+        limiter.release(0.1, status_code=429)
+
+        self.assertEqual(2, limiter.limit)
+
+        limiter.acquire()
+        limiter.release(0.1, failed=True)
+        limiter.acquire()
+        limiter.release(0.1, status_code=503)
+
+        self.assertEqual(1, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
+
+    def test_concurrent_overloads_cut_limit_once(self):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=8, initial_limit=8)
+
+        for _ in range(8):
+            limiter.acquire()
+        for _ in range(8):
+            limiter.release(0.1, status_code=429)
+
+        self.assertEqual(4, limiter.limit)
+
+        # A later overload is a new congestion event
+        limiter.acquire()
+        limiter.release(0.1, status_code=429)
+
+        self.assertEqual(2, limiter.limit)
+
+    def test_abandoned_requests_leave_limit_unchanged(self):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=8, initial_limit=2)
+
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(0.1, abandoned=True)
+
+        self.assertEqual(2, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
+
+    def test_slow_requests_do_not_increase_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(
+            max_limit=8, initial_limit=2, latency_target=1.0
+        )
+
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(2.5, status_code=200)
+
+        self.assertEqual(2, limiter.limit)
+
+    def test_limit_is_bounded(self):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=2, initial_limit=2)
+
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(0.1, status_code=200)
+
+        self.assertEqual(2, limiter.limit)
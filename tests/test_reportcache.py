@@ -0,0 +1,40 @@
+import datetime
+
+from myfitnesspal.reportcache import ReportCache
+
+from .base import MFPTestCase
+
+
+class TestReportCache(MFPTestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = ReportCache(ttl=60.0, max_entries=2, clock=lambda: self.now)
+        self.report = {datetime.date(2022, 1, 1): 1.0}
+
+        super().setUp()
+
+    def test_entries_expire(self):
+        self.cache.store("a", self.report)
+
+        self.now = 59.0
+        self.assertEqual(self.report, self.cache.get("a"))
+
+        self.now = 60.0
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(0, len(self.cache))
+
+    def test_is_bounded(self):
+        for key in ("a", "b"):
+            self.cache.store(key, self.report)
+        self.cache.get("a")
+        self.cache.store("c", self.report)
+
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+
+    def test_returns_copies(self):
+        self.cache.store("a", self.report)
+        self.cache.get("a")[datetime.date(2022, 1, 2)] = 2.0
+
+        self.assertEqual(self.report, self.cache.get("a"))
@@ -0,0 +1,96 @@
+import email.utils
+import time
+from unittest.mock import patch
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from myfitnesspal.exceptions import MyfitnesspalCircuitOpen
+from myfitnesspal.resilience import CircuitBreaker, RetryPolicy
+
+from .base import MFPTestCase
+
+
+class TestRetryPolicy(MFPTestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(total=2, backoff_factor=1, jitter=False)
+
+        super().setUp()
+
+    def test_get_is_retried_on_server_errors(self):
+        self.assertTrue(self.policy.should_retry("GET", 1, self.get_response(502)))
+        self.assertTrue(self.policy.should_retry("GET", 2, self.get_response(502)))
+        self.assertFalse(self.policy.should_retry("GET", 3, self.get_response(502)))
+        self.assertFalse(self.policy.should_retry("GET", 1, self.get_response(404)))
+
+    def test_post_is_only_retried_when_not_processed(self):
+        self.assertFalse(self.policy.should_retry("POST", 1, self.get_response(500)))
+        self.assertTrue(self.policy.should_retry("POST", 1, self.get_response(503)))
+        self.assertTrue(self.policy.should_retry("POST", 1, self.get_response(429)))
+        self.assertFalse(
+            self.policy.should_retry("POST", 1, exception=requests.ReadTimeout())
+        )
+        self.assertTrue(
+            self.policy.should_retry(
+                "POST",
+                1,
+                exception=requests.ConnectionError(
+                    NewConnectionError(None, "Connection refused")
+                ),
+            )
+        )
+
+    def test_backoff(self):
+        self.assertEqual(1, self.policy.get_backoff(1))
+        self.assertEqual(4, self.policy.get_backoff(3))
+
+    def test_backoff_honors_retry_after(self):
+        self.assertEqual(
+            7,
+            self.policy.get_backoff(
+                1, self.get_response(429, headers={"Retry-After": "7"})
+            ),
+        )
+
+        retry_at = email.utils.formatdate(time.time() + 10, usegmt=True)
+        backoff = self.policy.get_backoff(
+            1, self.get_response(503, headers={"Retry-After": retry_at})
+        )
+        self.assertTrue(8 <= backoff <= 10)
+
+
+class TestCircuitBreaker(MFPTestCase):
+    def test_opens_after_threshold_and_recovers(self):
+        breaker = CircuitBreaker("api", failure_threshold=2, reset_after=60)
+
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+        with self.assertRaises(MyfitnesspalCircuitOpen):
+            breaker.before_request()
+
+        later = time.monotonic() + 61
+        with patch("myfitnesspal.resilience.time.monotonic", return_value=later):
+
+            self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+            breaker.before_request()
+            with self.assertRaises(MyfitnesspalCircuitOpen):
+                breaker.before_request()
+
+            breaker.record_success()
+
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+
+    def test_released_trial_lets_another_through(self):
+        breaker = CircuitBreaker("api", failure_threshold=1, reset_after=60)
+        breaker.record_failure()
+
+        later = time.monotonic() + 61
+        with patch("myfitnesspal.resilience.time.monotonic", return_value=later):
+            breaker.before_request()
+            breaker.release_trial()
+
+            breaker.before_request()
+            self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
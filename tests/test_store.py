@@ -0,0 +1,79 @@
+import datetime
+import os
+import tempfile
+
+from myfitnesspal.store import MeasurementStore
+
+from .base import MFPTestCase
+
+
+class TestMeasurementStore(MFPTestCase):
+    def setUp(self):
+        self.store = MeasurementStore()
+        self.jan = [datetime.date(2022, 1, day) for day in range(1, 32)]
+
+        super().setUp()
+
+    def tearDown(self):
+        self.store.close()
+
+        super().tearDown()
+
+    def test_replace_and_get(self):
+        self.store.replace(
+            "1",
+            "Weight",
+            {self.jan[0]: 150.0, self.jan[9]: 151.0},
+            self.jan[0],
+            self.jan[9],
+        )
+
+        self.assertEqual(
+            [(self.jan[9], 151.0), (self.jan[0], 150.0)],
+            list(self.store.get("1", "Weight").items()),
+        )
+        self.assertEqual(
+            {self.jan[9]: 151.0}, dict(self.store.get("1", "Weight", self.jan[5]))
+        )
+        self.assertEqual({}, dict(self.store.get("2", "Weight")))
+        self.assertEqual(
+            (self.jan[0], self.jan[9]), self.store.get_synced_range("1", "Weight")
+        )
+
+    def test_replace_removes_entries_missing_from_range(self):
+        self.store.replace(
+            "1",
+            "Weight",
+            {self.jan[0]: 150.0, self.jan[9]: 151.0},
+            self.jan[0],
+            self.jan[9],
+        )
+
+        self.store.replace(
+            "1", "Weight", {self.jan[12]: 152.0}, self.jan[9], self.jan[19]
+        )
+
+        self.assertEqual(
+            {self.jan[12]: 152.0, self.jan[0]: 150.0},
+            dict(self.store.get("1", "Weight")),
+        )
+        self.assertEqual(
+            (self.jan[0], self.jan[19]), self.store.get_synced_range("1", "Weight")
+        )
+
+    def test_replace_rejects_gaps(self):
+        self.store.replace("1", "Weight", {}, self.jan[0], self.jan[9])
+
+        with self.assertRaises(ValueError):
+            self.store.replace("1", "Weight", {}, self.jan[20], self.jan[30])
+
+    def test_persists(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "measurements.sqlite")
+            store = MeasurementStore(path)
+            store.replace("1", "Weight", {self.jan[0]: 150.0}, self.jan[0], self.jan[0])
+            store.close()
+
+            store = MeasurementStore(path)
+            self.assertEqual({self.jan[0]: 150.0}, dict(store.get("1", "Weight")))
+            store.close()
@@ -0,0 +1,143 @@
+import datetime
+import json
+import os
+import tempfile
+from http.cookiejar import CookieJar
+from unittest.mock import patch
+
+import lxml.html
+
+from myfitnesspal import Client
+from myfitnesspal.fakeserver import FakeMyfitnesspalServer
+from myfitnesspal.tracing import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    Tracer,
+    get_current_span,
+    span_scope,
+)
+
+from . import synthetic
+from .base import MFPTestCase
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "html")
+
+
+class TestTracer(MFPTestCase):
+    def test_spans_are_nested(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.span("outer") as outer:
+            with tracer.span("inner", key="value") as inner:
+                self.assertIs(inner, get_current_span())
+
+        self.assertIsNone(get_current_span())
+        self.assertEqual([inner, outer], exporter.spans)
+        self.assertEqual(outer.span_id, inner.parent_id)
+        self.assertEqual(outer.trace_id, inner.trace_id)
+        self.assertEqual({"key": "value"}, inner.attributes)
+        self.assertGreaterEqual(outer.duration, inner.duration)
+
+    def test_records_errors(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter)
+
+        with self.assertRaises(ValueError):
+            with tracer.span("failing"):
+                raise ValueError("Oops")
+
+        self.assertEqual("ValueError: Oops", exporter.spans[0].error)
+
+    def test_span_scope_reenters_ended_span(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.span("outer") as outer:
+            pass
+        with span_scope(outer):
+            with tracer.span("deferred") as deferred:
+                pass
+
+        self.assertIsNone(get_current_span())
+        self.assertEqual(outer.span_id, deferred.parent_id)
+        self.assertEqual(outer.trace_id, deferred.trace_id)
+
+    def test_disabled_without_exporter(self):
+        tracer = Tracer()
+
+        with tracer.span("ignored") as span:
+            self.assertIsNone(span)
+            self.assertIsNone(get_current_span())
+
+    def test_file_exporter_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "spans.jsonl")
+            tracer = Tracer(FileSpanExporter(path))
+
+            with tracer.span("outer"):
+                with tracer.span("inner"):
+                    pass
+
+            with open(path, encoding="utf-8") as inf:
+                spans = [json.loads(line) for line in inf]
+
+        self.assertEqual(["inner", "outer"], [span["name"] for span in spans])
+        self.assertEqual(spans[1]["span_id"], spans[0]["parent_id"])
+
+
+class TestClientTracing(MFPTestCase):
+    def test_get_date_spans(self):
+        exporter = InMemorySpanExporter()
+        client = Client(
+            cookiejar=CookieJar(),
+            transport=FakeMyfitnesspalServer(TEMPLATES_DIR),
+            tracer=Tracer(exporter),
+        )
+        exporter.clear()
+
+        client.get_date(datetime.date(2022, 1, 10))
+
+        root = exporter.spans[-1]
+        self.assertEqual("Client.get_date", root.name)
+        children = [span for span in exporter.spans if span.parent_id == root.span_id]
+        self.assertEqual(
+            [
+                "HTTP GET",
+                "parse html",
+                "parse meals",
+                "parse goals",
+                "parse completion",
+            ],
+            [span.name for span in children],
+        )
+        self.assertEqual(200, children[0].attributes["status_code"])
+
+    def test_get_meals_full_spans(self):
+        exporter = InMemorySpanExporter()
+        client = Client(
+            cookiejar=CookieJar(),
+            transport=FakeMyfitnesspalServer(TEMPLATES_DIR),
+            tracer=Tracer(exporter),
+            max_workers=2,
+        )
+
+        def get_document_for_url(url):
+            if url.endswith("/meal/mine"):
+                content = synthetic.make_meal_list_html(meals=3)
+            else:
+                content = synthetic.make_meal_html(ingredients=2)
+            return lxml.html.document_fromstring(content)
+
+        with patch.object(
+            client, "_get_document_for_url", side_effect=get_document_for_url
+        ):
+            meals = client.get_meals_full()
+            root = exporter.spans[-1]
+            exporter.clear()
+
+            list(meals)
+
+        self.assertEqual("Client.get_meals_full", root.name)
+        self.assertEqual(["parse meal"] * 3, [span.name for span in exporter.spans])
+        self.assertEqual({root.span_id}, {span.parent_id for span in exporter.spans})